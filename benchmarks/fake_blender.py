@@ -0,0 +1,226 @@
+#!/usr/bin/env python3
+"""
+Stand-in for the Blender executable.
+
+Accepts a Blender command line (-b, -E, -s, -e, -j, -f, -a, -o, ...) and
+prints the output a background render would produce, without rendering
+anything: Cycles-style Sample lines or EEVEE-style sample counters, memory
+stats, Saved: lines and the final "Blender quit". A recorded Blender log
+can be replayed instead.
+
+Behaviour is tuned with --fake-* options (placed anywhere on the command
+line, removed before parsing) or the matching FAKE_BLENDER_* environment
+variables, so the fake can be used through unchanged presets:
+
+    --fake-rate N        lines per second, 0 = as fast as possible (default 0)
+    --fake-samples N     samples per frame (default 64)
+    --fake-sample-step N print one Sample line every N samples (default 1)
+    --fake-replay FILE   replay a recorded log instead of generating output
+    --fake-exit-code N   exit status (default 0)
+    --fake-write         actually create the output files (a stub header, not an image)
+
+--version prints the version banner. A --python-expr that prints the
+metadata marker of src/core/blend_metadata.py gets a canned metadata line
+(one scene built from -S, -E, -s, -e), so the .blend metadata probe and
+its cache can be exercised without Blender.
+"""
+
+import json
+import os
+import sys
+import time
+
+OPTIONS = {
+    'rate': ('FAKE_BLENDER_RATE', float, 0.0),
+    'samples': ('FAKE_BLENDER_SAMPLES', int, 64),
+    'sample-step': ('FAKE_BLENDER_SAMPLE_STEP', int, 1),
+    'replay': ('FAKE_BLENDER_REPLAY', str, ''),
+    'exit-code': ('FAKE_BLENDER_EXIT_CODE', int, 0),
+    'write': ('FAKE_BLENDER_WRITE', bool, False),
+}
+
+METADATA_MARKER = 'BRUI_METADATA '
+
+EXTENSIONS = {'PNG': 'png', 'JPEG': 'jpg', 'OPEN_EXR': 'exr', 'TIFF': 'tif', 'WEBP': 'webp', 'FFMPEG': 'mp4'}
+
+# Contents of the written files: enough for the header checks of src/core/output_manifest.py
+STUB_FILES = {
+    'PNG': b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\x00IEND\xaeB`\x82',
+    'JPEG': b'\xff\xd8\xff\xe0\xff\xd9',
+    'OPEN_EXR': b'v/1\x01\x02\x00\x00\x00',
+    'TIFF': b'II*\x00\x08\x00\x00\x00',
+}
+
+
+def split_options(argv):
+    """Separates the --fake-* options from the Blender arguments"""
+    options = {}
+    for name, (env, convert, default) in OPTIONS.items():
+        value = os.environ.get(env)
+        if value is None:
+            options[name] = default
+        elif convert is bool:
+            options[name] = value not in ('', '0')
+        else:
+            options[name] = convert(value)
+
+    args = []
+    i = 0
+    while i < len(argv):
+        arg = argv[i]
+        name = arg[len('--fake-'):] if arg.startswith('--fake-') else None
+        if name in OPTIONS:
+            convert = OPTIONS[name][1]
+            if convert is bool:
+                options[name] = True
+            else:
+                i += 1
+                options[name] = convert(argv[i])
+        else:
+            args.append(arg)
+        i += 1
+    return options, args
+
+
+def parse_frames(value):
+    """Frames of a -f argument ('1,3,5..10', or '5-10')"""
+    frames = []
+    for part in value.split(','):
+        start, sep, end = part.partition('..') if '..' in part else part.partition('-')
+        if sep and start:
+            frames.extend(range(int(start), int(end) + 1))
+        elif part:
+            frames.append(int(part))
+    return frames
+
+
+def parse_blender_args(args):
+    """Extracts what the fake needs from a Blender command line"""
+    settings = {'engine': 'CYCLES', 'start': 1, 'end': 1, 'step': 1, 'frames': None,
+                'output': '/tmp/render_####', 'format': 'PNG', 'blend': 'untitled.blend',
+                'scene': 'Scene', 'animation': False, 'python_expr': None}
+    value_flags = {'-E': 'engine', '-s': 'start', '-e': 'end', '-j': 'step',
+                   '-o': 'output', '-F': 'format', '-S': 'scene', '--python-expr': 'python_expr'}
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg in value_flags and i + 1 < len(args):
+            settings[value_flags[arg]] = args[i + 1]
+            i += 1
+        elif arg == '-f' and i + 1 < len(args):
+            settings['frames'] = parse_frames(args[i + 1])
+            i += 1
+        elif arg == '-a':
+            settings['animation'] = True
+        elif arg.endswith('.blend'):
+            settings['blend'] = arg
+        i += 1
+
+    for key in ('start', 'end', 'step'):
+        settings[key] = int(settings[key])
+    if settings['animation']:
+        settings['frames'] = list(range(settings['start'], settings['end'] + 1, max(1, settings['step'])))
+    elif settings['frames'] is None:
+        settings['frames'] = []
+    return settings
+
+
+def output_path(pattern, frame, file_format):
+    """Resolves the #### placeholder of an output path"""
+    hashes = pattern.count('#')
+    if hashes:
+        start = pattern.index('#')
+        pattern = pattern[:start] + str(frame).zfill(hashes) + pattern[start + hashes:]
+    else:
+        pattern += str(frame).zfill(4)
+    return f"{pattern}.{EXTENSIONS.get(file_format, 'png')}"
+
+
+def generate(settings, options):
+    """Yields the lines of a simulated render"""
+    yield "Blender 4.2.0 (hash a51f293548ad built 2024-07-16 06:27:02)"
+    yield f"Read blend: \"{settings['blend']}\""
+    samples = max(1, options['samples'])
+    step = max(1, options['sample-step'])
+    scene = settings['scene']
+    eevee = settings['engine'].startswith('BLENDER_EEVEE')
+
+    for index, frame in enumerate(settings['frames']):
+        memory = 120.0 + index * 0.5
+        prefix = f"Fra:{frame} Mem:{memory:.2f}M (Peak {memory + 40:.2f}M) | Time:00:00.{index % 100:02d}"
+        yield f"{prefix} | Mem:0.00M, Peak:0.00M | {scene}, ViewLayer | Synchronizing object | Cube"
+        yield f"{prefix} | Mem:{memory / 2:.2f}M, Peak:{memory / 2:.2f}M | {scene}, ViewLayer | Updating Images"
+        for sample in range(step, samples + 1, step):
+            if eevee:
+                yield f"{prefix} | {scene}, ViewLayer | Rendering {sample} / {samples} samples"
+            else:
+                yield (f"{prefix} | Remaining:00:00.{(samples - sample) % 100:02d} | Mem:{memory / 2:.2f}M, "
+                       f"Peak:{memory / 2:.2f}M | {scene}, ViewLayer | Sample {sample}/{samples}")
+        if not eevee:
+            yield f"{prefix} | Mem:{memory / 2:.2f}M, Peak:{memory / 2:.2f}M | {scene}, ViewLayer | Finished"
+        path = output_path(settings['output'], frame, settings['format'])
+        if options['write']:
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            with open(path, 'wb') as f:
+                f.write(STUB_FILES.get(settings['format'], b'\x00'))
+        yield f"Saved: '{path}'"
+        yield f" Time: 00:00.{index % 100:02d} (Saving: 00:00.01)"
+        yield ""
+
+    yield ""
+    yield "Blender quit"
+
+
+def probe(settings):
+    """Answers the metadata probe script with one scene"""
+    yield "Blender 4.2.0 (hash a51f293548ad built 2024-07-16 06:27:02)"
+    yield f"Read blend: \"{settings['blend']}\""
+    scene = {'name': settings['scene'], 'frame_start': settings['start'],
+             'frame_end': settings['end'] if settings['end'] > 1 else 250, 'frame_step': settings['step'],
+             'engine': settings['engine'], 'resolution_x': 1920, 'resolution_y': 1080,
+             'resolution_percentage': 100, 'output_path': '//render/', 'file_format': settings['format'],
+             'view_layers': ['ViewLayer']}
+    yield METADATA_MARKER + json.dumps({'active_scene': scene['name'], 'scenes': [scene],
+                                        'libraries': [], 'images': []})
+    yield ""
+    yield "Blender quit"
+
+
+def replay(path):
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            yield line.rstrip('\n')
+
+
+def main(argv=None):
+    options, args = split_options(sys.argv[1:] if argv is None else argv)
+    settings = parse_blender_args(args)
+    if '--version' in args or '-v' in args:
+        lines = iter(["Blender 4.2.0", "\tbuild date: 2024-07-16", "\tbuild hash: a51f293548ad"])
+    elif options['replay']:
+        lines = replay(options['replay'])
+    elif METADATA_MARKER in (settings['python_expr'] or ''):
+        lines = probe(settings)
+    else:
+        lines = generate(settings, options)
+
+    interval = 1.0 / options['rate'] if options['rate'] > 0 else 0.0
+    next_time = time.monotonic()
+    write = sys.stdout.write
+    try:
+        for line in lines:
+            write(line + "\n")
+            if interval:
+                sys.stdout.flush()
+                next_time += interval
+                delay = next_time - time.monotonic()
+                if delay > 0:
+                    time.sleep(delay)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        return 1
+    return options['exit-code']
+
+
+if __name__ == "__main__":
+    sys.exit(main())
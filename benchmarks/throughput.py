@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+End-to-end throughput benchmark of the Blender output path.
+
+Runs fake_blender.py through BlenderExecutor and measures:
+
+    core  lines/s through the executor and the output parser (no Qt)
+    gui   the same, plus LogViewer and ProgressMonitor fed like in the main
+          window, and the latency of the Qt event loop while output flows
+
+For each run it reports wall time, lines/s, batches, CPU time and resident
+memory growth. --save writes the results as JSON; --compare checks them
+against a saved baseline and exits with 1 when lines/s drops by more than
+--tolerance.
+
+    python benchmarks/throughput.py --frames 200 --samples 256
+    python benchmarks/throughput.py --mode gui --save baseline.json
+    python benchmarks/throughput.py --mode both --compare baseline.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FAKE_BLENDER = os.path.join(ROOT, 'benchmarks', 'fake_blender.py')
+HEADLESS_ENV = 'BLENDER_RENDER_UI_HEADLESS'
+
+
+def rss_mb():
+    """Resident memory of this process in MB"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024.0
+    except OSError:
+        pass
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (1024.0 * 1024.0) if sys.platform == 'darwin' else peak / 1024.0
+    except ImportError:
+        return 0.0
+
+
+def fake_command(args):
+    command = [sys.executable, FAKE_BLENDER, '-b', 'benchmark.blend', '-E', args.engine,
+               '-s', '1', '-e', str(args.frames), '-a',
+               '--fake-samples', str(args.samples), '--fake-rate', str(args.rate)]
+    if args.replay:
+        command += ['--fake-replay', args.replay]
+    return command
+
+
+def percentile(values, fraction):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class Counter:
+    """Counts the lines and batches delivered by an executor"""
+
+    def __init__(self):
+        self.lines = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    def on_batch(self, events):
+        self.lines += len(events)
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(events))
+
+
+def measure(run, args):
+    """Runs one benchmark and returns its metrics"""
+    gc.collect()
+    rss_before = rss_mb()
+    cpu_before = time.process_time()
+    started = time.perf_counter()
+
+    result = run(args)
+
+    wall = time.perf_counter() - started
+    result.update({
+        'wall_s': round(wall, 3),
+        'lines_per_s': round(result['lines'] / wall, 1) if wall else 0.0,
+        'cpu_s': round(time.process_time() - cpu_before, 3),
+        'rss_growth_mb': round(rss_mb() - rss_before, 1),
+    })
+    return result
+
+
+def run_core(args):
+    """Executor and parser only, with the pure-Python signals"""
+    from src.core.executors import create_executor
+
+    executor = create_executor(args.backend)
+    executor.emit_lines = False
+    counter = Counter()
+    done = threading.Event()
+    completed = []
+    executor.output_batch.connect(counter.on_batch)
+    executor.render_completed.connect(lambda success, message: (completed.append(success), done.set()))
+
+    executor.execute(fake_command(args), 1, args.frames)
+    done.wait()
+    while executor.is_running:
+        time.sleep(0.01)
+
+    return {'mode': 'core', 'lines': counter.lines, 'batches': counter.batches,
+            'largest_batch': counter.largest_batch, 'success': all(completed)}
+
+
+def run_gui(args):
+    """Executor, parser, LogViewer and ProgressMonitor in a Qt event loop"""
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QApplication
+    from src.core.executors import create_executor
+    from src.ui.log_viewer import LogViewer
+    from src.ui.progress_monitor import ProgressMonitor
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    log_viewer = LogViewer()
+    progress_monitor = ProgressMonitor()
+    executor = create_executor(args.backend)
+    executor.emit_lines = False
+    progress_monitor.set_blender_executor(executor)
+    counter = Counter()
+    completed = []
+
+    def on_batch(events):
+        counter.on_batch(events)
+        log_viewer.append_logs([(event.line, event.level) for event in events])
+        progress_monitor.handle_output_events(events)
+
+    # Event loop latency: how late a 10 ms timer fires while output is flowing
+    latencies = []
+    interval = 0.010
+    last_tick = [time.perf_counter()]
+
+    def on_tick():
+        now = time.perf_counter()
+        latencies.append(max(0.0, now - last_tick[0] - interval) * 1000.0)
+        last_tick[0] = now
+
+    timer = QTimer()
+    timer.setInterval(int(interval * 1000))
+    timer.timeout.connect(on_tick)
+
+    executor.output_batch.connect(on_batch)
+    executor.render_completed.connect(lambda success, message: (completed.append(success), app.quit()))
+
+    timer.start()
+    executor.execute(fake_command(args), 1, args.frames)
+    app.exec_()
+    timer.stop()
+
+    log_viewer.log_entries.close()
+    return {'mode': 'gui', 'lines': counter.lines, 'batches': counter.batches,
+            'largest_batch': counter.largest_batch, 'success': all(completed),
+            'loop_latency_p50_ms': round(percentile(latencies, 0.50), 2),
+            'loop_latency_p95_ms': round(percentile(latencies, 0.95), 2),
+            'loop_latency_max_ms': round(max(latencies, default=0.0), 2)}
+
+
+def compare(results, baseline_path, tolerance):
+    """Returns the regressions of results against a saved baseline"""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = {result['mode']: result for result in json.load(f)['results']}
+
+    regressions = []
+    for result in results:
+        reference = baseline.get(result['mode'])
+        if reference and result['lines_per_s'] < reference['lines_per_s'] * (1.0 - tolerance):
+            regressions.append(f"{result['mode']}: {result['lines_per_s']} lines/s, "
+                               f"baseline {reference['lines_per_s']} lines/s")
+    return regressions
+
+
+def print_results(results):
+    for result in results:
+        print(f"[{result['mode']}]")
+        for key, value in result.items():
+            if key != 'mode':
+                print(f"  {key:<22} {value}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0].strip())
+    parser.add_argument('--mode', choices=('core', 'gui', 'both'), default='core')
+    parser.add_argument('--backend', choices=('thread', 'asyncio'), default='thread')
+    parser.add_argument('--frames', type=int, default=100)
+    parser.add_argument('--samples', type=int, default=256, help="Sample lines per frame")
+    parser.add_argument('--engine', default='CYCLES')
+    parser.add_argument('--rate', type=float, default=0, help="Lines/s of the fake Blender, 0 = unlimited")
+    parser.add_argument('--replay', help="Recorded Blender log to replay instead of generated output")
+    parser.add_argument('--save', metavar='FILE', help="Write the results as JSON")
+    parser.add_argument('--compare', metavar='FILE', help="Baseline JSON written with --save")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Allowed lines/s drop (default 0.2)")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, ROOT)
+    if args.mode == 'core':
+        # Measure the core without Qt
+        os.environ[HEADLESS_ENV] = '1'
+
+    runs = {'core': [run_core], 'gui': [run_gui], 'both': [run_core, run_gui]}[args.mode]
+    results = [measure(run, args) for run in runs]
+    print_results(results)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'args': vars(args), 'results': results}, f, indent=4)
+
+    if not all(result['success'] for result in results):
+        print("A benchmark render failed", file=sys.stderr)
+        return 1
+
+    if args.compare:
+        regressions = compare(results, args.compare, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
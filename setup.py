@@ -1,21 +1,27 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_namespace_packages
 
 setup(
     name='blender-render-ui',
     version='0.2.0',
     author='Nebula Studios',
-    packages=find_packages(where='src'),
-    package_dir={'': 'src'},
+    # The modules import each other as src.*, so src is installed as a package
+    packages=find_namespace_packages(include=['src', 'src.*'], exclude=['*.__pycache__']),
+    package_data={'src.resources': ['icons/*']},
     python_requires='>=3.8',
     install_requires=[
-        'PyQt5>=5.15.11',
-        'PyQt5-Qt5>=5.15.2',
-        'PyQt5-sip>=12.11.0',
         'regex'
     ],
+    extras_require={
+        # The headless commands (run, serve, presets, probe, hash) work without Qt
+        'gui': [
+            'PyQt5>=5.15.11',
+            'PyQt5-Qt5>=5.15.2',
+            'PyQt5-sip>=12.11.0',
+        ],
+    },
     entry_points={
         'console_scripts': [
             'blender-render-ui=src.main:main',
         ],
     },
-)
\ No newline at end of file
+)
@@ -0,0 +1,384 @@
+"""
+Headless command line interface.
+
+    blender-render-ui run --preset NAME [--set FLAG=VALUE ...] [--shards N]
+    blender-render-ui serve [--http [HOST:]PORT]
+    blender-render-ui presets
+    blender-render-ui probe FILE.blend [--blender PATH] [--refresh]
+    blender-render-ui hash FILE ... [--dependencies]
+
+Runs renders through the same presets, parameter ordering and render queue
+as the GUI, without loading PyQt5. 'serve' reads JSON job specs from stdin,
+one per line, and writes JSON events to stdout, for farm automation.
+'probe' prints the scenes of a .blend file as JSON, from the metadata cache
+when the file did not change; 'hash' prints file digests, reading only the
+files that changed since they were last hashed.
+
+Exit codes: 0 every job succeeded, 1 a job failed or was cancelled,
+2 invalid arguments, 130 interrupted.
+"""
+
+import json
+import os
+import sys
+import threading
+
+# Read by src.core.qt_compat; set before the core is imported so PyQt5 is never loaded
+HEADLESS_ENV = 'BLENDER_RENDER_UI_HEADLESS'
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_INTERRUPTED = 130
+
+COMMANDS = ('run', 'serve', 'presets', 'probe', 'hash')
+
+
+class CliError(Exception):
+    """Invalid arguments"""
+
+
+def resolve_flag(name):
+    """Accepts flags with or without their dashes ('s', 'E', 'cycles-samples')"""
+    from src.core.command_line import BLEND_FILE_KEY
+    from src.core.param_definitions import ParamDefinitions
+
+    if name.startswith('-') or name == BLEND_FILE_KEY:
+        return name
+    known = {param["param"] for param in ParamDefinitions.get_all_parameters()}
+    for flag in ('-' + name, '--' + name):
+        if flag in known or flag in ParamDefinitions.PARAM_ORDER:
+            return flag
+    return ('-' if len(name) == 1 else '--') + name
+
+
+def parse_overrides(assignments):
+    """Parses FLAG=VALUE strings; a bare FLAG enables a switch"""
+    overrides = {}
+    for assignment in assignments or ():
+        flag, sep, value = assignment.partition('=')
+        if not flag:
+            raise CliError(f"Invalid parameter: {assignment}")
+        overrides[resolve_flag(flag)] = value if sep else True
+    return overrides
+
+
+def format_seconds(seconds):
+    seconds = int(seconds)
+    return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+
+
+class EventPrinter:
+    """Writes queue events to stdout, as text or JSON lines"""
+
+    def __init__(self, queue, as_json=False, show_output=False):
+        self.queue = queue
+        self.as_json = as_json
+        self.show_output = show_output
+        self._lock = threading.Lock()
+        self._last_percent = {}
+
+        queue.job_state_changed.connect(self.on_state_changed)
+        queue.render_eta.connect(self.on_progress)
+        queue.render_completed.connect(self.on_completed)
+        queue.render_cache_updated.connect(self.on_cache_updated)
+        if show_output:
+            queue.output_batch.connect(self.on_output_batch)
+
+    def write(self, event, text):
+        with self._lock:
+            if self.as_json:
+                sys.stdout.write(json.dumps(event) + "\n")
+            else:
+                sys.stdout.write(text + "\n")
+            sys.stdout.flush()
+
+    def job_label(self, job_id):
+        job = self.queue.get_job(job_id)
+        return f"[{job_id}] {job.name}".rstrip() if job else f"[{job_id}]"
+
+    def on_state_changed(self, job_id, state):
+        self.write({'event': 'state', 'job_id': job_id, 'state': state},
+                   f"{self.job_label(job_id)} {state}")
+
+    def on_progress(self, job_id, estimate):
+        # Text mode prints whole percents only
+        percent = int(estimate.fraction * 100)
+        if not self.as_json and self._last_percent.get(job_id) == percent:
+            return
+        self._last_percent[job_id] = percent
+        eta = f" ETA {format_seconds(estimate.eta)}" if estimate.eta is not None else ""
+        self.write({'event': 'progress', 'job_id': job_id, 'progress': estimate.fraction,
+                    'frames_done': estimate.frames_done, 'eta': estimate.eta,
+                    'eta_low': estimate.eta_low, 'eta_high': estimate.eta_high},
+                   f"{self.job_label(job_id)} {percent}%{eta}")
+
+    def on_completed(self, job_id, success, message):
+        self.write({'event': 'completed', 'job_id': job_id, 'success': success, 'message': message},
+                   f"{self.job_label(job_id)} {message}")
+
+    def on_cache_updated(self, stats):
+        self.write({'event': 'cache', 'hits': stats.hits, 'misses': stats.misses, 'stored': stats.stored,
+                    'entries': stats.entries, 'size_bytes': stats.size_bytes},
+                   f"Render cache: {stats.hits} hits, {stats.misses} misses, {stats.entries} frames "
+                   f"({stats.size_bytes / 1024 ** 2:.1f} MB)")
+
+    def on_output_batch(self, job_id, events):
+        if self.as_json:
+            self.write({'event': 'output', 'job_id': job_id,
+                        'lines': [event.line for event in events]}, "")
+        else:
+            self.write({}, "\n".join(f"[{job_id}] {event.line}" for event in events))
+
+
+def create_queue(settings_manager, concurrency=None):
+    """Render queue for headless use; the GUI queue file is left alone"""
+    from src.core.render_queue import RenderQueue
+
+    queue = RenderQueue(settings_manager)
+    queue.queue_file = None
+    if concurrency:
+        queue.max_concurrent = max(1, concurrency)
+    return queue
+
+
+def wait_for_jobs(queue, done, job_ids=None):
+    """Blocks until the given jobs (all if None) are finished; returns True if all succeeded"""
+    from src.core.render_queue import JobState
+
+    def finished():
+        jobs = [queue.get_job(job_id) for job_id in job_ids] if job_ids else queue.get_jobs()
+        return all(job is None or job.state in JobState.FINISHED for job in jobs)
+
+    while not finished():
+        done.wait(0.5)
+        done.clear()
+
+    jobs = [queue.get_job(job_id) for job_id in job_ids] if job_ids else queue.get_jobs()
+    return all(job is not None and job.state == JobState.COMPLETED for job in jobs)
+
+
+def cmd_run(args, settings_manager):
+    spec = {
+        'preset': args.preset,
+        'blender_path': args.blender,
+        'parameters': parse_overrides(args.set),
+        'shards': args.shards,
+        'shard_mode': args.shard_mode,
+        'name': args.name,
+        'resume': args.resume,
+        'check_files': args.check_files,
+    }
+
+    from src.core.job_spec import job_from_spec, resume_spec, submit_spec, jobs_of
+
+    if args.dry_run:
+        command = job_from_spec(spec, settings_manager)
+        if args.resume:
+            command = resume_spec(command, spec, settings_manager)
+        print(command.display if command is not None else "# All frames are already rendered")
+        return EXIT_OK
+
+    queue = create_queue(settings_manager, args.concurrency)
+    done = threading.Event()
+    queue.render_completed.connect(lambda *_: done.set())
+    EventPrinter(queue, args.json, args.verbose)
+
+    submitted = submit_spec(queue, spec, settings_manager)
+    if submitted is None:
+        print("All frames are already rendered", file=sys.stderr)
+        return EXIT_OK
+    job_ids = [job.job_id for job in jobs_of(queue, submitted)]
+
+    try:
+        succeeded = wait_for_jobs(queue, done, job_ids)
+        queue.wait_for_cache()
+        return EXIT_OK if succeeded else EXIT_FAILED
+    except KeyboardInterrupt:
+        queue.cancel_all()
+        return EXIT_INTERRUPTED
+
+
+def cmd_serve(args, settings_manager):
+    """
+    Reads job specs (or {"cancel": job_id}) as JSON lines from stdin until EOF,
+    or serves the HTTP job API with --http until interrupted
+    """
+    from src.core.job_spec import submit_spec
+
+    queue = create_queue(settings_manager, args.concurrency)
+    if args.http is not None:
+        return serve_http(queue, settings_manager, args)
+
+    done = threading.Event()
+    queue.render_completed.connect(lambda *_: done.set())
+    printer = EventPrinter(queue, True, args.verbose)
+
+    try:
+        for line in sys.stdin:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                spec = json.loads(line)
+                if isinstance(spec, dict) and 'cancel' in spec:
+                    queue.cancel(spec['cancel'])
+                    continue
+                submitted = submit_spec(queue, spec, settings_manager)
+                printer.write({'event': 'submitted', 'id': submitted}, "")
+            except ValueError as e:  # Invalid JSON or JobSpecError
+                printer.write({'event': 'error', 'message': str(e)}, "")
+
+        succeeded = wait_for_jobs(queue, done)
+        queue.wait_for_cache()
+        return EXIT_OK if succeeded else EXIT_FAILED
+    except KeyboardInterrupt:
+        queue.cancel_all()
+        return EXIT_INTERRUPTED
+
+
+def parse_address(address):
+    """Parses [HOST:]PORT"""
+    from src.core.job_server import DEFAULT_HOST, DEFAULT_PORT
+
+    host, sep, port = (address or '').rpartition(':')
+    try:
+        return host or DEFAULT_HOST, int(port) if port else DEFAULT_PORT
+    except ValueError:
+        raise CliError(f"Invalid address: {address}")
+
+
+def serve_http(queue, settings_manager, args):
+    from src.core.job_server import JobServer
+
+    host, port = parse_address(args.http)
+    try:
+        server = JobServer(queue, settings_manager, host, port)
+    except OSError as e:
+        raise CliError(f"Unable to listen on {host}:{port}: {e}")
+
+    EventPrinter(queue, args.json, args.verbose)
+    print(f"Job API listening on {server.address} (token in {server.token_file})", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        queue.cancel_all()
+    finally:
+        server.stop()
+    return EXIT_INTERRUPTED
+
+
+def cmd_presets(args, settings_manager):
+    for name in settings_manager.get_preset_names():
+        print(name)
+    return EXIT_OK
+
+
+def cmd_probe(args, settings_manager):
+    from src.core.blend_metadata import BlendMetadataCache, BlendProbeError
+
+    cache = BlendMetadataCache.instance(settings_manager.settings_dir)
+    if args.refresh:
+        cache.invalidate(args.blend_file)
+    try:
+        metadata = cache.probe(args.blender or settings_manager.get_blender_path(), args.blend_file)
+    except BlendProbeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    print(json.dumps(metadata, indent=2))
+    return EXIT_OK
+
+
+def cmd_hash(args, settings_manager):
+    from src.core.blend_metadata import BlendMetadataCache, BlendProbeError
+    from src.core.file_hasher import CACHE_FILE_NAME as HASHES_FILE_NAME, FileHasher
+
+    hasher = FileHasher(os.path.join(settings_manager.settings_dir, HASHES_FILE_NAME))
+    digests = {}
+    try:
+        for path in args.files:
+            metadata = None
+            if args.dependencies and path.lower().endswith('.blend'):
+                cache = BlendMetadataCache.instance(settings_manager.settings_dir)
+                metadata = cache.probe(args.blender or settings_manager.get_blender_path(), path)
+            digests.update(hasher.hash_blend(path, metadata))
+    except BlendProbeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_FAILED
+    finally:
+        hasher.shutdown()
+    print(json.dumps(digests, indent=2))
+    return EXIT_OK if all(digests.values()) else EXIT_FAILED
+
+
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog='blender-render-ui',
+                                     description="Headless Blender rendering with Blender Render UI presets")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help="Render a preset and wait for it")
+    run_parser.add_argument('--preset', required=True, help="Preset name")
+    run_parser.add_argument('--blender', help="Blender executable (default: the preset's)")
+    run_parser.add_argument('--set', action='append', metavar='FLAG=VALUE',
+                            help="Override a parameter, e.g. --set s=10 --set E=CYCLES --set blend_file=shot.blend; "
+                                 "a bare FLAG enables a switch")
+    run_parser.add_argument('--name', help="Job name")
+    run_parser.add_argument('--shards', type=int, default=1, help="Split an animation across N processes running at once")
+    run_parser.add_argument('--shard-mode', choices=('contiguous', 'interleaved'), default='contiguous')
+    run_parser.add_argument('--resume', action='store_true',
+                            help="Skip the frames whose output file already exists")
+    run_parser.add_argument('--check-files', action='store_true',
+                            help="With --resume, also check the headers of the existing files")
+    run_parser.add_argument('--dry-run', action='store_true', help="Print the command without running it")
+    run_parser.set_defaults(handler=cmd_run)
+
+    serve_parser = subparsers.add_parser('serve', help="Run JSON job specs read from stdin, or serve the HTTP API")
+    serve_parser.add_argument('--http', nargs='?', const='', metavar='[HOST:]PORT',
+                              help="Serve the HTTP job API instead of reading stdin (default 127.0.0.1:8765)")
+    serve_parser.set_defaults(handler=cmd_serve)
+
+    for sub in (run_parser, serve_parser):
+        sub.add_argument('--concurrency', type=int, help="Jobs rendered at the same time")
+        sub.add_argument('--json', action='store_true', help="Write events as JSON lines")
+        sub.add_argument('-v', '--verbose', action='store_true', help="Also print the Blender output")
+
+    presets_parser = subparsers.add_parser('presets', help="List the saved presets")
+    presets_parser.set_defaults(handler=cmd_presets)
+
+    probe_parser = subparsers.add_parser('probe', help="Print the scenes of a .blend file as JSON")
+    probe_parser.add_argument('blend_file', help=".blend file")
+    probe_parser.add_argument('--blender', help="Blender executable (default: the saved one)")
+    probe_parser.add_argument('--refresh', action='store_true', help="Ignore the metadata cache")
+    probe_parser.set_defaults(handler=cmd_probe)
+
+    hash_parser = subparsers.add_parser('hash', help="Print the SHA-256 of files as JSON, hashing only changed files")
+    hash_parser.add_argument('files', nargs='+', help="Files to hash")
+    hash_parser.add_argument('--dependencies', action='store_true',
+                             help="Also hash the libraries and images referenced by .blend files")
+    hash_parser.add_argument('--blender', help="Blender executable for --dependencies (default: the saved one)")
+    hash_parser.set_defaults(handler=cmd_hash)
+
+    return parser
+
+
+def main(argv=None):
+    # Must be set before the core modules are imported
+    os.environ[HEADLESS_ENV] = '1'
+
+    args = build_parser().parse_args(argv)
+
+    from src.core.job_spec import JobSpecError
+    from src.utils.settings_manager import SettingsManager
+    settings_manager = SettingsManager.instance()
+
+    try:
+        return args.handler(args, settings_manager)
+    except (CliError, JobSpecError) as e:
+        print(f"error: {e}", file=sys.stderr)
+        return EXIT_USAGE
+
+
+if __name__ == "__main__":
+    sys.exit(main())
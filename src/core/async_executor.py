@@ -0,0 +1,221 @@
+"""
+asyncio backend for running Blender processes.
+
+A single AsyncSupervisor event loop drives every AsyncBlenderExecutor, so
+dozens of processes are supervised without a reader and a flush thread
+each. By default the loop runs in its own daemon thread and the executor
+signals reach the GUI through Qt queued connections, like the threaded
+backend. An application already running a qasync-style loop integrated
+with Qt can hand it over with AsyncSupervisor.install().
+"""
+
+import asyncio
+import logging
+import sys
+import threading
+
+from .blender_executor import BlenderExecutor
+
+
+class AsyncSupervisor:
+    """Owns the event loop shared by all asyncio executors"""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self, loop=None):
+        if loop is None:
+            loop = asyncio.new_event_loop()
+            ready = threading.Event()
+            self.thread = threading.Thread(target=self._run_loop, args=(loop, ready),
+                                           name="AsyncSupervisor", daemon=True)
+            self.thread.start()
+            ready.wait()
+        else:
+            # Externally driven loop (e.g. qasync), running in the current thread
+            self.thread = threading.current_thread()
+        self.loop = loop
+
+    @staticmethod
+    def _run_loop(loop, ready):
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    @classmethod
+    def instance(cls):
+        """Returns the shared supervisor, starting its loop thread if needed"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    @classmethod
+    def install(cls, loop):
+        """Uses an existing event loop (such as a qasync QEventLoop) for all executors"""
+        with cls._instance_lock:
+            cls._instance = cls(loop)
+            return cls._instance
+
+    def in_loop_thread(self):
+        return threading.current_thread() is self.thread
+
+    def submit(self, coroutine):
+        """Schedules a coroutine on the supervisor loop from any thread"""
+        if self.in_loop_thread():
+            return self.loop.create_task(coroutine)
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop)
+
+    def call_soon(self, callback, *args):
+        """Runs a callback on the supervisor loop from any thread"""
+        if self.in_loop_thread():
+            return self.loop.call_soon(callback, *args)
+        return self.loop.call_soon_threadsafe(callback, *args)
+
+
+class AsyncBlenderExecutor(BlenderExecutor):
+    """
+    BlenderExecutor running the process with asyncio.create_subprocess_exec.
+
+    Same signals and methods as BlenderExecutor. In addition it supports an
+    overall timeout and stops processes gracefully: terminate() sends
+    SIGTERM (TerminateProcess on Windows) and escalates to a kill after
+    kill_grace seconds.
+    """
+
+    STREAM_LIMIT = 1024 * 1024  # Longer output lines are truncated to this
+
+    def __init__(self, max_refresh_rate=BlenderExecutor.DEFAULT_REFRESH_RATE,
+                 max_batch_size=BlenderExecutor.DEFAULT_BATCH_SIZE,
+                 timeout=None, kill_grace=10.0, supervisor=None):
+        super().__init__(max_refresh_rate, max_batch_size)
+        self.timeout = timeout or None  # Seconds, None or 0 = no limit
+        self.kill_grace = kill_grace
+        self.supervisor = supervisor
+        self._stop_requested = False
+        self._timed_out = False
+
+    def _start(self, command, background_process):
+        if self.supervisor is None:
+            self.supervisor = AsyncSupervisor.instance()
+        self._stop_requested = False
+        self._timed_out = False
+        self.supervisor.submit(self._run(command))
+        self.supervisor.call_soon(self._flush_tick)
+
+    def _flush_tick(self):
+        """Periodic flush scheduled on the loop instead of a flush thread"""
+        self._flush_output()
+        if self.is_running:
+            self.supervisor.loop.call_later(1.0 / self.max_refresh_rate, self._flush_tick)
+
+    def _native_process(self):
+        return self.process._transport.get_extra_info('subprocess')
+
+    async def _run(self, command):
+        """Coroutine supervising one Blender process"""
+        try:
+            self._emit_output(f"Starting command: {' '.join(command)}")
+            self.render_started.emit()
+
+            options = self._popen_options()
+            self.process = await asyncio.create_subprocess_exec(
+                *command,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=self.STREAM_LIMIT,
+                **options
+            )
+
+            if sys.platform == "win32" and self.cpu_affinity:
+                self._set_windows_affinity(self.cpu_affinity)
+            self._start_sampler()
+
+            try:
+                await asyncio.wait_for(self._read_output(), self.timeout)
+            except asyncio.TimeoutError:
+                self._emit_output(f"Rendering timed out after {self.timeout} seconds")
+                self._stop_requested = True
+                self._timed_out = True
+                await self._stop_process()
+
+            return_code = await self.process.wait()
+
+            if self._stop_requested:
+                self._emit_output("Process terminated")
+                self._flush_output()
+                if self._timed_out:
+                    self.render_completed.emit(False, f"Rendering timed out ({self.timeout} s)")
+                else:
+                    self.render_completed.emit(False, "Rendering interrupted by user")
+            else:
+                self._report_exit(return_code)
+
+        except Exception as e:
+            # Never leave Blender running unsupervised
+            self._stop_requested = True
+            try:
+                await self._stop_process()
+            except Exception as stop_error:
+                logging.error(f"Error stopping Blender: {stop_error}")
+            self._report_error(e)
+
+        finally:
+            self._finish()
+
+    async def _read_output(self):
+        """Streams the process output line by line, truncating lines longer than STREAM_LIMIT"""
+        stdout = self.process.stdout
+        while True:
+            truncated = False
+            try:
+                raw_line = await stdout.readuntil(b'\n')
+            except asyncio.IncompleteReadError as e:
+                raw_line = e.partial  # Last line without a newline
+                if not raw_line:
+                    return
+            except asyncio.LimitOverrunError as e:
+                raw_line = (await stdout.readexactly(e.consumed))[:self.STREAM_LIMIT]
+                await self._skip_line(stdout)
+                truncated = True
+            line = raw_line.decode('utf-8', errors='replace').rstrip()
+            if line:
+                self._process_output_line(line)
+            if truncated:
+                self._emit_output(f"Output line longer than {self.STREAM_LIMIT} bytes truncated")
+
+    @staticmethod
+    async def _skip_line(stream):
+        """Discards the rest of the current line, in chunks within the stream limit"""
+        while True:
+            try:
+                await stream.readuntil(b'\n')
+                return
+            except asyncio.IncompleteReadError:
+                return
+            except asyncio.LimitOverrunError as e:
+                await stream.readexactly(e.consumed)
+
+    async def _stop_process(self):
+        """SIGTERM, then SIGKILL if the process is still alive after kill_grace seconds"""
+        if self.process is None or self.process.returncode is not None:
+            return
+        try:
+            self.process.terminate()
+            await asyncio.wait_for(self.process.wait(), self.kill_grace)
+        except asyncio.TimeoutError:
+            self._emit_output(f"Process did not exit after {self.kill_grace} seconds, killing it")
+            self.process.kill()
+        except ProcessLookupError:
+            pass
+
+    def terminate(self):
+        """Requests a graceful stop; render_completed is emitted once the process exits"""
+        if self.process and self.is_running and not self._stop_requested:
+            self._emit_output("Terminating rendering process...")
+            self._stop_requested = True
+            # A suspended process cannot handle SIGTERM
+            self.resume()
+            self.supervisor.submit(self._stop_process())
+            return True
+        return False
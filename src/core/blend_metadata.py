@@ -0,0 +1,209 @@
+"""
+Scene metadata of .blend files, read by Blender itself and cached on disk.
+
+probe_blend() runs Blender once in background mode with a small
+--python-expr script that prints the scenes of the file (view layers,
+frame range, engine, resolution, output path) and the files it depends on
+(linked libraries, external images) as one JSON line.
+
+BlendMetadataCache keeps the results in a JSON file keyed by the absolute
+path of the .blend, and validated by its mtime and size: a hit never
+launches Blender, so large files are probed once per change. Concurrent
+requests for the same file share a single probe. Within a process the cache
+of a settings directory is one instance (BlendMetadataCache.instance()), so
+the command builder and the render queue never write the file over each other.
+"""
+
+import json
+import os
+import subprocess
+import threading
+import time
+
+from .param_definitions import ParamDefinitions
+from ..utils.json_store import drop_oldest, read_json, write_json_atomic
+
+METADATA_MARKER = 'BRUI_METADATA '
+CACHE_FILE_NAME = 'blend_metadata.json'  # In the settings directory
+PROBE_TIMEOUT = 120  # Seconds before a probe is abandoned
+
+# Runs inside Blender: prints the marker followed by the metadata as JSON
+PROBE_SCRIPT = f'''
+import bpy, json
+def _scene(scene):
+    render = scene.render
+    return {{"name": scene.name, "frame_start": scene.frame_start, "frame_end": scene.frame_end,
+            "frame_step": scene.frame_step, "engine": render.engine,
+            "resolution_x": render.resolution_x, "resolution_y": render.resolution_y,
+            "resolution_percentage": render.resolution_percentage, "output_path": render.filepath,
+            "file_format": render.image_settings.file_format,
+            "view_layers": [layer.name for layer in scene.view_layers]}}
+print({METADATA_MARKER!r} + json.dumps({{"active_scene": bpy.context.scene.name,
+                                        "scenes": [_scene(scene) for scene in bpy.data.scenes],
+                                        "libraries": [bpy.path.abspath(lib.filepath)
+                                                      for lib in bpy.data.libraries],
+                                        "images": [bpy.path.abspath(image.filepath, library=image.library)
+                                                   for image in bpy.data.images
+                                                   if image.source == 'FILE' and not image.packed_file]}}))
+'''
+
+
+class BlendProbeError(Exception):
+    """Blender could not read the metadata of a .blend file"""
+
+
+def probe_command(blender_path, blend_file):
+    return [blender_path, ParamDefinitions.BACKGROUND, blend_file,
+            ParamDefinitions.PYTHON_EXIT, '1', ParamDefinitions.PYTHON_EXPR, PROBE_SCRIPT]
+
+
+def parse_probe_output(output):
+    """Extracts the metadata printed by PROBE_SCRIPT from the Blender output"""
+    for line in output.splitlines():
+        if line.startswith(METADATA_MARKER):
+            try:
+                metadata = json.loads(line[len(METADATA_MARKER):])
+            except ValueError as e:
+                raise BlendProbeError(f"Invalid metadata: {e}")
+            if isinstance(metadata, dict) and isinstance(metadata.get('scenes'), list):
+                return metadata
+    raise BlendProbeError("Blender printed no metadata")
+
+
+def probe_blend(blender_path, blend_file, timeout=PROBE_TIMEOUT):
+    """
+    Runs Blender in background mode to read the scenes of a .blend file
+
+    Returns:
+        {'active_scene': name, 'scenes': [{'name', 'frame_start', 'frame_end', ...}]}
+    """
+    if not blender_path:
+        raise BlendProbeError("Blender executable not set")
+    if not os.path.isfile(blend_file):
+        raise BlendProbeError(f"File not found: {blend_file}")
+
+    try:
+        result = subprocess.run(probe_command(blender_path, blend_file), stdin=subprocess.DEVNULL,
+                                stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                universal_newlines=True, errors='replace', timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise BlendProbeError(f"Blender did not answer within {timeout} s")
+    except OSError as e:
+        raise BlendProbeError(f"Unable to start Blender: {e}")
+
+    try:
+        return parse_probe_output(result.stdout)
+    except BlendProbeError:
+        if result.returncode:
+            raise BlendProbeError(f"Blender exited with code {result.returncode}")
+        raise
+
+
+def blend_dependencies(metadata):
+    """Files a .blend depends on (linked libraries, external images), from its probed metadata"""
+    return list(metadata.get('libraries') or []) + list(metadata.get('images') or [])
+
+
+def scene_metadata(metadata, scene_name=None):
+    """Metadata of the named scene, or of the active one"""
+    scenes = metadata.get('scenes') or []
+    name = scene_name or metadata.get('active_scene')
+    for scene in scenes:
+        if scene.get('name') == name:
+            return scene
+    return scenes[0] if scenes else None
+
+
+class BlendMetadataCache:
+    """Probe results on disk, valid while the .blend keeps its mtime and size"""
+
+    MAX_ENTRIES = 500  # Least recently probed files are dropped beyond this
+    _instances = {}  # Cache file -> instance shared in the process
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cache_file):
+        self.cache_file = cache_file
+        self._lock = threading.Lock()
+        self._entries = None  # Loaded on first use
+        self._probing = {}  # key -> Event of the probe in progress
+
+    @classmethod
+    def instance(cls, settings_dir):
+        """The cache of a settings directory, shared by all its users in the process"""
+        cache_file = os.path.join(settings_dir, CACHE_FILE_NAME)
+        with cls._instances_lock:
+            key = cls.key(cache_file)
+            if key not in cls._instances:
+                cls._instances[key] = cls(cache_file)
+            return cls._instances[key]
+
+    @staticmethod
+    def key(blend_file):
+        return os.path.normcase(os.path.abspath(blend_file))
+
+    def get(self, blend_file):
+        """Cached metadata of a file, or None when missing or out of date"""
+        try:
+            stat = os.stat(blend_file)
+        except OSError:
+            return None
+        with self._lock:
+            entry = self._load().get(self.key(blend_file))
+        if entry and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+            return entry['metadata']
+        return None
+
+    def probe(self, blender_path, blend_file, timeout=PROBE_TIMEOUT):
+        """Returns the metadata of a file, running Blender only on a cache miss"""
+        key = self.key(blend_file)
+        while True:
+            metadata = self.get(blend_file)
+            if metadata is not None:
+                return metadata
+            with self._lock:
+                running = self._probing.get(key)
+                if running is None:
+                    self._probing[key] = threading.Event()
+                    break
+            # Another thread is probing this file: use its result
+            running.wait(timeout)
+
+        try:
+            stat = os.stat(blend_file)
+            metadata = probe_blend(blender_path, blend_file, timeout)
+            self.put(blend_file, metadata, stat)
+            return metadata
+        except OSError:
+            raise BlendProbeError(f"File not found: {blend_file}")
+        finally:
+            with self._lock:
+                self._probing.pop(key).set()
+
+    def put(self, blend_file, metadata, stat=None):
+        """Stores metadata for the current (or given) state of a file"""
+        stat = stat or os.stat(blend_file)
+        with self._lock:
+            entries = self._load()
+            entries[self.key(blend_file)] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size,
+                                             'probed': time.time(), 'metadata': metadata}
+            drop_oldest(entries, self.MAX_ENTRIES, lambda entry: entry.get('probed', 0))
+            self._save(entries)
+
+    def invalidate(self, blend_file=None):
+        """Forgets one file, or every file"""
+        with self._lock:
+            entries = self._load()
+            if blend_file is None:
+                entries.clear()
+            else:
+                entries.pop(self.key(blend_file), None)
+            self._save(entries)
+
+    def _load(self):
+        if self._entries is None:
+            entries = read_json(self.cache_file, "the .blend metadata cache")
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def _save(self, entries):
+        write_json_atomic(self.cache_file, entries, "the .blend metadata cache", indent=None)
@@ -1,31 +1,74 @@
 import subprocess
 import threading
 import os
-from PyQt5.QtCore import QObject, pyqtSignal
+from .qt_compat import QObject, pyqtSignal
 import sys
 import io
+import time
+import signal
+from .output_parser import parse_line
+from .eta import EtaEstimator
+from .frame_stats import FrameStats
+from .resource_sampler import ResourceSampler, ResourceSeries, DEFAULT_INTERVAL, DEFAULT_CAPACITY
+from .job_log import JobLogWriter
 
 class BlenderExecutor(QObject):
     """
     Class for executing Blender commands and monitoring output in real time.
     Uses Qt signals to communicate with the user interface.
+    
+    Output lines are buffered by the reader thread and delivered in batches
+    through output_batch, at most max_refresh_rate times per second or as
+    soon as max_batch_size lines are waiting. Progress is coalesced to the
+    latest value of each batch: an EtaEstimator follows frames, samples and
+    tiles, and its Estimate is computed once per batch. Completed frames
+    are recorded in frame_stats (core/frame_stats.py), a new FrameStats
+    for every execution. While the process runs, a ResourceSampler reads
+    its memory, CPU, threads and I/O from /proc every resource_interval
+    seconds into resources (core/resource_sampler.py).
     """
     
     # Signals to communicate with the user interface
-    output_received = pyqtSignal(str)  # Emitted when new output line is received
+    output_batch = pyqtSignal(list)  # List of OutputEvent received since the previous batch
+    output_received = pyqtSignal(str)  # Emitted for each line of a batch (if emit_lines is set)
+    output_parsed = pyqtSignal(object)  # OutputEvent for each line of a batch (if emit_lines is set)
     render_started = pyqtSignal()  # Emitted when rendering starts
     render_completed = pyqtSignal(bool, str)  # Emitted when completed (success, message)
     render_progress = pyqtSignal(float)  # Emitted for progress updates (0.0-1.0)
+    render_eta = pyqtSignal(object)  # Estimate (core/eta.py) emitted with each progress update
+    resource_sampled = pyqtSignal(object)  # ResourceSample (core/resource_sampler.py) of the process
+
+    DEFAULT_REFRESH_RATE = 20  # Batches per second
+    DEFAULT_BATCH_SIZE = 500  # Lines that force an early batch
 
-    def __init__(self):
+    def __init__(self, max_refresh_rate=DEFAULT_REFRESH_RATE, max_batch_size=DEFAULT_BATCH_SIZE):
         super().__init__()
         self.process = None
         self.is_running = False
         self.start_frame = 1
         self.end_frame = 1
-        self.verbose = True  # Controls whether to print output to console as well
+        self.frame_step = 1
+        self.cpu_affinity = None
+        self.verbose = False  # Controls whether to print output to console as well
+        self.emit_lines = True  # Also emit output_received/output_parsed for every line
+        self.max_refresh_rate = max(1, max_refresh_rate)
+        self.max_batch_size = max(1, max_batch_size)
+        self.resource_interval = DEFAULT_INTERVAL  # Seconds between resource samples, 0 = off
+        self.resource_capacity = DEFAULT_CAPACITY  # Samples kept in resources
+        
+        self._buffer = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()  # Keeps batches in order
+        self._flush_wakeup = threading.Event()
+        self._pending_progress = False  # The estimator changed since the last batch
+        self._eta = EtaEstimator(0)
+        self.frame_stats = FrameStats()
+        self.resources = ResourceSeries(1)
+        self._sampler = None
+        self._job_log = None
 
-    def execute(self, command, start_frame=1, end_frame=1, background_process=False):
+    def execute(self, command, start_frame=1, end_frame=1, background_process=False,
+                frame_step=1, cpu_affinity=None, log_path=None, total_frames=None):
         """
         Executes a Blender command with output monitoring
         
@@ -34,55 +77,91 @@ class BlenderExecutor(QObject):
             start_frame: Starting frame of the rendering
             end_frame: Ending frame of the rendering
             background_process: If True, runs in background and does not wait for completion
+            frame_step: Frame jump (-j) of the rendering
+            cpu_affinity: Optional list of CPU ids the process is pinned to
+            log_path: Optional job log file every output line is appended to
+            total_frames: Frames rendered when not every frame_step-th of the range (-f lists)
         
         Returns:
             True if execution started successfully, False otherwise
         """
         if self.is_running:
-            self.output_received.emit("ERROR: Another rendering process is already running")
+            self._emit_output("ERROR: Another rendering process is already running")
             return False
         
         self.start_frame = start_frame
         self.end_frame = end_frame
+        self.frame_step = max(1, int(frame_step))
+        self.cpu_affinity = list(cpu_affinity) if cpu_affinity else None
+        if total_frames is None:
+            total_frames = (end_frame - start_frame) // self.frame_step + 1
+        self._eta = EtaEstimator(total_frames)
+        self._pending_progress = False
+        self.frame_stats = FrameStats()
+        self.resources = ResourceSeries(self.resource_capacity)
+        self._job_log = None
+        if log_path:
+            try:
+                self._job_log = JobLogWriter(log_path)
+            except Exception as e:
+                self._emit_output(f"Unable to open job log {log_path}: {str(e)}")
         self.is_running = True
         
-        # Start a thread for process execution
+        self._start(command, background_process)
+        return True
+
+    def _start(self, command, background_process):
+        """Starts a thread for process execution and one delivering the output batches"""
+        self._flush_wakeup.clear()
+        threading.Thread(target=self._flush_thread, daemon=True).start()
         threading.Thread(
             target=self._execute_process_thread,
             args=(command, background_process),
             daemon=True
         ).start()
+
+    def _popen_options(self):
+        """Platform specific keyword arguments for creating the Blender process"""
+        # Windows uses a different mechanism for inheriting file handles
+        # and requires creationflags to not show the process window
+        options = {}
         
-        return True
+        if sys.platform == "win32":
+            startupinfo = subprocess.STARTUPINFO()
+            startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
+            options['startupinfo'] = startupinfo
+            options['creationflags'] = subprocess.CREATE_NO_WINDOW
+        elif self.cpu_affinity and hasattr(os, "sched_setaffinity"):
+            # Pin the child before exec so Blender sizes its thread pool on it
+            cpus = set(self.cpu_affinity)
+            options['preexec_fn'] = lambda: os.sched_setaffinity(0, cpus)
+        
+        return options
+
+    def _native_process(self):
+        """The subprocess.Popen object of the running process"""
+        return self.process
 
     def _execute_process_thread(self, command, background_process):
         """Thread worker for executing the Blender process"""
         try:
             # Create the process with pipes for stdout and stderr
-            self.output_received.emit(f"Starting command: {' '.join(command)}")
+            self._emit_output(f"Starting command: {' '.join(command)}")
             self.render_started.emit()
             
-            # Windows uses a different mechanism for inheriting file handles
-            # and requires creationflags to not show the process window
-            startupinfo = None
-            creationflags = 0
-            
-            if sys.platform == "win32":
-                startupinfo = subprocess.STARTUPINFO()
-                startupinfo.dwFlags |= subprocess.STARTF_USESHOWWINDOW
-                creationflags = subprocess.CREATE_NO_WINDOW
-            
             # Explicitly set UTF-8 encoding for output
             self.process = subprocess.Popen(
                 command,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
                 universal_newlines=False,  # Disable universal_newlines
-                bufsize=1,  # Line buffered
-                startupinfo=startupinfo,
-                creationflags=creationflags
+                **self._popen_options()
             )
             
+            if sys.platform == "win32" and self.cpu_affinity:
+                self._set_windows_affinity(self.cpu_affinity)
+            self._start_sampler()
+            
             # Use TextIOWrapper to handle UTF-8 encoding
             with io.TextIOWrapper(self.process.stdout, encoding='utf-8', errors='replace') as text_output:
                 # Read output line by line in real time
@@ -91,61 +170,147 @@ class BlenderExecutor(QObject):
                         self._process_output_line(line.rstrip())
             
             # Wait for process completion
-            return_code = self.process.wait()
-            
-            if return_code == 0:
-                self.output_received.emit("Rendering completed successfully")
-                self.render_completed.emit(True, "Rendering completed successfully")
-            else:
-                self.output_received.emit(f"Blender exited with error code {return_code}")
-                self.render_completed.emit(False, f"Rendering error (code {return_code})")
+            self._report_exit(self.process.wait())
         
         except Exception as e:
-            self.output_received.emit(f"Error during process execution: {str(e)}")
-            self.render_completed.emit(False, f"Error: {str(e)}")
+            self._report_error(e)
         
         finally:
-            self.is_running = False
+            self._finish()
+
+    def _start_sampler(self):
+        """Starts sampling the resources of the process just launched"""
+        if self.resource_interval and self.resource_interval > 0:
+            self._sampler = ResourceSampler(self.process.pid, self.resources, self.resource_interval,
+                                            callback=self.resource_sampled.emit)
+            self._sampler.start()
+
+    def _report_peak_memory(self):
+        """Logs when the process used the most memory, to diagnose crashes and OOM kills"""
+        peak = self.resources.peak
+        if peak is not None:
+            latest = self.resources.latest()
+            self._emit_output(f"Process memory peaked at {peak.rss_mb:.0f} MB after {peak.elapsed:.0f} s "
+                              f"(last sample: {latest.rss_mb:.0f} MB after {latest.elapsed:.0f} s)")
+
+    def _report_exit(self, return_code):
+        """Emits the final output line and render_completed for an exit code"""
+        if return_code == 0:
+            self.frame_stats.close()  # Last frame of a render without file output
+            self._emit_output("Rendering completed successfully")
+            self._flush_output()
+            self.render_completed.emit(True, "Rendering completed successfully")
+        else:
+            self._emit_output(f"Blender exited with error code {return_code}")
+            self._report_peak_memory()
+            self._flush_output()
+            self.render_completed.emit(False, f"Rendering error (code {return_code})")
+
+    def _report_error(self, error):
+        self._emit_output(f"Error during process execution: {str(error)}")
+        self._flush_output()
+        self.render_completed.emit(False, f"Error: {str(error)}")
+
+    def _finish(self):
+        """Delivers the remaining output and releases the job log"""
+        self.is_running = False
+        if self._sampler is not None:
+            self._sampler.stop()
+            self._sampler = None
+        self._flush_wakeup.set()
+        self._flush_output()
+        if self._job_log is not None:
+            with self._flush_lock:
+                self._job_log.close()
+
+    def _set_windows_affinity(self, cpus):
+        """Pins the process to the given CPUs on Windows"""
+        try:
+            import ctypes
+            mask = 0
+            for cpu in cpus:
+                mask |= 1 << cpu
+            ctypes.windll.kernel32.SetProcessAffinityMask(int(self._native_process()._handle), mask)
+        except Exception as e:
+            self._emit_output(f"Unable to set CPU affinity: {str(e)}")
+
+    def _emit_output(self, line):
+        """Parses a line and queues its OutputEvent for the next batch"""
+        event = parse_line(line)
+        with self._buffer_lock:
+            self._buffer.append(event)
+            full = len(self._buffer) >= self.max_batch_size
+        
+        # Without a running flush thread the line is delivered right away
+        if full or not self.is_running:
+            self._flush_output()
+        return event
+
+    def _flush_thread(self):
+        """Delivers the buffered output at most max_refresh_rate times per second"""
+        interval = 1.0 / self.max_refresh_rate
+        while self.is_running:
+            started = time.monotonic()
+            self._flush_output()
+            remaining = interval - (time.monotonic() - started)
+            if remaining > 0:
+                self._flush_wakeup.wait(remaining)
+        self._flush_output()
+
+    def _flush_output(self):
+        """Emits the buffered lines as one batch and the latest progress"""
+        with self._flush_lock:
+            with self._buffer_lock:
+                batch = self._buffer
+                self._buffer = []
+                estimate = self._eta.estimate() if self._pending_progress else None
+                self._pending_progress = False
+            
+            if batch:
+                if self._job_log is not None:
+                    self._job_log.write_events(batch)
+                if self.verbose and sys.stdout is not None:
+                    # One write per batch instead of one print per line
+                    sys.stdout.write("\n".join(event.line for event in batch) + "\n")
+                self.output_batch.emit(batch)
+                if self.emit_lines:
+                    for event in batch:
+                        self.output_received.emit(event.line)
+                        self.output_parsed.emit(event)
+            
+            if estimate is not None:
+                self.render_progress.emit(estimate.fraction)
+                self.render_eta.emit(estimate)
 
     def _process_output_line(self, line):
         """Processes an output line from the Blender process"""
         if not line:
             return
         
-        # Emit the output signal
-        self.output_received.emit(line)
-        
-        # If verbose is enabled, also print to console
-        if self.verbose:
-            print(line)
+        # Parse the line once and queue it for the next batch
+        event = self._emit_output(line)
         
-        # Parse the line for progress information
-        self._parse_progress_info(line)
+        # Update progress information
+        self._parse_progress_info(event)
 
-    def _parse_progress_info(self, line):
+    def _parse_progress_info(self, event):
         """
-        Parses an output line to extract progress information
+        Feeds a parsed output line to the progress estimator
         Example: "Fra:10 Mem:8.40M (0.00M, Peak 8.40M) | Time:00:00.12 | Mem:0.00M, Peak:0.00M | Scene, RenderLayer | Path Tracing Tile 1/4"
         """
-        import re
-        
-        # Look for the current frame number
-        frame_match = re.search(r'Fra:(\d+)', line)
-        if frame_match:
-            current_frame = int(frame_match.group(1))
-            total_frames = self.end_frame - self.start_frame + 1
-            
-            if total_frames > 0:
-                # Calculate actual progress considering start frame
-                current_progress = current_frame - self.start_frame + 1
-                progress = current_progress / total_frames
-                progress = max(0.0, min(1.0, progress))  # Clamp between 0 and 1
-                self.render_progress.emit(progress)
+        if (event.frame is None and event.sample is None and event.tile is None
+                and event.saved_path is None and event.render_time is None and not event.finished):
+            return
+        self.frame_stats.update(event)
+        # Coalesced: the estimate is computed once, with the next batch
+        with self._buffer_lock:
+            if self._eta.update(event):
+                self._pending_progress = True
 
     def terminate(self):
         """Terminates the Blender process if it is running"""
         if self.process and self.is_running:
-            self.output_received.emit("Terminating rendering process...")
+            self._emit_output("Terminating rendering process...")
             
             try:
                 # The most appropriate method depends on the operating system
@@ -155,16 +320,49 @@ class BlenderExecutor(QObject):
                     self.process.terminate()
                 
                 self.is_running = False
-                self.output_received.emit("Process terminated")
+                self._emit_output("Process terminated")
                 self.render_completed.emit(False, "Rendering interrupted by user")
                 return True
             
             except Exception as e:
-                self.output_received.emit(f"Error during termination: {str(e)}")
+                self._emit_output(f"Error during termination: {str(e)}")
                 return False
         
         return False
 
+    @property
+    def pid(self):
+        """PID of the running Blender process, or None"""
+        if self.process and self.is_running:
+            return self.process.pid
+        return None
+
+    def suspend(self):
+        """Suspends the running Blender process without terminating it"""
+        return self._signal_suspend(True)
+
+    def resume(self):
+        """Resumes a process previously suspended with suspend()"""
+        return self._signal_suspend(False)
+
+    def _signal_suspend(self, suspend):
+        """Sends the platform specific suspend/resume request to the process"""
+        if not (self.process and self.is_running):
+            return False
+
+        try:
+            if sys.platform == "win32":
+                import ctypes
+                ntdll = ctypes.windll.ntdll
+                func = ntdll.NtSuspendProcess if suspend else ntdll.NtResumeProcess
+                func(int(self._native_process()._handle))
+            else:
+                os.kill(self.process.pid, signal.SIGSTOP if suspend else signal.SIGCONT)
+            return True
+        except Exception as e:
+            self._emit_output(f"Error during {'suspend' if suspend else 'resume'}: {str(e)}")
+            return False
+
     def is_rendering(self):
         """Returns True if there is an active rendering process"""
         return self.is_running
\ No newline at end of file
@@ -0,0 +1,257 @@
+"""
+Blender command lines built from parameter values.
+
+Shared by the Command Builder tab and the headless interface: parameters
+are keyed by the flags of ParamDefinitions (as stored in settings and
+presets) and ordered with ParamDefinitions.get_param_order().
+
+RenderCommand is the immutable result: the argument list passed to the
+process as is (never re-parsed from a display string) and what it
+renders, which the render queue uses for frames, sharding and naming.
+Its display string is quoted for the platform shell and built once.
+"""
+
+import os
+import shlex
+import subprocess
+import sys
+from dataclasses import dataclass
+from functools import cached_property
+from typing import Optional, Tuple
+
+from .frame_set import FrameSet, FrameSpecError
+from .param_definitions import ParamDefinitions
+
+# Key used by presets for the .blend file
+BLEND_FILE_KEY = 'blend_file'
+
+
+def normalize_parameters(parameters):
+    """Maps preset keys to parameter flags and drops unset values"""
+    values = {}
+    for param, value in (parameters or {}).items():
+        if param == BLEND_FILE_KEY:
+            param = ParamDefinitions.FILE
+        # Unchecked boxes, empty fields and zero spin boxes are not passed to Blender
+        if value:
+            values[param] = value
+    return values
+
+
+def build_command(blender_path, parameters):
+    """
+    Builds the argument list of a Blender command
+
+    Args:
+        blender_path: Blender executable, "blender" if empty
+        parameters: Dictionary {flag: value}, booleans for switches
+
+    Returns:
+        List of command arguments (for subprocess)
+    """
+    values = normalize_parameters(parameters)
+    command = [blender_path or "blender"]
+
+    blend_file = values.pop(ParamDefinitions.FILE, None)
+    background_mode = bool(values.pop(ParamDefinitions.BACKGROUND, False))
+
+    # -f in Blender's own syntax (e.g. "5-10" becomes "5..10"); relative frames are kept as typed
+    if ParamDefinitions.RENDER_FRAME in values and not FrameSet.is_relative(values[ParamDefinitions.RENDER_FRAME]):
+        try:
+            values[ParamDefinitions.RENDER_FRAME] = FrameSet.parse(values[ParamDefinitions.RENDER_FRAME]).to_blender()
+        except FrameSpecError:
+            pass
+
+    # -b and the .blend file come first, Blender applies the others in order
+    if background_mode:
+        command.append(ParamDefinitions.BACKGROUND)
+    if blend_file:
+        command.append(str(blend_file))
+
+    ordered_params = sorted(values.items(), key=lambda item: ParamDefinitions.get_param_order(item[0]))
+    for param, value in ordered_params:
+        command.append(param)
+        if not isinstance(value, bool):
+            command.append(str(value))
+
+    return command
+
+
+@dataclass(frozen=True)
+class RenderCommand:
+    """A Blender command and what it renders"""
+    argv: Tuple[str, ...]
+    blend_file: Optional[str] = None
+    scene: Optional[str] = None  # -S, None for the scene saved in the file
+    engine: Optional[str] = None  # -E
+    output: Optional[str] = None  # -o
+    animation: bool = False  # -a, otherwise -f (or nothing) is rendered
+    start_frame: int = 1
+    end_frame: int = 1
+    frame_step: int = 1  # -j
+    frames: Optional[FrameSet] = None  # Frames rendered, None when unknown (relative -f, -a without -s and -e)
+
+    # Options whose value is kept in the metadata
+    METADATA_OPTIONS = (ParamDefinitions.SCENE, ParamDefinitions.ENGINE,
+                        ParamDefinitions.RENDER_OUTPUT, ParamDefinitions.FRAME_JUMP)
+
+    @classmethod
+    def from_parameters(cls, blender_path, parameters, scene_range=None):
+        """
+        Builds the command of parameter values ({flag: value}, as in presets)
+
+        scene_range (start, end) of the scene resolves relative -f frames (+N, -N).
+        """
+        blend_file = normalize_parameters(parameters).get(ParamDefinitions.FILE)
+        return cls.from_argv(build_command(blender_path, parameters),
+                             str(blend_file) if blend_file else None, scene_range)
+
+    @classmethod
+    def from_argv(cls, argv, blend_file=None, scene_range=None):
+        """Wraps an existing argument list, e.g. a job restored from the saved queue"""
+        argv = tuple(str(arg) for arg in argv)
+        options = {}
+        for i, arg in enumerate(argv[1:-1], 1):
+            if arg in cls.METADATA_OPTIONS:
+                options.setdefault(arg, argv[i + 1])
+        if blend_file is None:
+            blend_file = next((arg for arg in argv[1:] if arg.lower().endswith('.blend')), None)
+        try:
+            frame_step = max(1, int(options.get(ParamDefinitions.FRAME_JUMP, 1)))
+        except ValueError:
+            frame_step = 1
+
+        animation = ParamDefinitions.RENDER in argv
+        if animation:
+            start_frame, end_frame = frame_range(argv)
+            # Without both -s and -e the range is the one saved in the scene
+            explicit = ParamDefinitions.FRAME_START in argv and ParamDefinitions.FRAME_END in argv
+            frames = FrameSet.from_range(start_frame, end_frame, frame_step) if explicit else None
+        else:
+            frames = frame_set(argv, *(scene_range or (None, None)))
+            start_frame, end_frame = (frames.first, frames.last) if frames else frame_range(argv)
+        return cls(argv, blend_file, options.get(ParamDefinitions.SCENE),
+                   options.get(ParamDefinitions.ENGINE), options.get(ParamDefinitions.RENDER_OUTPUT),
+                   animation, start_frame, end_frame, frame_step, frames)
+
+    @cached_property
+    def display(self):
+        return format_command(self.argv)
+
+    @property
+    def name(self):
+        """File name of the .blend, used to label jobs"""
+        return os.path.basename(self.blend_file) if self.blend_file else ""
+
+    @property
+    def frame_count(self):
+        if self.frames is not None:
+            return len(self.frames)
+        return max(0, (self.end_frame - self.start_frame) // self.frame_step + 1)
+
+    def with_frames(self, frames):
+        """Copy rendering only the given frames with -f; an animation's -s, -e, -j and -a are replaced"""
+        argv = list(self.argv)
+        if ParamDefinitions.RENDER_FRAME in argv:
+            index = argv.index(ParamDefinitions.RENDER_FRAME)
+            argv[index + 1] = frames.to_blender()
+            return RenderCommand.from_argv(argv, self.blend_file)
+
+        range_options = (ParamDefinitions.FRAME_START, ParamDefinitions.FRAME_END, ParamDefinitions.FRAME_JUMP)
+        result = []
+        i = 0
+        while i < len(argv):
+            if argv[i] in range_options and i + 1 < len(argv):
+                i += 2
+                continue
+            # -f takes the place of -a, after the options Blender must apply first
+            if argv[i] == ParamDefinitions.RENDER:
+                result.extend((ParamDefinitions.RENDER_FRAME, frames.to_blender()))
+            else:
+                result.append(argv[i])
+            i += 1
+        if ParamDefinitions.RENDER_FRAME not in result:
+            result.extend((ParamDefinitions.RENDER_FRAME, frames.to_blender()))
+        return RenderCommand.from_argv(result, self.blend_file)
+
+    def with_range(self, start_frame, end_frame):
+        """Copy of an animation rendering from start_frame to end_frame (same step)"""
+        argv = list(self.argv)
+        for option, value in ((ParamDefinitions.FRAME_START, start_frame), (ParamDefinitions.FRAME_END, end_frame)):
+            if option in argv:
+                argv[argv.index(option) + 1] = str(value)
+            else:
+                argv.insert(argv.index(ParamDefinitions.RENDER), option)
+                argv.insert(argv.index(ParamDefinitions.RENDER), str(value))
+        return RenderCommand.from_argv(argv, self.blend_file)
+
+    def __str__(self):
+        return self.display
+
+
+def command_from_preset(preset, overrides=None, blender_path=None):
+    """
+    Builds the command of a preset as saved by the Command Builder
+
+    Args:
+        preset: Preset dictionary with 'blender_path' and 'parameters'
+        overrides: Optional {flag: value} applied on top of the preset parameters
+        blender_path: Optional executable replacing the one of the preset
+
+    Returns:
+        RenderCommand
+    """
+    parameters = dict(preset.get('parameters', {}))
+    if overrides:
+        parameters.update(overrides)
+    return RenderCommand.from_parameters(blender_path or preset.get('blender_path', ''), parameters)
+
+
+def frame_set(command, scene_start=None, scene_end=None):
+    """
+    Returns the FrameSet of the -f option of a command
+
+    None without -f, or when its value is invalid or relative to an unknown scene range.
+    """
+    for i, arg in enumerate(command[:-1]):
+        if arg == ParamDefinitions.RENDER_FRAME:
+            try:
+                return FrameSet.parse(command[i + 1], scene_start, scene_end)
+            except FrameSpecError:
+                return None
+    return None
+
+
+def frame_range(command):
+    """Returns the (start, end) frames rendered by a command"""
+    # Extract frame start and end values from parameters
+    start_frame = 1
+    end_frame = 1
+
+    # If animation, look for start/end frames
+    if ParamDefinitions.RENDER in command:
+        for i, arg in enumerate(command):
+            if (arg == ParamDefinitions.FRAME_START and i + 1 < len(command)):
+                try:
+                    start_frame = int(command[i + 1])
+                except ValueError:
+                    pass
+            elif (arg == ParamDefinitions.FRAME_END and i + 1 < len(command)):
+                try:
+                    end_frame = int(command[i + 1])
+                except ValueError:
+                    pass
+    # If not animation, first and last of the -f frames (e.g. "1,3,5..10")
+    else:
+        frames = frame_set(command)
+        if frames:
+            start_frame, end_frame = frames.first, frames.last
+
+    return start_frame, end_frame
+
+
+def format_command(command):
+    """Formats an argument list for display, quoted for the shell of the platform"""
+    if sys.platform == "win32":
+        return subprocess.list2cmdline(command)
+    return shlex.join(command)
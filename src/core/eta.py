@@ -0,0 +1,178 @@
+"""
+Progress and remaining time of a render, estimated from the parsed output.
+
+The fraction done combines three levels:
+
+    frames   completed frames ('Saved:', or the next frame starting)
+    samples  'Sample x/y' (Cycles) or 'Rendering x / y samples' (EEVEE)
+             inside the current frame
+    tiles    'Tile x/y' when Cycles renders in tiles, samples then
+             advance inside each tile
+
+Sampling is weighted SAMPLING_WEIGHT of a frame, the rest being scene
+synchronization, compositing and saving.
+
+Seconds per frame is an exponentially weighted moving average (EWMA) of
+the time between frame completions, so it includes every per-frame
+overhead and follows scenes that get heavier along the animation. The
+current frame is projected from its own progress, trusted more as it
+advances. The confidence interval accounts for the frame-to-frame spread
+(EW variance) and for the uncertainty of the average itself, which
+dominates on long animations where few frames have been measured.
+"""
+
+import math
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+SAMPLING_WEIGHT = 0.9  # Share of a frame spent sampling
+
+
+@dataclass(frozen=True)
+class Estimate:
+    """Snapshot of the progress of a render"""
+    fraction: float  # 0.0-1.0, frames weighted by samples and tiles
+    frames_done: int
+    total_frames: int
+    seconds_per_frame: Optional[float] = None  # EWMA, None until a frame is measured
+    eta: Optional[float] = None  # Remaining seconds, None while unknown
+    eta_low: Optional[float] = None  # Confidence interval of eta
+    eta_high: Optional[float] = None
+
+
+class EtaEstimator:
+    """
+    Turns OutputEvents into an Estimate
+
+    Args:
+        total_frames: Frames the render will produce
+        alpha: EWMA smoothing factor, higher follows changes faster
+        z: Width of the confidence interval in standard deviations (1.96 = 95%)
+        clock: Time source, replaceable for tests and replays
+    """
+
+    def __init__(self, total_frames, alpha=0.3, z=1.96, clock=time.monotonic):
+        self.total_frames = max(0, int(total_frames))
+        self.alpha = alpha
+        self.z = z
+        self.clock = clock
+        self.start()
+
+    def start(self, now=None):
+        """Resets the estimator; frame times are measured from now"""
+        self.started_at = self.clock() if now is None else now
+        self.last_completion = self.started_at
+        self.frames_done = 0
+        self.mean = None  # Seconds per frame
+        self.variance = 0.0
+        self.measured = 0  # Frames that contributed to mean
+        self._reset_frame()
+        self.current_frame = None
+
+    def _reset_frame(self):
+        self.sample = 0
+        self.total_samples = 0
+        self.tile = 0
+        self.total_tiles = 0
+        self.render_finished = False
+        self.frame_saved = False
+
+    def update(self, event, now=None):
+        """Consumes one OutputEvent; returns True when the progress changed"""
+        now = self.clock() if now is None else now
+        changed = False
+
+        if event.frame is not None and event.frame != self.current_frame:
+            if self.current_frame is not None and not self.frame_saved:
+                # No 'Saved:' line (e.g. no file output): the next frame ends the previous one
+                self._complete_frame(now)
+            self.current_frame = event.frame
+            self._reset_frame()
+            changed = True
+
+        if event.tile is not None:
+            self.tile, self.total_tiles = event.tile, event.total_tiles
+            changed = True
+        if event.sample is not None and event.total_samples:
+            self.sample, self.total_samples = event.sample, event.total_samples
+            changed = True
+        if event.finished and not self.render_finished:
+            self.render_finished = True
+            changed = True
+        if event.saved_path is not None and not self.frame_saved:
+            # Extra outputs of the same frame (views, file output nodes) are not frames
+            self._complete_frame(now)
+            self.frame_saved = True
+            changed = True
+        return changed
+
+    def _complete_frame(self, now):
+        duration = max(0.0, now - self.last_completion)
+        self.last_completion = now
+        self.frames_done = min(self.frames_done + 1, self.total_frames or self.frames_done + 1)
+        self.measured += 1
+        if self.mean is None:
+            self.mean = duration
+        else:
+            diff = duration - self.mean
+            self.mean += self.alpha * diff
+            self.variance = (1.0 - self.alpha) * (self.variance + self.alpha * diff * diff)
+        self._reset_frame()
+
+    def frame_fraction(self):
+        """Progress inside the current frame (0.0-1.0)"""
+        if self.frame_saved or self.current_frame is None:
+            return 0.0
+        if self.render_finished:
+            return SAMPLING_WEIGHT
+        if not self.total_samples:
+            return 0.0
+        sampled = min(1.0, self.sample / self.total_samples)
+        if self.total_tiles:
+            sampled = (min(self.tile, self.total_tiles) - 1 + sampled) / self.total_tiles
+        return SAMPLING_WEIGHT * max(0.0, sampled)
+
+    def fraction(self):
+        within = self.frame_fraction()
+        if self.total_frames <= 0:
+            return within
+        return max(0.0, min(1.0, (self.frames_done + within) / self.total_frames))
+
+    def estimate(self, now=None):
+        """Current Estimate; the remaining time keeps counting down between updates"""
+        now = self.clock() if now is None else now
+        fraction = self.fraction()
+        result = Estimate(fraction, self.frames_done, self.total_frames, self.mean)
+        if self.total_frames <= 0:
+            return result
+
+        within = self.frame_fraction()
+        elapsed = max(0.0, now - self.last_completion)  # In the current frame
+        frames_after = max(0, self.total_frames - self.frames_done - 1)
+
+        # Duration of the current frame: its own projection, trusted as it advances
+        projected = elapsed / within if within > 0.0 else None
+        if self.mean is None and projected is None:
+            return result
+        if self.mean is None:
+            frame_time = projected
+        elif projected is None:
+            frame_time = self.mean
+        else:
+            frame_time = within * projected + (1.0 - within) * self.mean
+
+        if self.frames_done >= self.total_frames:
+            return Estimate(1.0, self.frames_done, self.total_frames, self.mean, 0.0, 0.0, 0.0)
+
+        eta = max(0.0, frame_time - elapsed) + frames_after * (self.mean if self.mean is not None else frame_time)
+        if self.measured < 2:
+            return Estimate(fraction, self.frames_done, self.total_frames, self.mean, eta)
+
+        # Spread of the remaining frames plus the error of the average
+        # (EWMA effective sample size: (2 - alpha) / alpha)
+        remaining = max(0.0, self.total_frames - self.frames_done - within)
+        effective = min(self.measured, (2.0 - self.alpha) / self.alpha)
+        spread = math.sqrt(remaining * self.variance + remaining * remaining * self.variance / effective)
+        return Estimate(fraction, self.frames_done, self.total_frames, self.mean, eta,
+                        max(0.0, eta - self.z * spread), eta + self.z * spread)
@@ -0,0 +1,38 @@
+"""
+Selection of the backend running Blender processes.
+
+'thread' runs every process with a reader and a flush thread (the
+original BlenderExecutor); 'asyncio' supervises all processes from one
+shared event loop and supports timeouts and graceful termination.
+"""
+
+from .blender_executor import BlenderExecutor
+
+BACKEND_THREAD = 'thread'
+BACKEND_ASYNCIO = 'asyncio'
+BACKENDS = (BACKEND_THREAD, BACKEND_ASYNCIO)
+
+
+def create_executor(backend=BACKEND_THREAD, max_refresh_rate=BlenderExecutor.DEFAULT_REFRESH_RATE,
+                    max_batch_size=BlenderExecutor.DEFAULT_BATCH_SIZE, timeout=None, kill_grace=10.0):
+    """
+    Creates an executor for the given backend
+
+    Args:
+        backend: 'thread' or 'asyncio'
+        max_refresh_rate: Output batches per second
+        max_batch_size: Lines that force an early batch
+        timeout: Seconds after which the render is stopped (asyncio only)
+        kill_grace: Seconds between SIGTERM and kill (asyncio only)
+
+    Returns:
+        A BlenderExecutor instance
+    """
+    if backend == BACKEND_ASYNCIO:
+        # Imported here so the thread backend never pays for asyncio
+        from .async_executor import AsyncBlenderExecutor
+        return AsyncBlenderExecutor(max_refresh_rate, max_batch_size,
+                                    timeout=timeout, kill_grace=kill_grace)
+    if backend != BACKEND_THREAD:
+        raise ValueError(f"Unknown executor backend: {backend}")
+    return BlenderExecutor(max_refresh_rate, max_batch_size)
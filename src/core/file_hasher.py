@@ -0,0 +1,209 @@
+"""
+Content digests of files, computed once per change.
+
+FileHasher remembers the SHA-256 of every file it hashed together with its
+stat signature (inode, size, mtime) in a JSON index, and reads a file again
+only when the signature changed: asking whether a multi-gigabyte .blend
+changed costs one stat. Files are streamed in large chunks into a reused
+buffer; several files are hashed in parallel on a thread pool (hashlib
+releases the GIL on large updates), and concurrent requests for the same
+file share one read.
+
+A file modified while it is being hashed gets a digest that is returned
+but not remembered, so the next request reads it again.
+"""
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .blend_metadata import blend_dependencies
+from ..utils.json_store import drop_oldest, read_json, write_json_atomic
+
+CACHE_FILE_NAME = 'file_hashes.json'  # In the settings directory
+CHUNK_SIZE = 4 * 1024 * 1024
+DEFAULT_WORKERS = min(4, os.cpu_count() or 1)
+
+
+def file_signature(path):
+    """(inode, size, mtime_ns) of a file, None when it does not exist"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+def hash_file(path, chunk_size=CHUNK_SIZE):
+    """SHA-256 of the contents of a file, as hex"""
+    digest = hashlib.sha256()
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            size = f.readinto(buffer)
+            if not size:
+                break
+            digest.update(view[:size])
+    return digest.hexdigest()
+
+
+class FileHasher:
+    """
+    Digests of files, remembered on disk by stat signature
+
+    Args:
+        cache_file: JSON index, None keeps it in memory only
+        max_workers: Files hashed at the same time
+    """
+
+    MAX_ENTRIES = 20000  # Least recently used files are forgotten beyond this
+
+    def __init__(self, cache_file=None, max_workers=DEFAULT_WORKERS):
+        self.cache_file = cache_file
+        self.max_workers = max(1, int(max_workers))
+        self._lock = threading.Lock()
+        self._entries = None  # Loaded on first use
+        self._hashing = {}  # key -> Future of the read in progress
+        self._pool = None
+        self._dirty = False
+
+    @staticmethod
+    def key(path):
+        return os.path.normcase(os.path.abspath(path))
+
+    def cached_digest(self, path):
+        """Remembered digest of a file if it did not change since, None otherwise (never reads it)"""
+        signature = file_signature(path)
+        with self._lock:
+            entry = self._load().get(self.key(path))
+        if signature is not None and entry and entry[:3] == signature:
+            return entry[3]
+        return None
+
+    def changed(self, path):
+        """True when a file is new, gone or different from when it was last hashed"""
+        return self.cached_digest(path) is None
+
+    def digest(self, path, remember=True):
+        """Digest of a file (None when it does not exist), read only when it changed"""
+        return self.digests([path], remember)[path]
+
+    def digests(self, paths, remember=True):
+        """
+        Digests of several files, the changed ones read in parallel
+
+        Args:
+            paths: Files to hash
+            remember: Keep the digests in the index (False for files hashed once, like render outputs)
+
+        Returns:
+            {path: digest or None when the file does not exist}
+        """
+        results = {}
+        futures = {}
+        for path in paths:
+            if path in results or path in futures:
+                continue
+            digest = self.cached_digest(path) if remember else None
+            if digest is not None:
+                results[path] = digest
+                with self._lock:
+                    entry = self._load().get(self.key(path))
+                    if entry is not None:
+                        entry[4] = time.time()
+            else:
+                futures[path] = self._submit(path, remember)
+
+        for path, future in futures.items():
+            try:
+                results[path] = future.result()
+            except OSError as e:
+                logging.error(f"Unable to hash {path}: {e}")
+                results[path] = None
+        self._flush()
+        return results
+
+    def _submit(self, path, remember):
+        key = self.key(path)
+        with self._lock:
+            running = self._hashing.get(key)
+            if running is not None:
+                return running
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(self.max_workers, thread_name_prefix='file-hasher')
+            future = self._pool.submit(self._hash, path, key, remember)
+            self._hashing[key] = future
+            return future
+
+    def _hash(self, path, key, remember):
+        try:
+            before = file_signature(path)
+            if before is None:
+                return None
+            digest = hash_file(path)
+            if remember and file_signature(path) == before:
+                with self._lock:
+                    self._load()[key] = before + [digest, time.time()]
+                    self._dirty = True
+            return digest
+        finally:
+            with self._lock:
+                self._hashing.pop(key, None)
+
+    def hash_blend(self, blend_file, metadata=None):
+        """
+        Digests of a .blend and, with its probed metadata, of the files it references
+
+        Args:
+            blend_file: .blend file
+            metadata: Result of BlendMetadataCache.probe(), None for the .blend alone
+
+        Returns:
+            {path: digest or None when missing}, the .blend first
+        """
+        paths = [blend_file] + (blend_dependencies(metadata) if metadata else [])
+        digests = self.digests(paths)
+        return {path: digests[path] for path in paths}
+
+    def forget(self, path=None):
+        """Forgets one file, or every file"""
+        with self._lock:
+            entries = self._load()
+            if path is None:
+                entries.clear()
+            else:
+                entries.pop(self.key(path), None)
+            self._dirty = True
+        self._flush()
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True)
+        self._flush()
+
+    def _flush(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            self._dirty = False
+            entries = self._load()
+            drop_oldest(entries, self.MAX_ENTRIES, lambda entry: entry[4])
+            self._save(entries)
+
+    def _load(self):
+        if self._entries is None:
+            entries = read_json(self.cache_file, "the file hash index") if self.cache_file else None
+            # [inode, size, mtime_ns, digest, last used]
+            self._entries = {k: v for k, v in entries.items() if isinstance(v, list) and len(v) == 5} \
+                if isinstance(entries, dict) else {}
+        return self._entries
+
+    def _save(self, entries):
+        if self.cache_file is not None:
+            write_json_atomic(self.cache_file, entries, "the file hash index", indent=None)
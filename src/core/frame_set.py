@@ -0,0 +1,233 @@
+"""
+Sets of frames, as parsed from Blender's -f argument.
+
+The -f syntax is a comma separated list (no spaces) of items:
+
+    N        frame N
+    +N       N frames after the scene start
+    -N       N frames before the scene end
+    A..B     frames A to B inclusive, A and B in any of the forms above
+    A-B      same as A..B for plain numbers (accepted by this interface,
+             rewritten to A..B since Blender does not know it)
+
+Blender has no step in -f; stepped renders use -s/-e/-j, which
+FrameSet.from_range() covers.
+
+A FrameSet stores sorted, disjoint, non-adjacent inclusive intervals in
+two typed arrays, so "1..100000" is one interval and set operations cost
+O(intervals) instead of O(frames). Frame sets are immutable: operations
+return new sets.
+
+Intervals have no step: a stepped animation (-j 2 and up) or a list of
+isolated frames is one interval per frame, and costs O(frames) like a
+plain list would. Those sets are bounded by the frames actually rendered,
+so this is accepted rather than carrying a step through every operation.
+"""
+
+from array import array
+from bisect import bisect_right
+
+
+class FrameSpecError(ValueError):
+    """Invalid -f frame specification"""
+
+
+class FrameSet:
+    """Immutable set of frames stored as inclusive intervals"""
+
+    def __init__(self, intervals=()):
+        pairs = sorted((int(start), int(end)) for start, end in intervals if end >= start)
+        self._starts = array('q')
+        self._ends = array('q')
+        for start, end in pairs:
+            if self._ends and start <= self._ends[-1] + 1:
+                if end > self._ends[-1]:
+                    self._ends[-1] = end
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+        self._count = sum(end - start + 1 for start, end in zip(self._starts, self._ends))
+
+    @classmethod
+    def _from_arrays(cls, starts, ends):
+        # starts/ends already sorted, disjoint and non-adjacent
+        frame_set = cls.__new__(cls)
+        frame_set._starts = starts
+        frame_set._ends = ends
+        frame_set._count = sum(end - start + 1 for start, end in zip(starts, ends))
+        return frame_set
+
+    @classmethod
+    def from_range(cls, start, end, step=1):
+        """Frames start, start + step, ... up to end (an -s/-e/-j animation), one interval per frame when stepped"""
+        step = max(1, int(step))
+        if step == 1:
+            return cls([(start, end)])
+        return cls._from_arrays(array('q', range(start, end + 1, step)),
+                                array('q', range(start, end + 1, step)))
+
+    @classmethod
+    def parse(cls, spec, scene_start=None, scene_end=None):
+        """
+        Parses an -f value
+
+        Args:
+            spec: Frame specification, e.g. "1,3,5..10"
+            scene_start: First frame of the scene, for +N items
+            scene_end: Last frame of the scene, for -N items
+
+        Raises:
+            FrameSpecError for invalid items, or relative items without the scene range
+        """
+        spec = str(spec).replace(' ', '')
+        if not spec:
+            raise FrameSpecError("Empty frame specification")
+
+        intervals = []
+        for item in spec.split(','):
+            if '..' in item:
+                first, _, last = item.partition('..')
+            elif '-' in item[1:] and item[0] not in '+-':
+                first, _, last = item.partition('-')
+            else:
+                first = last = item
+            start = cls._parse_frame(first, scene_start, scene_end, item)
+            end = cls._parse_frame(last, scene_start, scene_end, item)
+            if end < start:
+                raise FrameSpecError(f"Empty frame range: {item}")
+            intervals.append((start, end))
+        return cls(intervals)
+
+    @staticmethod
+    def _parse_frame(text, scene_start, scene_end, item):
+        try:
+            value = int(text.lstrip('+-'))
+        except ValueError:
+            raise FrameSpecError(f"Invalid frame '{item}'")
+        if text.startswith('+'):
+            if scene_start is None:
+                raise FrameSpecError(f"Relative frame {text} needs the scene frame range")
+            return scene_start + value
+        if text.startswith('-'):
+            if scene_end is None:
+                raise FrameSpecError(f"Relative frame {text} needs the scene frame range")
+            return scene_end - value
+        return value
+
+    @staticmethod
+    def is_relative(spec):
+        """True when an -f value has items relative to the scene range"""
+        return any(part[:1] in ('+', '-') for item in str(spec).replace(' ', '').split(',')
+                   for part in item.split('..'))
+
+    def __len__(self):
+        return self._count
+
+    def __bool__(self):
+        return self._count > 0
+
+    def __contains__(self, frame):
+        index = bisect_right(self._starts, frame) - 1
+        return index >= 0 and frame <= self._ends[index]
+
+    def __iter__(self):
+        for start, end in zip(self._starts, self._ends):
+            yield from range(start, end + 1)
+
+    def __eq__(self, other):
+        if not isinstance(other, FrameSet):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __hash__(self):
+        return hash((self._starts.tobytes(), self._ends.tobytes()))
+
+    def __repr__(self):
+        return f"FrameSet({self.to_blender()!r})"
+
+    def intervals(self):
+        """(start, end) pairs, inclusive and in order"""
+        return zip(self._starts, self._ends)
+
+    @property
+    def interval_count(self):
+        return len(self._starts)
+
+    @property
+    def first(self):
+        return self._starts[0] if self._starts else None
+
+    @property
+    def last(self):
+        return self._ends[-1] if self._ends else None
+
+    def to_blender(self):
+        """The -f value rendering these frames"""
+        return ','.join(str(start) if start == end else f"{start}..{end}"
+                        for start, end in self.intervals())
+
+    def _merge(self, other, keep):
+        # Sweeps the interval boundaries of both sets; keep(in_self, in_other) selects the result
+        events = sorted([(start, 0, 1) for start in self._starts] + [(end + 1, 0, -1) for end in self._ends] +
+                        [(start, 1, 1) for start in other._starts] + [(end + 1, 1, -1) for end in other._ends])
+        depth = [0, 0]
+        starts, ends = array('q'), array('q')
+        inside = False
+        index = 0
+        while index < len(events):
+            position = events[index][0]
+            while index < len(events) and events[index][0] == position:
+                depth[events[index][1]] += events[index][2]
+                index += 1
+            now_inside = keep(depth[0] > 0, depth[1] > 0)
+            if now_inside and not inside:
+                starts.append(position)
+            elif inside and not now_inside:
+                ends.append(position - 1)
+            inside = now_inside
+        return FrameSet._from_arrays(starts, ends)
+
+    def union(self, other):
+        return self._merge(other, lambda a, b: a or b)
+
+    def difference(self, other):
+        return self._merge(other, lambda a, b: a and not b)
+
+    def intersection(self, other):
+        return self._merge(other, lambda a, b: a and b)
+
+    __or__ = union
+    __sub__ = difference
+    __and__ = intersection
+
+    def split(self, parts):
+        """
+        Splits the frames into at most parts consecutive sets of (almost) equal size
+
+        Returns:
+            List of non-empty FrameSet, in frame order
+        """
+        parts = max(1, min(int(parts), self._count))
+        if not self._count:
+            return []
+        base, extra = divmod(self._count, parts)
+        sizes = [base + (1 if i < extra else 0) for i in range(parts)]
+
+        result = []
+        intervals = list(self.intervals())
+        index, offset = 0, 0  # Current interval and frames already taken from it
+        for size in sizes:
+            starts, ends = array('q'), array('q')
+            while size:
+                start, end = intervals[index]
+                start += offset
+                take = min(size, end - start + 1)
+                starts.append(start)
+                ends.append(start + take - 1)
+                size -= take
+                if start + take > end:
+                    index, offset = index + 1, 0
+                else:
+                    offset += take
+            result.append(FrameSet._from_arrays(starts, ends))
+        return result
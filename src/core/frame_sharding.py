@@ -0,0 +1,162 @@
+import os
+import time
+from dataclasses import dataclass
+from typing import List, Optional
+
+from .param_definitions import ParamDefinitions
+
+
+CONTIGUOUS = "contiguous"
+INTERLEAVED = "interleaved"
+
+
+@dataclass
+class FrameShard:
+    """Frames start, start + step, ... up to end rendered by one worker"""
+    start: int
+    end: int
+    step: int = 1
+    cpus: Optional[List[int]] = None
+
+    @property
+    def frame_count(self):
+        if self.end < self.start:
+            return 0
+        return (self.end - self.start) // self.step + 1
+
+
+def split_frame_range(start, end, shards, mode=CONTIGUOUS, step=1):
+    """
+    Splits the animation range start..end (every step frames) across workers
+
+    Args:
+        start: First frame of the animation
+        end: Last frame of the animation
+        shards: Number of workers
+        mode: CONTIGUOUS (one chunk per worker) or INTERLEAVED (worker i
+              renders every shards-th frame, using Blender's -j)
+        step: Frame jump of the original animation
+
+    Returns:
+        List of FrameShard, empty workers are dropped
+    """
+    step = max(1, int(step))
+    total = (end - start) // step + 1 if end >= start else 0
+    shards = max(1, min(int(shards), total))
+
+    result = []
+    if mode == INTERLEAVED:
+        for i in range(shards):
+            result.append(FrameShard(start + i * step, end, step * shards))
+    else:
+        base, extra = divmod(total, shards)
+        index = 0
+        for i in range(shards):
+            count = base + (1 if i < extra else 0)
+            first = start + index * step
+            result.append(FrameShard(first, first + (count - 1) * step, step))
+            index += count
+
+    return [shard for shard in result if shard.frame_count > 0]
+
+
+def available_cpus():
+    """Returns the CPU ids this process is allowed to run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def assign_cpu_subsets(shards, cpus=None):
+    """Gives each shard a disjoint, contiguous subset of the available CPUs"""
+    cpus = available_cpus() if cpus is None else list(cpus)
+    if len(cpus) < len(shards):
+        return shards
+
+    base, extra = divmod(len(cpus), len(shards))
+    index = 0
+    for i, shard in enumerate(shards):
+        count = base + (1 if i < extra else 0)
+        shard.cpus = cpus[index:index + count]
+        index += count
+    return shards
+
+
+def shard_command(command, shard):
+    """
+    Returns a copy of an animation command rendering only the given shard
+
+    Existing -s/-e/-j options are replaced; the new ones are inserted right
+    before -a since Blender applies its arguments in order.
+    """
+    frame_params = (ParamDefinitions.FRAME_START, ParamDefinitions.FRAME_END, ParamDefinitions.FRAME_JUMP)
+
+    result = []
+    skip_next = False
+    for arg in command:
+        if skip_next:
+            skip_next = False
+            continue
+        if arg in frame_params:
+            skip_next = True
+            continue
+        result.append(arg)
+
+    frame_args = [ParamDefinitions.FRAME_START, str(shard.start),
+                  ParamDefinitions.FRAME_END, str(shard.end)]
+    if shard.step != 1:
+        frame_args += [ParamDefinitions.FRAME_JUMP, str(shard.step)]
+
+    insert_at = result.index(ParamDefinitions.RENDER) if ParamDefinitions.RENDER in result else len(result)
+    result[insert_at:insert_at] = frame_args
+    return result
+
+
+class ShardGroup:
+    """Merges the progress of the jobs rendering one sharded animation"""
+
+    def __init__(self, group_id, name=""):
+        self.group_id = group_id
+        self.name = name
+        self.frame_counts = {}  # job id -> frames rendered by the job
+        self.progress = {}  # job id -> progress (0.0-1.0)
+        self.etas = {}  # job id -> remaining seconds estimated by the shard
+        self.start_time = None
+
+    def add_job(self, job_id, frame_count):
+        self.frame_counts[job_id] = frame_count
+        self.progress[job_id] = 0.0
+
+    @property
+    def total_frames(self):
+        return sum(self.frame_counts.values())
+
+    def update(self, job_id, progress, eta=None):
+        """Records the progress (and estimated remaining seconds) of one shard, returns the aggregate progress"""
+        if self.start_time is None:
+            self.start_time = time.time()
+        if job_id in self.progress:
+            self.progress[job_id] = max(0.0, min(1.0, progress))
+            self.etas[job_id] = eta
+        return self.fraction()
+
+    def fraction(self):
+        """Overall progress, shards weighted by their frame count"""
+        total = self.total_frames
+        if total <= 0:
+            return 0.0
+        done = sum(self.progress[job_id] * count for job_id, count in self.frame_counts.items())
+        return done / total
+
+    def eta(self):
+        """Estimated remaining seconds, or None while unknown"""
+        # The animation is done when the slowest shard is; needs an estimate from every unfinished one
+        etas = [self.etas.get(job_id) for job_id, progress in self.progress.items() if progress < 1.0]
+        if etas and all(eta is not None for eta in etas):
+            return max(etas)
+
+        fraction = self.fraction()
+        if self.start_time is None or fraction <= 0.0:
+            return None
+        elapsed = time.time() - self.start_time
+        return elapsed * (1.0 - fraction) / fraction
@@ -0,0 +1,157 @@
+"""
+Per-frame statistics of a render, collected from the parsed output.
+
+FrameStats keeps one row per completed frame in typed arrays (one per
+column), so a long animation costs a few bytes per frame instead of a
+dict per row, and a column can be sorted or exported without building
+row objects:
+
+    frame           frame number (-1 when Blender printed none)
+    wall_time       seconds since the previous frame completed
+    render_time     'Time:' printed by Blender after saving (NaN if missing)
+    saving_time     '(Saving: ...)' part of the same line (NaN if missing)
+    peak_memory_mb  highest 'Peak' reported while rendering the frame
+    samples         samples per pixel of the frame (0 if not reported)
+    saved_path      first file written for the frame ("" if none)
+
+A frame completes on its 'Saved:' line or, without file output, when the
+next frame starts; close() completes the last one when the render ends.
+"""
+
+import csv
+import math
+import threading
+import time
+from array import array
+
+COLUMNS = ('frame', 'wall_time', 'render_time', 'saving_time', 'peak_memory_mb', 'samples',
+           'saved_path')
+NUMERIC_TYPES = {'frame': 'l', 'wall_time': 'd', 'render_time': 'd', 'saving_time': 'd',
+                 'peak_memory_mb': 'd', 'samples': 'l'}
+
+
+class FrameStats:
+    """Columnar store of the completed frames of one render"""
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.start()
+
+    def start(self, now=None):
+        """Clears the rows; wall times are measured from now"""
+        with self._lock:
+            self._columns = {name: array(code) for name, code in NUMERIC_TYPES.items()}
+            self._columns['saved_path'] = []
+            self.last_completion = self.clock() if now is None else now
+            self.current_frame = None
+            self._reset_frame()
+
+    def _reset_frame(self):
+        self.peak_memory_mb = 0.0
+        self.samples = 0
+        self.frame_saved = False
+
+    def __len__(self):
+        return len(self._columns['frame'])
+
+    def update(self, event, now=None):
+        """Consumes one OutputEvent; returns True when a row was added or changed"""
+        now = self.clock() if now is None else now
+        changed = False
+        with self._lock:
+            if event.frame is not None and event.frame != self.current_frame:
+                if self.current_frame is not None and not self.frame_saved:
+                    changed = self._complete_frame(now, "")
+                self.current_frame = event.frame
+                self._reset_frame()
+
+            if event.peak_memory_mb is not None and event.peak_memory_mb > self.peak_memory_mb:
+                self.peak_memory_mb = event.peak_memory_mb
+            if event.total_samples and event.total_samples > self.samples:
+                self.samples = event.total_samples
+            if event.saved_path is not None and not self.frame_saved:
+                # Extra outputs of the same frame (views, file output nodes) are not frames
+                changed = self._complete_frame(now, event.saved_path)
+                self.frame_saved = True
+            if event.render_time is not None and len(self):
+                # Printed right after 'Saved:', for the frame just completed
+                self._columns['render_time'][-1] = event.render_time
+                if event.saving_time is not None:
+                    self._columns['saving_time'][-1] = event.saving_time
+                changed = True
+        return changed
+
+    def close(self, now=None):
+        """Completes the frame being rendered, if it was not saved"""
+        now = self.clock() if now is None else now
+        with self._lock:
+            if self.current_frame is not None and not self.frame_saved:
+                self._complete_frame(now, "")
+                self.frame_saved = True
+
+    def _complete_frame(self, now, saved_path):
+        columns = self._columns
+        columns['frame'].append(-1 if self.current_frame is None else self.current_frame)
+        columns['wall_time'].append(max(0.0, now - self.last_completion))
+        columns['render_time'].append(math.nan)
+        columns['saving_time'].append(math.nan)
+        columns['peak_memory_mb'].append(self.peak_memory_mb)
+        columns['samples'].append(self.samples)
+        columns['saved_path'].append(saved_path)
+        self.last_completion = now
+        return True
+
+    def copy(self):
+        """Snapshot of the rows, safe to read while the render goes on"""
+        snapshot = FrameStats(self.clock)
+        with self._lock:
+            snapshot._columns = {name: column[:] for name, column in self._columns.items()}
+        return snapshot
+
+    def column(self, name):
+        return self._columns[name]
+
+    def row(self, index):
+        return tuple(self._columns[name][index] for name in COLUMNS)
+
+    def rows(self):
+        return [self.row(index) for index in range(len(self))]
+
+    def sorted_indices(self, name, descending=False):
+        """Row order by one column; missing times (NaN) always come last"""
+        column = self._columns[name]
+        if NUMERIC_TYPES.get(name) == 'd':
+            present = [i for i in range(len(column)) if not math.isnan(column[i])]
+            missing = [i for i in range(len(column)) if math.isnan(column[i])]
+            return sorted(present, key=column.__getitem__, reverse=descending) + missing
+        return sorted(range(len(column)), key=column.__getitem__, reverse=descending)
+
+    def to_csv(self, path):
+        """Writes the rows as CSV, missing times as empty cells"""
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(COLUMNS)
+            for row in self.rows():
+                writer.writerow(['' if isinstance(value, float) and math.isnan(value) else value
+                                 for value in row])
+
+    def to_parquet(self, path):
+        """Writes the columns as Parquet, missing times as nulls (requires pyarrow)"""
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)")
+
+        types = {'l': pyarrow.int64(), 'd': pyarrow.float64()}
+        arrays = []
+        for name in COLUMNS:
+            values = self._columns[name]
+            if name in NUMERIC_TYPES:
+                values = [None if isinstance(value, float) and math.isnan(value) else value
+                          for value in values]
+                arrays.append(pyarrow.array(values, type=types[NUMERIC_TYPES[name]]))
+            else:
+                arrays.append(pyarrow.array(values, type=pyarrow.string()))
+        pyarrow.parquet.write_table(pyarrow.Table.from_arrays(arrays, names=list(COLUMNS)), path)
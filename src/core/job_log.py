@@ -0,0 +1,254 @@
+"""
+Per-job render logs with a sidecar index.
+
+Every output line of a job is appended to '<job>.log'. The sidecar
+'<job>.log.idx' is a sequence of fixed-size binary entries mapping frame
+starts and notable levels (as classified by the output parser) to byte
+offsets in the log, so a reader can jump to "frame 812" or list every
+ERROR line of a multi-gigabyte log through a memory map without reading
+the whole file.
+
+Logs live as long as their job: remove_job_log() deletes a log and its
+sidecar when the job is forgotten, and prune_job_logs() removes the logs
+of jobs no longer known at startup, by age and total size.
+"""
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+import time
+
+from .output_parser import LEVEL_ERROR, LEVEL_WARNING, LEVEL_SUCCESS
+
+# Index entry: kind, value (frame number or level code), byte offset of the line
+INDEX_ENTRY = struct.Struct('<BqQ')
+KIND_FRAME = 0
+KIND_LEVEL = 1
+
+# Levels worth indexing; INFO and FRAME lines are the bulk of the output
+INDEXED_LEVELS = {LEVEL_ERROR: 1, LEVEL_WARNING: 2, LEVEL_SUCCESS: 3}
+LEVEL_NAMES = {code: name for name, code in INDEXED_LEVELS.items()}
+
+
+LOG_EXTENSION = '.log'
+DEFAULT_MAX_AGE = 14 * 24 * 3600  # Seconds the logs of forgotten jobs are kept
+DEFAULT_MAX_BYTES = 1024 ** 3  # Total size beyond which the oldest logs of forgotten jobs are removed
+
+
+def index_path_for(log_path):
+    return log_path + '.idx'
+
+
+def remove_job_log(log_path):
+    """Deletes a job log and its index"""
+    for path in (log_path, index_path_for(log_path)):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.error(f"Unable to remove job log {path}: {e}")
+
+
+def prune_job_logs(logs_dir, keep=(), max_age=DEFAULT_MAX_AGE, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Removes the logs of forgotten jobs: those older than max_age, then the
+    oldest ones until every log (kept ones included) fits in max_bytes
+
+    Args:
+        logs_dir: Directory of the job logs
+        keep: Log paths of the jobs still known, never removed
+
+    Returns:
+        Number of logs removed
+    """
+    try:
+        names = os.listdir(logs_dir)
+    except FileNotFoundError:
+        return 0
+    except OSError as e:
+        logging.error(f"Unable to list the job logs: {e}")
+        return 0
+
+    keep = {os.path.normcase(os.path.abspath(path)) for path in keep if path}
+    total = 0
+    candidates = []  # (mtime, size, log path) of the logs that may go
+    for name in names:
+        if not name.endswith(LOG_EXTENSION):
+            continue
+        log_path = os.path.join(logs_dir, name)
+        try:
+            stats = [os.stat(path) for path in (log_path, index_path_for(log_path)) if os.path.exists(path)]
+        except OSError:
+            continue
+        if not stats:
+            continue
+        size = sum(stat.st_size for stat in stats)
+        total += size
+        if os.path.normcase(os.path.abspath(log_path)) not in keep:
+            candidates.append((max(stat.st_mtime for stat in stats), size, log_path))
+
+    removed = 0
+    cutoff = time.time() - max_age
+    for mtime, size, log_path in sorted(candidates):
+        if mtime >= cutoff and total <= max_bytes:
+            break
+        remove_job_log(log_path)
+        total -= size
+        removed += 1
+    return removed
+
+
+class JobLogWriter:
+    """Appends output events to a job log and its index"""
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+        os.makedirs(os.path.dirname(log_path), exist_ok=True)
+        self._log = open(log_path, 'ab')
+        self._index = open(index_path_for(log_path), 'ab')
+        self._offset = self._log.tell()
+        self._last_frame = None
+
+    @property
+    def closed(self):
+        return self._log is None
+
+    def write_events(self, events):
+        """Appends a batch of OutputEvent; safe to call after close()"""
+        if self._log is None:
+            return
+
+        chunks = []
+        entries = []
+        offset = self._offset
+        for event in events:
+            if event.frame is not None and event.frame != self._last_frame:
+                self._last_frame = event.frame
+                entries.append(INDEX_ENTRY.pack(KIND_FRAME, event.frame, offset))
+            level_code = INDEXED_LEVELS.get(event.level)
+            if level_code:
+                entries.append(INDEX_ENTRY.pack(KIND_LEVEL, level_code, offset))
+
+            data = event.line.encode('utf-8', errors='replace') + b'\n'
+            chunks.append(data)
+            offset += len(data)
+
+        try:
+            self._log.write(b''.join(chunks))
+            self._log.flush()
+            if entries:
+                self._index.write(b''.join(entries))
+                self._index.flush()
+            self._offset = offset
+        except Exception as e:
+            logging.error(f"Error writing job log {self.log_path}: {e}")
+
+    def close(self):
+        if self._log is not None:
+            self._log.close()
+            self._index.close()
+            self._log = None
+            self._index = None
+
+
+class JobLogReader:
+    """Random access to a job log through its index and a memory map"""
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+        self.frame_offsets = []  # (offset, frame) in log order
+        self.level_offsets = {name: [] for name in INDEXED_LEVELS}
+        self._load_index()
+
+    def _load_index(self):
+        path = index_path_for(self.log_path)
+        if not os.path.exists(path):
+            return
+
+        with open(path, 'rb') as f:
+            data = f.read()
+
+        # Ignore a truncated trailing entry left by a crash
+        usable = len(data) - len(data) % INDEX_ENTRY.size
+        for kind, value, offset in INDEX_ENTRY.iter_unpack(data[:usable]):
+            if kind == KIND_FRAME:
+                self.frame_offsets.append((offset, value))
+            elif kind == KIND_LEVEL and value in LEVEL_NAMES:
+                self.level_offsets[LEVEL_NAMES[value]].append(offset)
+
+    def frames(self):
+        """Frames found in the log, in render order"""
+        seen = set()
+        return [frame for _, frame in self.frame_offsets if not (frame in seen or seen.add(frame))]
+
+    def level_count(self, level):
+        return len(self.level_offsets.get(level, ()))
+
+    def read_frame(self, frame, max_lines=None):
+        """Returns the lines logged while the given frame was rendering"""
+        lines = []
+        offsets = [offset for offset, _ in self.frame_offsets]
+        with self._map() as mm:
+            if mm is None:
+                return lines
+            for i, (start, value) in enumerate(self.frame_offsets):
+                if value != frame:
+                    continue
+                end = offsets[i + 1] if i + 1 < len(offsets) else len(mm)
+                for line in mm[start:end].split(b'\n'):
+                    if line:
+                        lines.append(line.decode('utf-8', errors='replace'))
+                        if max_lines and len(lines) >= max_lines:
+                            return lines
+        return lines
+
+    def read_level(self, level, max_lines=None):
+        """Returns every line of the given level (ERROR, WARNING, SUCCESS)"""
+        offsets = self.level_offsets.get(level, [])
+        if max_lines:
+            offsets = offsets[:max_lines]
+        with self._map() as mm:
+            if mm is None:
+                return []
+            return [self._line_at(mm, offset) for offset in offsets]
+
+    def frame_at_offset(self, offset):
+        """Frame being rendered when the line at offset was written, or None"""
+        index = bisect.bisect_right(self.frame_offsets, (offset, float('inf'))) - 1
+        return self.frame_offsets[index][1] if index >= 0 else None
+
+    @staticmethod
+    def _line_at(mm, offset):
+        end = mm.find(b'\n', offset)
+        if end < 0:
+            end = len(mm)
+        return mm[offset:end].decode('utf-8', errors='replace')
+
+    def _map(self):
+        return _LogMap(self.log_path)
+
+
+class _LogMap:
+    """Context manager returning a read-only mmap of a file, or None if it is empty"""
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.map = None
+
+    def __enter__(self):
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return None
+        self.file = open(self.path, 'rb')
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        return self.map
+
+    def __exit__(self, *exc):
+        if self.map is not None:
+            self.map.close()
+        if self.file is not None:
+            self.file.close()
+        return False
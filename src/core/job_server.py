@@ -0,0 +1,384 @@
+"""
+Local HTTP/JSON API of the render queue.
+
+    GET    /api/params              parameter definitions (ParamDefinitions.get_categories())
+    GET    /api/presets             preset names
+    GET    /api/jobs                every job
+    POST   /api/jobs                queue a job spec (see job_spec), returns the created jobs
+    GET    /api/jobs/<id>           one job
+    DELETE /api/jobs/<id>           cancel a job
+    POST   /api/jobs/<id>/pause     pause a job
+    POST   /api/jobs/<id>/resume    resume a job
+    GET    /api/events[?job=<id>]   server-sent events: state, progress, completed
+
+The server binds to 127.0.0.1 by default and is meant for pipeline scripts
+on the same workstation. Every request must carry the token of the session
+('Authorization: Bearer <token>', or '?token=<token>' for EventSource),
+written to the api_token file of the settings directory (readable by the
+user only) while the server runs. Requests whose Host or Origin is not a
+loopback address are refused, which stops web pages (DNS rebinding
+included) from reaching the API, and POST bodies must be
+application/json. Submitted specs are remote (see job_spec): they cannot
+pick the Blender executable nor pass Python code.
+"""
+
+import hmac
+import json
+import logging
+import os
+import queue as queue_module
+import secrets
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from .job_spec import JobSpecError, submit_spec, jobs_of
+from .param_definitions import ParamDefinitions
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8765
+TOKEN_FILE_NAME = 'api_token'  # In the settings directory
+LOOPBACK_HOSTS = ('127.0.0.1', 'localhost', '::1')
+
+
+def is_loopback(host):
+    """True for a loopback host name, with or without port (IPv6 in brackets)"""
+    if not host:
+        return False
+    host = host.strip().lower()
+    if host.startswith('['):
+        host = host[1:host.find(']')] if ']' in host else host[1:]
+    elif host.count(':') == 1:
+        host = host.split(':')[0]
+    return host in LOOPBACK_HOSTS
+
+
+def job_summary(job):
+    """JSON representation of a job"""
+    return {
+        'id': job.job_id,
+        'name': job.name,
+        'state': job.state,
+        'progress': job.progress,
+        'eta': job.eta,
+        'message': job.message,
+        'priority': job.priority,
+        'group_id': job.group_id,
+        'start_frame': job.start_frame,
+        'end_frame': job.end_frame,
+        'command': job.command,
+        'submitted_at': job.submitted_at,
+        'started_at': job.started_at,
+        'finished_at': job.finished_at,
+    }
+
+
+class EventHub:
+    """Fans queue signals out to the connected event streams"""
+
+    MAX_PENDING = 1000  # Events buffered per client before it is dropped
+
+    def __init__(self, render_queue):
+        self._clients = []
+        self._lock = threading.Lock()
+        render_queue.job_added.connect(partial(self._on_event, 'added'))
+        render_queue.job_state_changed.connect(self._on_state_changed)
+        render_queue.render_eta.connect(self._on_progress)
+        render_queue.render_completed.connect(self._on_completed)
+
+    def subscribe(self, job_id=None):
+        client = (queue_module.Queue(self.MAX_PENDING), job_id)
+        with self._lock:
+            self._clients.append(client)
+        return client
+
+    def unsubscribe(self, client):
+        with self._lock:
+            if client in self._clients:
+                self._clients.remove(client)
+
+    def close(self):
+        """Ends every stream"""
+        with self._lock:
+            clients, self._clients = self._clients, []
+        for events, _ in clients:
+            try:
+                events.put_nowait(None)
+            except queue_module.Full:
+                pass
+
+    def publish(self, event):
+        with self._lock:
+            clients = list(self._clients)
+        for client in clients:
+            events, job_id = client
+            if job_id is not None and event.get('job_id') != job_id:
+                continue
+            try:
+                events.put_nowait(event)
+            except queue_module.Full:
+                # Slow consumer: drop it rather than buffer without limit
+                self.unsubscribe(client)
+                logging.error("Job API: event stream dropped, client too slow")
+
+    def _on_event(self, name, job_id):
+        self.publish({'event': name, 'job_id': job_id})
+
+    def _on_state_changed(self, job_id, state):
+        self.publish({'event': 'state', 'job_id': job_id, 'state': state})
+
+    def _on_progress(self, job_id, estimate):
+        self.publish({'event': 'progress', 'job_id': job_id, 'progress': estimate.fraction,
+                      'frames_done': estimate.frames_done, 'eta': estimate.eta,
+                      'eta_low': estimate.eta_low, 'eta_high': estimate.eta_high})
+
+    def _on_completed(self, job_id, success, message):
+        self.publish({'event': 'completed', 'job_id': job_id, 'success': success, 'message': message})
+
+
+class JobServer:
+    """
+    Embedded HTTP server exposing a RenderQueue
+
+    Args:
+        render_queue: Queue the jobs are submitted to
+        settings_manager: SettingsManager the presets are read from
+        host, port: Address to bind, port 0 picks a free one
+        invoke: Optional callable running a function on the thread owning the
+            queue and returning its result (the GUI thread in the application)
+        token: Token the clients must send, a random one per session if None
+    """
+
+    KEEPALIVE_INTERVAL = 15  # Seconds between SSE comments on idle streams
+
+    def __init__(self, render_queue, settings_manager, host=DEFAULT_HOST, port=DEFAULT_PORT, invoke=None,
+                 token=None):
+        self.render_queue = render_queue
+        self.settings_manager = settings_manager
+        self.invoke = invoke or (lambda function: function())
+        self.token = token or secrets.token_urlsafe(32)
+        self.token_file = os.path.join(settings_manager.settings_dir, TOKEN_FILE_NAME)
+        self.events = EventHub(render_queue)
+        self.httpd = ThreadingHTTPServer((host, port), self._make_handler())
+        self.httpd.daemon_threads = True
+        self._thread = None
+        self._write_token()
+
+    @property
+    def address(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """Serves requests from a background thread"""
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="JobServer", daemon=True)
+        self._thread.start()
+        logging.info(f"Job API listening on {self.address}")
+
+    def serve_forever(self):
+        self.httpd.serve_forever()
+
+    def stop(self):
+        self.events.close()
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        try:
+            os.remove(self.token_file)
+        except OSError:
+            pass
+
+    def _write_token(self):
+        # Created readable by the user only, replaced atomically
+        temp_path = f"{self.token_file}.{os.getpid()}.tmp"
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(self.token + '\n')
+            os.replace(temp_path, self.token_file)
+        except OSError as e:
+            logging.error(f"Job API: unable to write the token file: {e}")
+
+    def _make_handler(self):
+        server = self
+
+        class Handler(JobRequestHandler):
+            job_server = server
+
+        return Handler
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    """Routes the API requests of a JobServer"""
+
+    job_server = None
+    protocol_version = 'HTTP/1.1'
+    MAX_BODY = 1024 * 1024
+
+    def log_message(self, format, *args):
+        logging.debug(f"Job API: {self.address_string()} {format % args}")
+
+    # Routing
+
+    def do_GET(self):
+        if not self._authorize():
+            return
+        path, query = self._route()
+        if path == ['api', 'params']:
+            self._send_json(200, ParamDefinitions.get_categories())
+        elif path == ['api', 'presets']:
+            self._send_json(200, self.job_server.settings_manager.get_preset_names())
+        elif path == ['api', 'jobs']:
+            jobs = self._call(self.job_server.render_queue.get_jobs)
+            self._send_json(200, [job_summary(job) for job in jobs])
+        elif len(path) == 3 and path[:2] == ['api', 'jobs']:
+            job = self._call(lambda: self.job_server.render_queue.get_job(path[2]))
+            if job is None:
+                self._send_error(404, f"Unknown job: {path[2]}")
+            else:
+                self._send_json(200, job_summary(job))
+        elif path == ['api', 'events']:
+            self._stream_events(query.get('job', [None])[0])
+        else:
+            self._send_error(404, "Not found")
+
+    def do_POST(self):
+        if not self._authorize():
+            return
+        path, _ = self._route()
+        render_queue = self.job_server.render_queue
+        if path == ['api', 'jobs']:
+            spec = self._read_json()
+            if spec is None:
+                return
+            try:
+                # Resume scan and cache lookup on this thread, not on the one owning the queue
+                submitted = submit_spec(render_queue, spec, self.job_server.settings_manager, remote=True,
+                                        invoke=self._call)
+            except JobSpecError as e:
+                self._send_error(400, str(e))
+                return
+            jobs = self._call(lambda: [job_summary(job) for job in jobs_of(render_queue, submitted)])
+            self._send_json(201, {'id': submitted, 'jobs': jobs})
+        elif len(path) == 4 and path[:2] == ['api', 'jobs'] and path[3] in ('pause', 'resume'):
+            action = render_queue.pause if path[3] == 'pause' else render_queue.resume
+            self._send_action_result(path[2], self._call(lambda: action(path[2])))
+        else:
+            self._send_error(404, "Not found")
+
+    def do_DELETE(self):
+        if not self._authorize():
+            return
+        path, _ = self._route()
+        if len(path) == 3 and path[:2] == ['api', 'jobs']:
+            render_queue = self.job_server.render_queue
+            self._send_action_result(path[2], self._call(lambda: render_queue.cancel(path[2])))
+        else:
+            self._send_error(404, "Not found")
+
+    # Helpers
+
+    def _authorize(self):
+        """Checks Host, Origin and token, sends the error and returns False when refused"""
+        # A refused request may leave its body unread: its connection is closed
+        if not is_loopback(self.headers.get('Host')):
+            self.close_connection = True
+            self._send_error(403, "Host must be a loopback address")
+            return False
+        origin = self.headers.get('Origin')
+        if origin is not None:
+            url = urlparse(origin)
+            if url.scheme not in ('http', 'https') or not is_loopback(url.netloc):
+                self.close_connection = True
+                self._send_error(403, "Cross-origin requests are not allowed")
+                return False
+
+        authorization = self.headers.get('Authorization') or ''
+        if authorization[:7].lower() == 'bearer ':
+            token = authorization[7:].strip()
+        else:
+            token = self._route()[1].get('token', [None])[0]
+        if not token or not hmac.compare_digest(token.encode('utf-8'), self.job_server.token.encode('utf-8')):
+            self.close_connection = True
+            self._send_error(401, "Missing or invalid token")
+            return False
+        return True
+
+    def _route(self):
+        url = urlparse(self.path)
+        return [part for part in url.path.split('/') if part], parse_qs(url.query)
+
+    def _call(self, function):
+        return self.job_server.invoke(function)
+
+    def _read_json(self):
+        content_type = (self.headers.get('Content-Type') or '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            self.close_connection = True
+            self._send_error(415, "Expected Content-Type: application/json")
+            return None
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+        except ValueError:
+            length = 0
+        if length <= 0 or length > self.MAX_BODY:
+            self.close_connection = True
+            self._send_error(400 if length <= 0 else 413, "Expected a JSON body")
+            return None
+        try:
+            return json.loads(self.rfile.read(length).decode('utf-8'))
+        except (UnicodeDecodeError, ValueError) as e:
+            self._send_error(400, f"Invalid JSON: {e}")
+            return None
+
+    def _send_action_result(self, job_id, done):
+        job = self._call(lambda: self.job_server.render_queue.get_job(job_id))
+        if job is None:
+            self._send_error(404, f"Unknown job: {job_id}")
+        elif not done:
+            self._send_error(409, f"Job {job_id} is {job.state}")
+        else:
+            self._send_json(200, job_summary(job))
+
+    def _send_json(self, status, data):
+        body = json.dumps(data).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if self.close_connection:
+            self.send_header('Connection', 'close')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status, message):
+        self._send_json(status, {'error': message})
+
+    def _stream_events(self, job_id):
+        """Server-sent events until the client disconnects or the server stops"""
+        hub = self.job_server.events
+        client = hub.subscribe(job_id)
+        events = client[0]
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Connection', 'close')
+            self.end_headers()
+            self.wfile.flush()
+
+            while True:
+                try:
+                    event = events.get(timeout=self.job_server.KEEPALIVE_INTERVAL)
+                except queue_module.Empty:
+                    self.wfile.write(b': keepalive\n\n')
+                    self.wfile.flush()
+                    continue
+                if event is None:
+                    break
+                self.wfile.write(f"event: {event['event']}\ndata: {json.dumps(event)}\n\n".encode('utf-8'))
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            hub.unsubscribe(client)
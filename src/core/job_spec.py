@@ -0,0 +1,183 @@
+"""
+Job specs: render requests described as plain dictionaries.
+
+Used by the headless command line and the HTTP API. A spec names an
+optional preset and overrides its parameters with the same keys as
+ParamDefinitions.get_categories() (the flags stored in the presets):
+
+    {"preset": "shot_010", "parameters": {"-s": 1, "-e": 250, "-E": "CYCLES"},
+     "shards": 4, "priority": 1, "name": "shot 010"}
+
+With "resume": true only the frames without a complete output file are
+rendered ("check_files": true also checks the file headers). "cache": false
+renders every frame even when the render cache has it.
+
+Specs received over the network (remote=True) cannot choose the Blender
+executable nor pass Python scripts or expressions: the configured Blender
+and the presets decide what runs.
+"""
+
+import os
+
+from .command_line import BLEND_FILE_KEY, command_from_preset
+from .frame_sharding import CONTIGUOUS, INTERLEAVED
+from .output_manifest import CACHE_FILE_NAME, OutputManifest, OutputPatternError, resume_command
+from .param_definitions import ParamDefinitions
+
+
+TRUE_STRINGS = ('1', 'true', 'yes', 'on')
+FALSE_STRINGS = ('0', 'false', 'no', 'off', '')
+
+# Parameters that run arbitrary code, refused in remote specs
+REMOTE_FORBIDDEN = (ParamDefinitions.PYTHON, ParamDefinitions.PYTHON_EXPR)
+
+
+class JobSpecError(ValueError):
+    """Invalid job spec"""
+
+
+def parameter_types():
+    """Maps every parameter flag to its definition"""
+    return {param["param"]: param for param in ParamDefinitions.get_all_parameters()}
+
+
+def validate_parameters(parameters):
+    """
+    Checks parameter keys and values against the parameter definitions
+
+    Returns:
+        The parameters with int values converted
+    """
+    if not isinstance(parameters, dict):
+        raise JobSpecError("'parameters' must be an object of {flag: value}")
+
+    definitions = parameter_types()
+    validated = {}
+    for flag, value in parameters.items():
+        definition = definitions.get(ParamDefinitions.FILE if flag == BLEND_FILE_KEY else flag)
+        if definition is None:
+            raise JobSpecError(f"Unknown parameter: {flag}")
+
+        param_type = definition["type"]
+        if param_type == "bool":
+            if isinstance(value, str) and value.lower() in TRUE_STRINGS + FALSE_STRINGS:
+                value = value.lower() in TRUE_STRINGS
+            elif not isinstance(value, bool):
+                raise JobSpecError(f"{flag} expects true or false")
+        elif param_type == "int":
+            try:
+                value = int(value)
+            except (TypeError, ValueError):
+                raise JobSpecError(f"{flag} expects an integer")
+        elif param_type == "enum":
+            if value and value not in definition["options"]:
+                raise JobSpecError(f"{flag} must be one of {', '.join(definition['options'])}")
+        elif value is not None and not isinstance(value, str):
+            value = str(value)
+        validated[flag] = value
+    return validated
+
+
+def spec_flag(spec, key, default=False):
+    """Boolean option of a spec"""
+    value = spec.get(key, default)
+    if isinstance(value, str) and value.lower() in TRUE_STRINGS + FALSE_STRINGS:
+        return value.lower() in TRUE_STRINGS
+    if not isinstance(value, bool):
+        raise JobSpecError(f"'{key}' expects true or false")
+    return value
+
+
+def job_from_spec(spec, settings_manager, remote=False):
+    """
+    Builds the command of a job spec
+
+    Args:
+        spec: Dictionary with optional 'preset', 'blender_path' and 'parameters'
+        settings_manager: SettingsManager the presets are read from
+        remote: Refuse 'blender_path' and the Python parameters (specs of the HTTP API)
+
+    Returns:
+        RenderCommand
+    """
+    if not isinstance(spec, dict):
+        raise JobSpecError("A job spec must be a JSON object")
+
+    preset = {}
+    preset_name = spec.get('preset')
+    if preset_name:
+        preset = settings_manager.get_preset(preset_name)
+        if preset is None:
+            raise JobSpecError(f"Unknown preset: {preset_name}")
+
+    parameters = validate_parameters(spec.get('parameters') or {})
+    if remote:
+        if spec.get('blender_path'):
+            raise JobSpecError("'blender_path' cannot be set remotely, the configured Blender is used")
+        for flag in REMOTE_FORBIDDEN:
+            if parameters.get(flag):
+                raise JobSpecError(f"{flag} cannot be set remotely")
+    return command_from_preset(preset, parameters,
+                               spec.get('blender_path') or settings_manager.get_blender_path())
+
+
+def resume_spec(command, spec, settings_manager):
+    """
+    Restricts the command of a spec to the frames without a complete output file
+
+    Returns:
+        RenderCommand, or None when every frame is already rendered
+    """
+    manifest = OutputManifest(os.path.join(settings_manager.settings_dir, CACHE_FILE_NAME))
+    try:
+        command, _ = resume_command(command, manifest, spec_flag(spec, 'check_files'))
+    except OutputPatternError as e:
+        raise JobSpecError(f"Unable to resume: {e}")
+    return command
+
+
+def submit_spec(queue, spec, settings_manager, remote=False, invoke=None):
+    """
+    Queues a job spec, sharded if it asks for more than one shard
+
+    remote is passed to job_from_spec(). The resume scan and the render cache
+    lookup run on the calling thread, only the submission itself goes through
+    invoke (a callable running a function on the thread owning the queue).
+
+    Returns:
+        The job id, the group id of a sharded job, or None when every frame
+        is already rendered or was restored from the render cache
+    """
+    command = job_from_spec(spec, settings_manager, remote)
+    try:
+        priority = int(spec.get('priority', 0))
+        shards = int(spec.get('shards', 1))
+    except (TypeError, ValueError):
+        raise JobSpecError("'priority' and 'shards' must be integers")
+    shard_mode = spec.get('shard_mode', CONTIGUOUS)
+    if shard_mode not in (CONTIGUOUS, INTERLEAVED):
+        raise JobSpecError(f"'shard_mode' must be {CONTIGUOUS} or {INTERLEAVED}")
+
+    if spec_flag(spec, 'resume'):
+        command = resume_spec(command, spec, settings_manager)
+        if command is None:
+            return None
+
+    cache_key = None
+    if spec_flag(spec, 'cache', True):
+        command, cache_key = queue.restore_cached_frames(command)
+        if command is None:
+            return None
+
+    invoke = invoke or (lambda function: function())
+    return invoke(lambda: queue.submit_command(command, shards, shard_mode, priority=priority,
+                                               name=spec.get('name') or "", use_cache=False,
+                                               cache_key=cache_key))
+
+
+def jobs_of(queue, submitted_id):
+    """Jobs created by submit_spec() for the returned id"""
+    if submitted_id is None:
+        return []
+    return [job for job in queue.get_jobs()
+            if job.job_id == submitted_id or job.group_id == submitted_id]
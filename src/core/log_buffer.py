@@ -0,0 +1,170 @@
+"""
+Fixed-capacity storage for log lines.
+
+Records are plain tuples (timestamp, level, message, flags) kept in a ring
+of preallocated slots, so memory stays bounded on multi-hour renders.
+Records pushed out of the ring are appended to a spill file on disk, which
+lasts as long as the session (close(remove=True)).
+"""
+
+import logging
+import os
+import time
+
+# Record fields
+TIMESTAMP = 0
+LEVEL = 1
+MESSAGE = 2
+FLAGS = 3
+
+# Record flags, computed once when a line is added
+FLAG_IMPORTANT = 1
+FLAG_TECHNICAL = 2
+
+IMPORTANT_PATTERNS = (
+    "Rendering started", "Rendering completed", "Saved:",
+    "Blender quit", "Fra:", "Current Frame:"
+)
+
+TECHNICAL_PATTERNS = (
+    "malloc", "Memory:", "AL lib:", "pure-virtual:",
+    "OpenGL", "libGL", "0x", "libpng", "libjpeg"
+)
+
+
+def is_important_message(message, level):
+    """Determines if a message is important"""
+    if level in ("ERROR", "WARNING"):
+        return True
+    return any(pattern in message for pattern in IMPORTANT_PATTERNS)
+
+
+def is_technical_message(message):
+    """Determines if a message is too technical or debug"""
+    return any(pattern in message for pattern in TECHNICAL_PATTERNS)
+
+
+def make_record(timestamp, level, message):
+    """Builds a compact log record with its precomputed filter flags"""
+    flags = 0
+    if is_important_message(message, level):
+        flags |= FLAG_IMPORTANT
+    if is_technical_message(message):
+        flags |= FLAG_TECHNICAL
+    return (timestamp, level, message, flags)
+
+
+def format_record(record):
+    """Formats a record as a log line"""
+    return f"[{record[TIMESTAMP]}] [{record[LEVEL]}] {record[MESSAGE]}"
+
+
+def remove_stale_spill_files(directory, prefix, max_age):
+    """Deletes the spill files named prefix* left by sessions that did not close (older than max_age seconds)"""
+    try:
+        names = [name for name in os.listdir(directory) if name.startswith(prefix)]
+    except OSError:
+        return
+    cutoff = time.time() - max_age
+    for name in names:
+        path = os.path.join(directory, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError as e:
+            logging.error(f"Error removing log spill file: {e}")
+
+
+class LogRingBuffer:
+    """Ring buffer of log records with optional spill-to-disk of evicted ones"""
+
+    def __init__(self, capacity, spill_path=None):
+        self.capacity = max(1, int(capacity))
+        self.spill_path = spill_path
+        self.spilled_count = 0
+        self._slots = [None] * self.capacity
+        self._start = 0
+        self._count = 0
+        self._spill_file = None
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("log record index out of range")
+        return self._slots[(self._start + index) % self.capacity]
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self._slots[(self._start + index) % self.capacity]
+
+    def overflow(self, count):
+        """Number of oldest records that adding count records would evict"""
+        return max(0, min(self._count, self._count + count - self.capacity))
+
+    def extend(self, records):
+        """
+        Appends records, evicting (and spilling) the oldest ones when full
+
+        Returns:
+            Number of records evicted from the front
+        """
+        records = list(records)
+        if len(records) > self.capacity:
+            # Everything currently held goes to disk before the oldest new records
+            evicted = self.evict(self._count) + len(records) - self.capacity
+            self._spill(records[:-self.capacity])
+            records = records[-self.capacity:]
+        else:
+            evicted = self.evict(self.overflow(len(records)))
+
+        for record in records:
+            self._slots[(self._start + self._count) % self.capacity] = record
+            self._count += 1
+        return evicted
+
+    def evict(self, count):
+        """Removes (and spills) the count oldest records, returns how many were removed"""
+        count = max(0, min(count, self._count))
+        if count:
+            self._spill(self[i] for i in range(count))
+            for i in range(count):
+                self._slots[(self._start + i) % self.capacity] = None
+            self._start = (self._start + count) % self.capacity
+            self._count -= count
+        return count
+
+    def clear(self):
+        self._slots = [None] * self.capacity
+        self._start = 0
+        self._count = 0
+
+    def close(self, remove=False):
+        """Closes the spill file, deleting it with remove (end of the session)"""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+        if remove and self.spill_path:
+            try:
+                os.remove(self.spill_path)
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.error(f"Error removing log spill file: {e}")
+
+    def _spill(self, records):
+        if not self.spill_path:
+            return
+        try:
+            if self._spill_file is None:
+                os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+                self._spill_file = open(self.spill_path, 'a', encoding='utf-8')
+            lines = [format_record(record) + "\n" for record in records]
+            self._spill_file.writelines(lines)
+            self._spill_file.flush()
+            self.spilled_count += len(lines)
+        except Exception as e:
+            logging.error(f"Error writing log spill file: {e}")
@@ -0,0 +1,348 @@
+"""
+Frames already rendered to the output of a command, for resuming renders.
+
+Blender names the file of each frame from the -o pattern:
+
+    //          at the start: relative to the directory of the .blend
+    #...#       the last run of '#' is the frame number, zero padded to
+                its length; without '#', four digits are appended
+    extension   added for the -F format unless -x 0 is given (kept when
+                the pattern already ends with it)
+
+output_pattern() turns a RenderCommand into an OutputPattern, and
+OutputManifest lists the frames whose file exists and is complete: one
+os.scandir() pass over the directory, matching names before any stat, so
+only files of the pattern (and of the requested frames) cost a syscall.
+A file is complete when it is not empty and, with check_contents, when
+its header is the one of its format and, for PNG and JPEG, its end
+marker was written (a render killed while saving leaves it out).
+
+Results are cached on disk per pattern as {name: [size, mtime_ns, valid]},
+so a rescan only re-reads files that changed since the last one.
+resume_command() gives the command rendering only the missing frames,
+command_for_frames() any subset of the frames of a command.
+"""
+
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Tuple
+
+from .frame_set import FrameSet
+from .param_definitions import ParamDefinitions
+from ..utils.json_store import drop_oldest, read_json, write_json_atomic
+
+CACHE_FILE_NAME = 'output_manifest.json'  # In the settings directory
+MAX_FRAMES_ARGUMENT = 100000  # Longest -f value passed to Blender (Linux caps one argument at 128 KiB)
+
+# File extensions written by Blender for each image format, the first is the one it adds
+EXTENSIONS = {
+    'PNG': ('.png',),
+    'JPEG': ('.jpg', '.jpeg'),
+    'JPEG2000': ('.jp2', '.j2c'),
+    'OPEN_EXR': ('.exr',),
+    'OPEN_EXR_MULTILAYER': ('.exr',),
+    'TIFF': ('.tif', '.tiff'),
+    'WEBP': ('.webp',),
+    'BMP': ('.bmp',),
+    'TARGA': ('.tga',),
+    'TARGA_RAW': ('.tga',),
+    'HDR': ('.hdr',),
+    'IRIS': ('.rgb',),
+    'CINEON': ('.cin',),
+    'DPX': ('.dpx',),
+}
+MOVIE_FORMATS = ('FFMPEG', 'AVI_JPEG', 'AVI_RAW')
+
+# First bytes of a file of each extension
+SIGNATURES = {
+    '.png': (b'\x89PNG\r\n\x1a\n',),
+    '.jpg': (b'\xff\xd8\xff',),
+    '.jpeg': (b'\xff\xd8\xff',),
+    '.jp2': (b'\x00\x00\x00\x0cjP  \r\n\x87\n',),
+    '.j2c': (b'\xff\x4f\xff\x51',),
+    '.exr': (b'v/1\x01',),
+    '.tif': (b'II*\x00', b'MM\x00*'),
+    '.tiff': (b'II*\x00', b'MM\x00*'),
+    '.webp': (b'RIFF',),
+    '.bmp': (b'BM',),
+    '.hdr': (b'#?',),
+    '.rgb': (b'\x01\xda',),
+    '.cin': (b'\x80\x2a\x5f\xd7', b'\xd7\x5f\x2a\x80'),
+    '.dpx': (b'SDPX', b'XPDS'),
+}
+# Last bytes of a completely written file
+TRAILERS = {
+    '.png': b'IEND\xaeB`\x82',
+    '.jpg': b'\xff\xd9',
+    '.jpeg': b'\xff\xd9',
+}
+
+
+class OutputPatternError(ValueError):
+    """The output files of a command cannot be listed"""
+
+
+@dataclass(frozen=True)
+class OutputPattern:
+    """File names of the frames of a render: directory/prefix + frame + suffix + extension"""
+    directory: str
+    prefix: str
+    suffix: str
+    padding: int
+    extensions: Tuple[str, ...]  # Any of these, e.g. ('.png',); empty for none
+
+    @property
+    def key(self):
+        """Identifies the pattern in the manifest cache"""
+        return os.path.join(os.path.normcase(os.path.abspath(self.directory)),
+                            f"{self.prefix}{'#' * self.padding}{self.suffix}{'|'.join(self.extensions)}")
+
+    def filename(self, frame, extension=None):
+        if extension is None:
+            extension = self.extensions[0] if self.extensions else ''
+        return f"{self.prefix}{frame:0{self.padding}d}{self.suffix}{extension}"
+
+    def path(self, frame):
+        return os.path.join(self.directory, self.filename(frame))
+
+    @property
+    def regex(self):
+        extensions = '|'.join(re.escape(extension) for extension in self.extensions)
+        return re.compile(f"{re.escape(self.prefix)}(-?[0-9]+){re.escape(self.suffix)}({extensions})")
+
+    def frame_of(self, name, regex=None):
+        """Frame number of a file name of the pattern, or None"""
+        match = (regex or self.regex).fullmatch(name)
+        if match is None:
+            return None
+        frame = int(match.group(1))
+        # Numbers narrower than the padding belong to another pattern
+        return frame if self.filename(frame, match.group(2)) == name else None
+
+
+def option_value(argv, option):
+    """Value of the last occurrence of an option in an argument list, or None"""
+    value = None
+    for i, arg in enumerate(argv[:-1]):
+        if arg == option:
+            value = argv[i + 1]
+    return value
+
+
+def output_pattern(command, file_format=None, output=None):
+    """
+    Builds the OutputPattern of a RenderCommand
+
+    Args:
+        command: RenderCommand
+        file_format: Format when the command has no -F (the one saved in the .blend)
+        output: Output path when the command has no -o (the one saved in the .blend)
+
+    Raises:
+        OutputPatternError when the output is unknown, a movie or not resolvable
+    """
+    pattern = command.output or output
+    if not pattern:
+        raise OutputPatternError("The command has no output path (-o)")
+    file_format = (option_value(command.argv, ParamDefinitions.FORMAT) or file_format or '').upper()
+    if file_format in MOVIE_FORMATS:
+        raise OutputPatternError(f"{file_format} renders a movie file, not one file per frame")
+
+    if pattern.startswith('//'):
+        if not command.blend_file:
+            raise OutputPatternError(f"{pattern} is relative to an unknown .blend file")
+        pattern = os.path.join(os.path.dirname(os.path.abspath(command.blend_file)), pattern[2:])
+    pattern = os.path.normpath(pattern) + (os.sep if pattern.endswith(('/', os.sep)) else '')
+
+    use_extension = option_value(command.argv, ParamDefinitions.USE_EXTENSION) not in ('0', 'false', 'False')
+    if not use_extension:
+        extensions = ('',)
+    elif file_format in EXTENSIONS:
+        extensions = EXTENSIONS[file_format]
+    else:
+        # Unknown format (the one of the .blend): any image extension
+        extensions = tuple(sorted({ext for exts in EXTENSIONS.values() for ext in exts}))
+
+    directory, name = os.path.split(pattern)
+    runs = list(re.finditer('#+', name))
+    if runs:
+        run = runs[-1]
+        prefix, padding, suffix = name[:run.start()], len(run.group()), name[run.end():]
+        if use_extension and any(suffix.endswith(extension) for extension in extensions):
+            extensions = ('',)
+    elif '#' in directory:
+        raise OutputPatternError(f"Frame numbers in directory names are not supported: {pattern}")
+    else:
+        prefix, padding, suffix = name, 4, ''
+    return OutputPattern(directory or os.curdir, prefix, suffix, padding, extensions)
+
+
+def check_file(path, size):
+    """True when the header (and the end marker, if any) of an image file is the expected one"""
+    extension = os.path.splitext(path)[1].lower()
+    signatures = SIGNATURES.get(extension)
+    trailer = TRAILERS.get(extension)
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(16)
+            if trailer and size >= len(trailer):
+                f.seek(size - len(trailer))
+                if f.read(len(trailer)) != trailer:
+                    return False
+    except OSError:
+        return False
+    if signatures and not head.startswith(signatures):
+        return False
+    if extension == '.webp':
+        # RIFF chunk size counts everything after the first 8 bytes
+        return head[8:12] == b'WEBP' and int.from_bytes(head[4:8], 'little') + 8 <= size
+    return True
+
+
+class OutputManifest:
+    """Complete output files of render patterns, cached on disk by size and mtime"""
+
+    MAX_ENTRIES = 200  # Least recently scanned patterns are dropped beyond this
+
+    def __init__(self, cache_file=None):
+        self.cache_file = cache_file  # None keeps the manifest in memory only
+        self._lock = threading.Lock()
+        self._entries = None  # Loaded on first use
+
+    def complete_frames(self, pattern, frames=None, check_contents=False):
+        """
+        Scans the directory of a pattern for complete frame files
+
+        Args:
+            pattern: OutputPattern
+            frames: Optional FrameSet, files of other frames are not checked
+            check_contents: Also check the header and end marker of the files
+
+        Returns:
+            FrameSet of the frames whose file is complete
+        """
+        with self._lock:
+            cached = dict(self._load().get(pattern.key, {}).get('files', {}))
+
+        regex = pattern.regex
+        files = {}
+        done = []
+        changed = False
+        try:
+            with os.scandir(pattern.directory) as entries:
+                for entry in entries:
+                    name = entry.name
+                    # Cheap prefix test first, most files of a large directory fail it
+                    if not name.startswith(pattern.prefix):
+                        continue
+                    frame = pattern.frame_of(name, regex)
+                    if frame is None:
+                        continue
+                    if frames is not None and frame not in frames:
+                        if name in cached:
+                            files[name] = cached[name]
+                        continue
+                    previous = cached.get(name)
+                    state = self._file_state(entry, previous, check_contents)
+                    if state is None:
+                        continue
+                    changed = changed or state is not previous
+                    files[name] = state
+                    if state[2] is not False:
+                        done.append(frame)
+        except FileNotFoundError:
+            pass  # Nothing rendered yet
+        except OSError as e:
+            raise OutputPatternError(f"Unable to list {pattern.directory}: {e}")
+
+        with self._lock:
+            entries = self._load()
+            # Cached states are reused as is, so an unchanged scan keeps every one of them
+            if changed or len(files) != len(cached) or pattern.key not in entries:
+                entries[pattern.key] = {'scanned': time.time(), 'files': files}
+                drop_oldest(entries, self.MAX_ENTRIES, lambda entry: entry.get('scanned', 0))
+                self._save(entries)
+        return FrameSet((frame, frame) for frame in done)
+
+    @staticmethod
+    def _file_state(entry, cached, check_contents):
+        # [size, mtime_ns, valid]: valid is None until the contents are checked
+        try:
+            if not entry.is_file():
+                return None
+            stat = entry.stat()
+        except OSError:
+            return None
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            if cached[2] is not None or not check_contents:
+                return cached
+        valid = None
+        if stat.st_size == 0:
+            valid = False
+        elif check_contents:
+            valid = check_file(entry.path, stat.st_size)
+        return [stat.st_size, stat.st_mtime_ns, valid]
+
+    def invalidate(self, pattern=None):
+        """Forgets one pattern, or every pattern"""
+        with self._lock:
+            entries = self._load()
+            if pattern is None:
+                entries.clear()
+            else:
+                entries.pop(pattern.key, None)
+            self._save(entries)
+
+    def _load(self):
+        if self._entries is None:
+            entries = read_json(self.cache_file, "the output manifest") if self.cache_file else None
+            self._entries = entries if isinstance(entries, dict) else {}
+        return self._entries
+
+    def _save(self, entries):
+        if self.cache_file is not None:
+            write_json_atomic(self.cache_file, entries, "the output manifest", indent=None)
+
+
+def resume_command(command, manifest, check_contents=False, file_format=None, output=None):
+    """
+    Builds the command rendering the frames of a RenderCommand that have no complete file
+
+    Args:
+        command: RenderCommand of an animation or an -f frame list
+        manifest: OutputManifest used for the scan
+        check_contents: Also check the header and end marker of the files
+        file_format, output: Defaults for a command without -F or -o, as in output_pattern()
+
+    Returns:
+        (command, done): the command for the missing frames (None when every
+        frame is rendered) and the FrameSet of the frames already rendered
+
+    Raises:
+        OutputPatternError when the frames or the output files cannot be determined
+    """
+    if command.animation and command.frames is None:
+        raise OutputPatternError("Frame range unknown, pass -s/-e")
+    if command.frames is None or not command.frames:
+        raise OutputPatternError("The command renders no known frames (-a or -f)")
+    pattern = output_pattern(command, file_format, output)
+    done = manifest.complete_frames(pattern, command.frames, check_contents)
+    missing = command.frames - done
+    if not missing:
+        return None, done
+    return (command_for_frames(command, missing) if done else command), done
+
+
+def command_for_frames(command, frames):
+    """
+    Copy of a RenderCommand rendering a subset of its frames
+
+    An animation becomes an -f list; when the list is too long for one
+    argument it renders from the first of the frames to its end instead.
+    """
+    if len(frames.to_blender()) <= MAX_FRAMES_ARGUMENT or not command.animation:
+        return command.with_frames(frames)
+    return command.with_range(frames.first, command.end_frame)
@@ -0,0 +1,151 @@
+"""
+Single-pass parser for Blender output lines.
+
+Every line is scanned once, by the thread reading the process output, and
+turned into an OutputEvent consumed by the executor and the user interface.
+Cheap substring checks guard the precompiled patterns, so ordinary lines
+cost a handful of 'in' tests.
+"""
+
+import re
+
+# Example: "Fra:10 Mem:8.40M (Peak 8.40M) | Time:00:00.12 | Mem:0.00M, Peak:0.00M | Scene, ViewLayer | Sample 10/128"
+FRAME_RE = re.compile(r'Fra:(\d+)')
+SAMPLE_RE = re.compile(r'Sample (\d+)/(\d+)')
+# EEVEE: "Fra:1 ... | Scene, ViewLayer | Rendering 12 / 64 samples"
+EEVEE_SAMPLE_RE = re.compile(r'Rendering (\d+) / (\d+) samples')
+# Tiled Cycles: "Path Tracing Tile 2/4" (current tile) or "Rendered 1/4 Tiles" (finished tiles)
+TILE_RE = re.compile(r'Tile (\d+)/(\d+)|Rendered (\d+)/(\d+) Tiles')
+MEMORY_RE = re.compile(r'Mem:([\d.]+)([MG]).*Peak\s+([\d.]+)([MG])')
+# Stat fields such as 'Mem:0.00M, Peak:0.00M' contain a colon, scene names do not
+SCENE_RE = re.compile(r'\| ([^|:]+), ([^|:]+) \|')
+COMPOSITING_RE = re.compile(r'Compositing \| (.*?)(?=\||$)')
+SAVED_RE = re.compile(r"Saved:\s*'?(.*?)'?\s*$")
+# Printed after 'Saved:': " Time: 00:01.25 (Saving: 00:00.03)", hours are optional
+TIME_RE = re.compile(r'^\s*Time: ((?:\d+:)?\d+:[\d.]+) \(Saving: ((?:\d+:)?\d+:[\d.]+)\)')
+
+# Log levels, in the format used by LogViewer
+LEVEL_INFO = "INFO"
+LEVEL_WARNING = "WARNING"
+LEVEL_ERROR = "ERROR"
+LEVEL_SUCCESS = "SUCCESS"
+LEVEL_FRAME = "FRAME"
+
+
+class OutputEvent:
+    """Information extracted from one output line; fields are None when absent"""
+
+    __slots__ = ('line', 'level', 'frame', 'sample', 'total_samples', 'tile', 'total_tiles',
+                 'memory_mb', 'peak_memory_mb', 'scene', 'view_layer', 'compositing',
+                 'saved_path', 'render_time', 'saving_time', 'finished')
+
+    def __init__(self, line, level=LEVEL_INFO):
+        self.line = line
+        self.level = level
+        self.frame = None
+        self.sample = None
+        self.total_samples = None
+        self.tile = None  # Tile being rendered (1-based)
+        self.total_tiles = None
+        self.memory_mb = None
+        self.peak_memory_mb = None
+        self.scene = None
+        self.view_layer = None
+        self.compositing = None  # Compositing operation, "" if unknown
+        self.saved_path = None
+        self.render_time = None  # Seconds, from the 'Time:' line of a saved frame
+        self.saving_time = None
+        self.finished = False
+
+    @property
+    def is_error(self):
+        return self.level == LEVEL_ERROR
+
+    def __repr__(self):
+        fields = ', '.join(f"{name}={getattr(self, name)!r}" for name in self.__slots__
+                           if getattr(self, name) not in (None, False))
+        return f"OutputEvent({fields})"
+
+
+def _to_mb(value, unit):
+    value = float(value)
+    return value * 1024 if unit == 'G' else value
+
+
+def _to_seconds(value):
+    seconds = 0.0
+    for part in value.split(':'):
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def parse_line(line):
+    """Parses one output line into an OutputEvent"""
+    event = OutputEvent(line)
+
+    if 'Saved:' in line:
+        event.level = LEVEL_SUCCESS
+        match = SAVED_RE.search(line)
+        if match:
+            event.saved_path = match.group(1)
+    elif 'Saving:' in line:
+        match = TIME_RE.search(line)
+        if match:
+            event.render_time = _to_seconds(match.group(1))
+            event.saving_time = _to_seconds(match.group(2))
+
+    if 'Fra:' in line:
+        if event.level == LEVEL_INFO:
+            event.level = LEVEL_FRAME
+        match = FRAME_RE.search(line)
+        if match:
+            event.frame = int(match.group(1))
+
+    if 'Mem:' in line:
+        match = MEMORY_RE.search(line)
+        if match:
+            event.memory_mb = _to_mb(match.group(1), match.group(2))
+            event.peak_memory_mb = _to_mb(match.group(3), match.group(4))
+
+    if '|' in line:
+        match = SCENE_RE.search(line)
+        if match:
+            event.scene = match.group(1).strip()
+            event.view_layer = match.group(2).strip()
+
+    if event.level == LEVEL_INFO:
+        if 'Error:' in line or 'ERROR' in line:
+            event.level = LEVEL_ERROR
+        elif 'Warning:' in line or 'WARNING' in line:
+            event.level = LEVEL_WARNING
+
+    if 'Tile' in line:
+        match = TILE_RE.search(line)
+        if match:
+            if match.group(1):
+                event.tile, event.total_tiles = int(match.group(1)), int(match.group(2))
+            else:
+                event.total_tiles = int(match.group(4))
+                event.tile = min(int(match.group(3)) + 1, event.total_tiles)
+
+    if 'Sample' in line:
+        match = SAMPLE_RE.search(line)
+        if match:
+            event.sample = int(match.group(1))
+            event.total_samples = int(match.group(2))
+    elif 'samples' in line:
+        match = EEVEE_SAMPLE_RE.search(line)
+        if match:
+            event.sample = int(match.group(1))
+            event.total_samples = int(match.group(2))
+    elif 'Compositing' in line:
+        event.compositing = ""
+        if '|' in line:
+            match = COMPOSITING_RE.search(line)
+            if match:
+                event.compositing = match.group(1).strip()
+
+    if 'Finished' in line:
+        event.finished = True
+
+    return event
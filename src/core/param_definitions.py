@@ -129,7 +129,7 @@ class ParamDefinitions:
                 {"name": "Render Animation", "param": ParamDefinitions.RENDER, "type": "bool", 
                  "description": "Render the complete animation"},
                 {"name": "Render Frame", "param": ParamDefinitions.RENDER_FRAME, "type": "string", 
-                 "description": "Render specific frames (e.g. '1,3,5-10')"},
+                 "description": "Render specific frames (e.g. '1,3,5..10'; '+N'/'-N' count from the scene start/end)"},
                 {"name": "Output Path", "param": ParamDefinitions.RENDER_OUTPUT, "type": "path", 
                  "description": "Path for output files"},
                 {"name": "Scene", "param": ParamDefinitions.SCENE, "type": "string", 
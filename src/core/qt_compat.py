@@ -0,0 +1,95 @@
+"""
+Optional Qt for the core modules.
+
+With PyQt5 available the core classes are regular QObjects with Qt
+signals, so the GUI gets queued cross-thread delivery. In headless mode
+(BLENDER_RENDER_UI_HEADLESS=1, set by the command line interface before
+importing the core) or when PyQt5 is not installed, a small pure-Python
+signal implementation is used instead and PyQt5 is never loaded.
+Pure-Python slots run synchronously on the emitting thread.
+"""
+
+import os
+import threading
+
+HEADLESS_ENV = 'BLENDER_RENDER_UI_HEADLESS'
+
+
+class _BoundSignal:
+    """Signal instance bound to one object"""
+
+    __slots__ = ('_slots', '_lock')
+
+    def __init__(self):
+        self._slots = []
+        self._lock = threading.Lock()
+
+    def connect(self, slot):
+        with self._lock:
+            self._slots = self._slots + [slot]
+
+    def disconnect(self, slot=None):
+        with self._lock:
+            if slot is None:
+                self._slots = []
+            elif slot in self._slots:
+                slots = list(self._slots)
+                slots.remove(slot)
+                self._slots = slots
+            else:
+                raise TypeError("disconnect() failed: slot is not connected")
+
+    def emit(self, *args):
+        # Copy-on-write list: slots may (dis)connect while emitting
+        for slot in self._slots:
+            slot(*args)
+
+
+class PySignal:
+    """Descriptor mimicking pyqtSignal, argument types are documentation only"""
+
+    def __init__(self, *types):
+        self.types = types
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        bound = instance.__dict__.get(self.name)
+        if bound is None:
+            bound = instance.__dict__.setdefault(self.name, _BoundSignal())
+        return bound
+
+
+class PyObject:
+    """Stand-in for QObject when Qt is not used"""
+
+    def __init__(self, parent=None):
+        self._parent = parent
+
+    def parent(self):
+        return self._parent
+
+
+def _load_qt():
+    if os.environ.get(HEADLESS_ENV) == '1':
+        return None
+    try:
+        from PyQt5 import QtCore
+        return QtCore
+    except ImportError:
+        return None
+
+
+_QtCore = _load_qt()
+HAS_QT = _QtCore is not None
+
+if HAS_QT:
+    QObject = _QtCore.QObject
+    pyqtSignal = _QtCore.pyqtSignal
+else:
+    QObject = PyObject
+    pyqtSignal = PySignal
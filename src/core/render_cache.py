@@ -0,0 +1,345 @@
+"""
+Content-addressed cache of rendered frames.
+
+A frame is identified by everything that decides its pixels:
+
+    blender   version banner of the executable ('blender --version')
+    files     SHA-256 of the .blend and of the files it depends on (linked
+              libraries and external images, from the metadata probe)
+    argv      the command without the executable, the .blend path, the
+              output path, the thread count and the frame options
+    frame     the frame number
+
+The first three make the key of a command (command_key()), the frame
+number is added per frame. Rendered files are copied into objects/ under
+the SHA-256 of their contents, so identical frames are stored once, and
+index.json maps frame keys to objects. On a hit the object is copied to
+the output path of the frame instead of being rendered again.
+
+Hard links (link=True) save the copy but share the inode: Blender writes
+images in place, so re-rendering a linked output rewrites the object and
+every other output linked to it. An object is therefore linked to at most
+one output (while its link count is 1), further hits of the same contents
+(held or static frames) are copied.
+
+The store is bounded in size: the least recently used entries are dropped
+first, and an object goes with its last entry. An object whose size or
+mtime changed since it was stored (overwritten in place through a hard
+link) is dropped instead of being restored. Blender versions are
+remembered by size and mtime of the executable, and the inputs are hashed
+by a FileHasher (core/file_hasher.py), so unchanged files are not read
+again.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+
+from .file_hasher import FileHasher
+from .frame_set import FrameSet
+from .param_definitions import ParamDefinitions
+from ..utils.json_store import read_json, write_json_atomic
+
+CACHE_DIR_NAME = 'render_cache'  # In the settings directory
+INDEX_FILE_NAME = 'index.json'
+DEFAULT_MAX_BYTES = 20 * 1024 ** 3
+VERSION_TIMEOUT = 30  # Seconds
+
+# Options that do not change the rendered pixels: where and how many frames, and the thread count
+IGNORED_OPTIONS = (ParamDefinitions.RENDER_OUTPUT, ParamDefinitions.THREADS, ParamDefinitions.FRAME_START,
+                   ParamDefinitions.FRAME_END, ParamDefinitions.FRAME_JUMP, ParamDefinitions.RENDER_FRAME)
+IGNORED_SWITCHES = (ParamDefinitions.RENDER,)
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Counters of a RenderCache"""
+    hits: int  # Frames restored from the cache
+    misses: int  # Frames looked up and not found
+    stored: int  # Frames added after a render
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+def normalized_arguments(command):
+    """Arguments of a RenderCommand that decide the rendered pixels"""
+    arguments = []
+    argv = command.argv
+    i = 1
+    while i < len(argv):
+        arg = argv[i]
+        if arg in IGNORED_OPTIONS:
+            i += 2
+            continue
+        if arg not in IGNORED_SWITCHES and arg != command.blend_file:
+            arguments.append(arg)
+        i += 1
+    return arguments
+
+
+class RenderCache:
+    """
+    Rendered frames stored by content
+
+    Args:
+        cache_dir: Directory of the index and the objects
+        max_bytes: Size of the stored objects beyond which entries are evicted
+        link: Restore a hit as a hard link when no other output is linked to its object
+        hasher: FileHasher of the inputs and outputs, an in-memory one if None
+    """
+
+    def __init__(self, cache_dir, max_bytes=DEFAULT_MAX_BYTES, link=False, hasher=None):
+        self.cache_dir = cache_dir
+        self.hasher = hasher or FileHasher()
+        self.objects_dir = os.path.join(cache_dir, 'objects')
+        self.index_file = os.path.join(cache_dir, INDEX_FILE_NAME)
+        self.max_bytes = max(0, int(max_bytes))
+        self.link = link
+        self._lock = threading.Lock()
+        self._index = None  # Loaded on first use
+
+    def blender_version(self, blender_path):
+        """Version banner of a Blender executable, run once per change of the executable"""
+        try:
+            stat = os.stat(blender_path)
+        except OSError:
+            stat = None
+        signature = [stat.st_size, stat.st_mtime_ns] if stat else None
+        key = os.path.abspath(blender_path) if stat else blender_path
+        with self._lock:
+            cached = self._load()['versions'].get(key)
+        if signature and cached and cached[:2] == signature:
+            return cached[2]
+
+        try:
+            result = subprocess.run([blender_path, '--version'], stdin=subprocess.DEVNULL,
+                                     stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                     universal_newlines=True, errors='replace', timeout=VERSION_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired) as e:
+            raise OSError(f"Unable to read the Blender version: {e}")
+        version = next((line.strip() for line in result.stdout.splitlines() if line.startswith('Blender')), '')
+        if not version:
+            raise OSError("Blender printed no version")
+        if signature:
+            with self._lock:
+                self._load()['versions'][key] = signature + [version]
+                self._save()
+        return version
+
+    def command_key(self, command, dependencies=()):
+        """
+        Key of the frames of a RenderCommand
+
+        Args:
+            command: RenderCommand
+            dependencies: Files the .blend depends on (blend_metadata.blend_dependencies())
+
+        Raises:
+            OSError when the .blend or the Blender version cannot be read
+        """
+        if not command.blend_file or not os.path.isfile(command.blend_file):
+            raise OSError(f"Cannot cache a render without its .blend file ({command.blend_file})")
+        digests = self.hasher.digests([command.blend_file] + list(dependencies))
+        parts = {
+            'blender': self.blender_version(command.argv[0]),
+            'blend': digests[command.blend_file],
+            'dependencies': sorted(digests[path] or 'missing' for path in dependencies),
+            'arguments': normalized_arguments(command),
+        }
+        return hashlib.sha256(json.dumps(parts, sort_keys=True).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def frame_key(key, frame):
+        return f"{key}:{frame}"
+
+    def object_path(self, digest, extension):
+        return os.path.join(self.objects_dir, digest[:2], digest + extension)
+
+    def restore(self, key, frames, pattern):
+        """
+        Puts the cached frames of a command at their output path
+
+        Args:
+            key: command_key() of the command
+            frames: FrameSet of the command
+            pattern: OutputPattern of the command (core/output_manifest.py)
+
+        Returns:
+            FrameSet of the restored frames
+        """
+        restored = []
+        now = time.time()
+        with self._lock:
+            index = self._load()
+            entries, objects = index['entries'], index['objects']
+            hits = []
+            for frame in frames:
+                entry = entries.get(self.frame_key(key, frame))
+                if entry is not None:
+                    hits.append((frame, entry))
+
+        for frame, entry in hits:
+            source = self.object_path(entry['object'], entry['ext'])
+            stored = objects.get(entry['object'])
+            try:
+                stat = os.stat(source)
+                if stored is None or [stat.st_size, stat.st_mtime_ns] != stored:
+                    raise OSError("changed since it was stored")
+                extension = '' if pattern.extensions == ('',) else entry['ext']
+                self._materialize(source, os.path.join(pattern.directory, pattern.filename(frame, extension)),
+                                  self.link and stat.st_nlink == 1)
+            except OSError as e:
+                logging.error(f"Render cache: dropping frame {frame}: {e}")
+                with self._lock:
+                    entries.pop(self.frame_key(key, frame), None)
+                continue
+            restored.append((frame, entry))
+
+        with self._lock:
+            for frame, entry in restored:
+                entry['used'] = now
+            stats = index['stats']
+            stats['hits'] += len(restored)
+            stats['misses'] += len(frames) - len(restored)
+            self._collect_garbage()
+            self._save()
+        return FrameSet((frame, frame) for frame, _ in restored)
+
+    def _materialize(self, source, target, link):
+        # Linked or copied next to the target first, so the output never holds a partial file
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        temp_path = f"{target}.{os.getpid()}.cache.tmp"
+        try:
+            if link:
+                try:
+                    os.link(source, temp_path)
+                except OSError:
+                    shutil.copyfile(source, temp_path)
+            else:
+                shutil.copyfile(source, temp_path)
+            os.replace(temp_path, target)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def store(self, key, frames):
+        """
+        Adds rendered frames, then evicts down to max_bytes
+
+        Args:
+            key: command_key() of the command that rendered them
+            frames: Iterable of (frame, path of the saved file)
+
+        Returns:
+            Number of frames stored
+        """
+        frames = list(frames)
+        digests = self.hasher.digests([path for _, path in frames], remember=False)
+        added = {}
+        for frame, path in frames:
+            try:
+                digest = digests[path]
+                if digest is None:
+                    raise OSError("the file is gone")
+                extension = os.path.splitext(path)[1]
+                target = self.object_path(digest, extension)
+                if not os.path.exists(target):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    fd, temp_path = tempfile.mkstemp(suffix='.tmp', dir=os.path.dirname(target))
+                    os.close(fd)
+                    try:
+                        shutil.copy2(path, temp_path)
+                        os.replace(temp_path, target)
+                    finally:
+                        if os.path.exists(temp_path):
+                            os.remove(temp_path)
+                stat = os.stat(target)
+            except OSError as e:
+                logging.error(f"Render cache: unable to store frame {frame}: {e}")
+                continue
+            added[frame] = (digest, extension, [stat.st_size, stat.st_mtime_ns])
+
+        now = time.time()
+        with self._lock:
+            index = self._load()
+            for frame, (digest, extension, signature) in added.items():
+                index['objects'][digest] = signature
+                index['entries'][self.frame_key(key, frame)] = {'object': digest, 'ext': extension, 'used': now}
+            index['stats']['stored'] += len(added)
+            self._evict()
+            self._save()
+        return len(added)
+
+    def _evict(self):
+        # Least recently used entries first, until the objects fit in max_bytes
+        index = self._index
+        entries, objects = index['entries'], index['objects']
+        size = sum(signature[0] for signature in objects.values())
+        if size <= self.max_bytes:
+            return
+        references = {}
+        for entry in entries.values():
+            references[entry['object']] = references.get(entry['object'], 0) + 1
+        for frame_key in sorted(entries, key=lambda k: entries[k]['used']):
+            if size <= self.max_bytes:
+                break
+            entry = entries.pop(frame_key)
+            references[entry['object']] -= 1
+            if not references[entry['object']]:
+                size -= objects[entry['object']][0]
+                self._remove_object(entry['object'], entry['ext'])
+
+    def _collect_garbage(self):
+        # Objects left without entries (their entries were dropped)
+        index = self._index
+        used = {entry['object'] for entry in index['entries'].values()}
+        for digest in [digest for digest in index['objects'] if digest not in used]:
+            self._remove_object(digest, None)
+
+    def _remove_object(self, digest, extension):
+        self._index['objects'].pop(digest, None)
+        directory = os.path.join(self.objects_dir, digest[:2])
+        try:
+            for name in os.listdir(directory):
+                if name.startswith(digest) and (extension is None or name == digest + extension):
+                    os.remove(os.path.join(directory, name))
+        except OSError:
+            pass
+
+    def stats(self):
+        with self._lock:
+            index = self._load()
+            return CacheStats(index['stats']['hits'], index['stats']['misses'], index['stats']['stored'],
+                              len(index['entries']), sum(signature[0] for signature in index['objects'].values()),
+                              self.max_bytes)
+
+    def clear(self):
+        """Removes every stored frame; remembered digests and versions are kept"""
+        with self._lock:
+            index = self._load()
+            index['entries'].clear()
+            index['objects'].clear()
+            shutil.rmtree(self.objects_dir, ignore_errors=True)
+            self._save()
+
+    def _load(self):
+        if self._index is None:
+            index = read_json(self.index_file, "the render cache index")
+            self._index = index if isinstance(index, dict) else {}
+            for section in ('entries', 'objects', 'versions'):
+                self._index.setdefault(section, {})
+            self._index.setdefault('stats', {})
+            for counter in ('hits', 'misses', 'stored'):
+                self._index['stats'].setdefault(counter, 0)
+        return self._index
+
+    def _save(self):
+        write_json_atomic(self.index_file, self._index, "the render cache index", indent=None)
@@ -0,0 +1,752 @@
+import heapq
+import itertools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field, asdict
+from functools import partial
+from typing import Dict, List, Optional
+
+from .qt_compat import QObject, pyqtSignal
+
+from .blender_executor import BlenderExecutor
+from .blend_metadata import BlendMetadataCache, BlendProbeError, blend_dependencies
+from .file_hasher import CACHE_FILE_NAME as HASHES_FILE_NAME, FileHasher
+from .job_log import (DEFAULT_MAX_AGE as LOG_MAX_AGE, DEFAULT_MAX_BYTES as LOG_MAX_BYTES,
+                      prune_job_logs, remove_job_log)
+from .output_manifest import OutputPatternError, command_for_frames, output_pattern
+from .render_cache import CACHE_DIR_NAME, DEFAULT_MAX_BYTES, RenderCache
+from .frame_stats import FrameStats
+from .resource_sampler import ResourceSeries, DEFAULT_INTERVAL, DEFAULT_CAPACITY
+from .executors import create_executor, BACKEND_THREAD, BACKENDS
+from .param_definitions import ParamDefinitions
+from .frame_sharding import (CONTIGUOUS, FrameShard, ShardGroup, split_frame_range,
+                             assign_cpu_subsets, shard_command)
+from ..utils.json_store import write_json_atomic
+
+
+class JobState:
+    """Possible states of a render job"""
+    PENDING = "pending"
+    RUNNING = "running"
+    PAUSED = "paused"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (COMPLETED, FAILED, CANCELLED)
+
+
+@dataclass
+class RenderJob:
+    """A single Blender invocation managed by the RenderQueue"""
+    command: List[str]
+    start_frame: int = 1
+    end_frame: int = 1
+    priority: int = 0
+    name: str = ""
+    frame_step: int = 1
+    frame_count: int = 0  # Frames rendered (e.g. an -f list), 0 = every frame_step-th of the range
+    threads: int = 0  # 0 = use the queue thread budget
+    cpu_affinity: Optional[List[int]] = None
+    group_id: Optional[str] = None
+    cache_key: Optional[str] = None  # Render cache key of the command, frames are stored on success
+    log_path: Optional[str] = None
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    state: str = JobState.PENDING
+    progress: float = 0.0
+    eta: Optional[float] = None  # Estimated remaining seconds while running
+    message: str = ""
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    def to_dict(self):
+        """Serializable representation used for queue persistence"""
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuilds a job saved with to_dict()"""
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+def apply_thread_budget(command, threads):
+    """
+    Returns a copy of the command with a '-t' thread budget.
+
+    Blender evaluates its arguments in order, so the option is inserted
+    before the first render action (-a / -f) to take effect. An explicit
+    '-t' already present in the command is left untouched.
+    """
+    command = list(command)
+    if not threads or ParamDefinitions.THREADS in command:
+        return command
+
+    insert_at = len(command)
+    for i, arg in enumerate(command):
+        if arg in (ParamDefinitions.RENDER, ParamDefinitions.RENDER_FRAME):
+            insert_at = i
+            break
+
+    command[insert_at:insert_at] = [ParamDefinitions.THREADS, str(threads)]
+    return command
+
+
+class RenderQueue(QObject):
+    """
+    Persistent render job queue running up to max_concurrent Blender
+    processes at once, each through its own BlenderExecutor.
+
+    The shards of a group take one slot together: they are pinned to
+    disjoint CPU subsets, so they all start once the group gets a slot.
+
+    The signals mirror the BlenderExecutor ones, tagged with the job id.
+    """
+
+    job_added = pyqtSignal(str)  # job id
+    job_state_changed = pyqtSignal(str, str)  # job id, new state
+    output_batch = pyqtSignal(str, list)  # job id, list of OutputEvent
+    output_received = pyqtSignal(str, str)  # job id, output line
+    output_parsed = pyqtSignal(str, object)  # job id, OutputEvent of the line
+    render_started = pyqtSignal(str)  # job id
+    render_completed = pyqtSignal(str, bool, str)  # job id, success, message
+    render_progress = pyqtSignal(str, float)  # job id, progress (0.0-1.0)
+    render_eta = pyqtSignal(str, object)  # job id, Estimate (core/eta.py)
+    resource_sampled = pyqtSignal(str, object)  # job id, ResourceSample (core/resource_sampler.py)
+    group_progress = pyqtSignal(str, float, float)  # group id, progress, ETA seconds (-1 if unknown)
+    render_cache_updated = pyqtSignal(object)  # CacheStats (core/render_cache.py)
+    queue_finished = pyqtSignal()  # Emitted when the last active job finishes
+
+    QUEUE_FILE = 'render_queue.json'
+
+    def __init__(self, settings_manager=None, max_concurrent=1, threads_per_job=0):
+        super().__init__()
+        self.settings_manager = settings_manager
+        self.max_concurrent = max(1, int(max_concurrent))
+        self.threads_per_job = max(0, int(threads_per_job))
+        self.max_refresh_rate = BlenderExecutor.DEFAULT_REFRESH_RATE
+        self.max_batch_size = BlenderExecutor.DEFAULT_BATCH_SIZE
+        self.executor_backend = BACKEND_THREAD
+        self.executor_timeout = None
+        self.executor_kill_grace = 10.0
+        self.resource_interval = DEFAULT_INTERVAL
+        self.resource_capacity = DEFAULT_CAPACITY
+        self.render_cache = None  # RenderCache, when enabled in the settings
+        self.metadata_cache = None
+        self.file_hasher = None
+        self._cache_threads = []
+
+        self.jobs: Dict[str, RenderJob] = {}
+        self.executors: Dict[str, BlenderExecutor] = {}
+        self.groups: Dict[str, ShardGroup] = {}
+        self.frame_stats: Dict[str, FrameStats] = {}  # Of the last run of each job
+        self.resources: Dict[str, ResourceSeries] = {}  # Of the last run of each job
+        self._pending = []  # heap of (-priority, sequence, job_id)
+        self._sequence = itertools.count()
+        self._lock = threading.RLock()
+        self._shutting_down = False
+
+        if settings_manager is not None:
+            queue_settings = settings_manager.get_setting('render_queue', {})
+            self.max_concurrent = max(1, int(queue_settings.get('max_concurrent', self.max_concurrent)))
+            self.threads_per_job = max(0, int(queue_settings.get('threads_per_job', self.threads_per_job)))
+            self._apply_output_settings('output', settings_manager.get_setting('output', {}))
+            self._apply_executor_settings('executor', settings_manager.get_setting('executor', {}))
+            # Changes apply to the jobs started afterwards
+            settings_manager.subscribe('output', self._apply_output_settings)
+            settings_manager.subscribe('executor', self._apply_executor_settings)
+            self.metadata_cache = BlendMetadataCache.instance(settings_manager.settings_dir)
+            self.file_hasher = FileHasher(os.path.join(settings_manager.settings_dir, HASHES_FILE_NAME))
+            self._apply_cache_settings('render_cache', settings_manager.get_setting('render_cache', {}))
+            settings_manager.subscribe('render_cache', self._apply_cache_settings)
+            self.queue_file = os.path.join(settings_manager.settings_dir, self.QUEUE_FILE)
+            self.logs_dir = os.path.join(settings_manager.settings_dir, 'logs', 'jobs')
+        else:
+            self.queue_file = None
+            self.logs_dir = None
+
+    def _apply_output_settings(self, key, output_settings):
+        self.max_refresh_rate = output_settings.get('max_refresh_rate', BlenderExecutor.DEFAULT_REFRESH_RATE)
+        self.max_batch_size = output_settings.get('max_batch_size', BlenderExecutor.DEFAULT_BATCH_SIZE)
+
+    def _apply_executor_settings(self, key, executor_settings):
+        self.executor_backend = executor_settings.get('backend', BACKEND_THREAD)
+        if self.executor_backend not in BACKENDS:
+            logging.error(f"Unknown executor backend '{self.executor_backend}', using '{BACKEND_THREAD}'")
+            self.executor_backend = BACKEND_THREAD
+        self.executor_timeout = executor_settings.get('timeout') or None
+        self.executor_kill_grace = executor_settings.get('kill_grace', self.executor_kill_grace)
+        self.resource_interval = executor_settings.get('resource_interval', self.resource_interval)
+        self.resource_capacity = executor_settings.get('resource_history', self.resource_capacity)
+
+    def _apply_cache_settings(self, key, cache_settings):
+        if not cache_settings.get('enabled'):
+            self.render_cache = None
+            return
+        max_bytes = int(float(cache_settings.get('max_size_gb', DEFAULT_MAX_BYTES / 1024 ** 3)) * 1024 ** 3)
+        self.render_cache = RenderCache(os.path.join(self.settings_manager.settings_dir, CACHE_DIR_NAME),
+                                        max_bytes, cache_settings.get('link', False), self.file_hasher)
+
+    @property
+    def is_running(self):
+        """True while at least one job owns a Blender process"""
+        return bool(self.executors)
+
+    def is_rendering(self):
+        """Returns True if there is an active rendering process"""
+        return self.is_running
+
+    def submit(self, command, start_frame=1, end_frame=1, priority=0, name="", start=True, **options):
+        """
+        Adds a new job to the queue
+
+        Args:
+            command: List of command arguments (for subprocess)
+            start_frame: Starting frame of the rendering
+            end_frame: Ending frame of the rendering
+            priority: Higher values are started first
+            name: Label shown in the user interface
+            start: If False the job is queued in paused state
+            options: Extra RenderJob fields (frame_step, frame_count, threads, cpu_affinity, group_id)
+
+        Returns:
+            The id of the new job
+        """
+        job = RenderJob(command=list(command), start_frame=start_frame, end_frame=end_frame,
+                        priority=priority, name=name, **options)
+        if self.logs_dir and not job.log_path:
+            job.log_path = os.path.join(self.logs_dir, f"{job.job_id}.log")
+        if not start:
+            job.state = JobState.PAUSED
+
+        with self._lock:
+            self.jobs[job.job_id] = job
+            if job.state == JobState.PENDING:
+                self._push_pending(job)
+
+        self.job_added.emit(job.job_id)
+        self._save_queue()
+        self._schedule()
+        return job.job_id
+
+    def submit_command(self, command, shards=1, mode=CONTIGUOUS, priority=0, name="", use_cache=True,
+                       cache_key=None):
+        """
+        Queues a RenderCommand, its frames and frame step included
+
+        Animations and -f frame lists are split across several jobs when shards > 1.
+        With use_cache and the render cache enabled, cached frames are restored to
+        the output and only the others are rendered. The lookup runs Blender and
+        hashes the inputs: callers on the GUI thread run restore_cached_frames()
+        on a worker thread and pass the command and cache_key it returned, with
+        use_cache=False.
+
+        Returns:
+            The job id, the group id of a sharded command, or None when every
+            frame came from the render cache
+        """
+        name = name or command.name
+        if use_cache and self.render_cache is not None:
+            command, cache_key = self.restore_cached_frames(command)
+            if command is None:
+                return None
+
+        if shards > 1 and command.animation and command.end_frame > command.start_frame:
+            return self.submit_sharded(command.argv, command.start_frame, command.end_frame, shards, mode,
+                                       priority=priority, name=name, cache_key=cache_key)
+        if shards > 1 and not command.animation and command.frames is not None and len(command.frames) > 1:
+            return self.submit_frame_set(command, shards, priority=priority, name=name, cache_key=cache_key)
+        return self.submit(command.argv, command.start_frame, command.end_frame, priority=priority,
+                           name=name, frame_step=command.frame_step, frame_count=command.frame_count,
+                           cache_key=cache_key)
+
+    def restore_cached_frames(self, command):
+        """
+        Restores the frames of a command found in the render cache
+
+        Commands whose frames are not explicit (an animation without -s and -e,
+        relative -f frames) are not cached. Safe to call from any thread.
+
+        Returns:
+            (command for the frames left, or None, cache key or None when the
+            command cannot be cached)
+        """
+        render_cache = self.render_cache
+        if render_cache is None or command.frames is None or not command.frames:
+            return command, None
+        try:
+            metadata = self.metadata_cache.probe(command.argv[0], command.blend_file or "")
+            if 'libraries' not in metadata:
+                # Probed by an older version, without the dependencies
+                self.metadata_cache.invalidate(command.blend_file)
+                metadata = self.metadata_cache.probe(command.argv[0], command.blend_file)
+            key = render_cache.command_key(command, blend_dependencies(metadata))
+            pattern = output_pattern(command)
+        except (BlendProbeError, OutputPatternError, OSError) as e:
+            logging.error(f"Render cache not used for {command.name or 'the command'}: {e}")
+            return command, None
+
+        restored = render_cache.restore(key, command.frames, pattern)
+        self.render_cache_updated.emit(render_cache.stats())
+        if not restored:
+            return command, key
+        missing = command.frames - restored
+        return (command_for_frames(command, missing) if missing else None), key
+
+    def submit_frame_set(self, command, shards, priority=0, name="", pin_cpus=True, cache_key=None):
+        """
+        Splits the -f frames of a RenderCommand into consecutive parts of equal size,
+        rendered by parallel jobs
+
+        Returns:
+            The group id, progress is reported through group_progress
+        """
+        parts = command.frames.split(shards)
+        frame_shards = [FrameShard(part.first, part.last) for part in parts]
+        if pin_cpus:
+            assign_cpu_subsets(frame_shards)
+
+        group = ShardGroup(uuid.uuid4().hex[:8], name)
+        with self._lock:
+            self.groups[group.group_id] = group
+
+        for i, (part, shard) in enumerate(zip(parts, frame_shards)):
+            job_id = self.submit(
+                command.with_frames(part).argv, part.first, part.last, priority=priority,
+                name=f"{name} [{i + 1}/{len(parts)}]".strip(),
+                frame_count=len(part), group_id=group.group_id,
+                threads=len(shard.cpus) if shard.cpus else 0, cpu_affinity=shard.cpus,
+                cache_key=cache_key
+            )
+            group.add_job(job_id, len(part))
+
+        return group.group_id
+
+    def submit_sharded(self, command, start_frame, end_frame, shards, mode=CONTIGUOUS,
+                       priority=0, name="", pin_cpus=True, cache_key=None):
+        """
+        Splits an animation across several jobs rendering in parallel
+
+        Args:
+            command: Animation command (with -a)
+            start_frame: First frame of the animation
+            end_frame: Last frame of the animation
+            shards: Number of worker processes
+            mode: CONTIGUOUS or INTERLEAVED frame assignment
+            priority: Priority of every shard job
+            name: Label of the group, shards are named "name [i/K]"
+            pin_cpus: Pin each worker to its own subset of the CPUs
+
+        Returns:
+            The group id, progress is reported through group_progress
+        """
+        step = 1
+        if ParamDefinitions.FRAME_JUMP in command:
+            index = command.index(ParamDefinitions.FRAME_JUMP)
+            try:
+                step = max(1, int(command[index + 1]))
+            except (IndexError, ValueError):
+                pass
+
+        frame_shards = split_frame_range(start_frame, end_frame, shards, mode, step)
+        if pin_cpus:
+            assign_cpu_subsets(frame_shards)
+
+        group = ShardGroup(uuid.uuid4().hex[:8], name)
+        with self._lock:
+            self.groups[group.group_id] = group
+
+        for i, shard in enumerate(frame_shards):
+            job_id = self.submit(
+                shard_command(command, shard), shard.start, shard.end, priority=priority,
+                name=f"{name} [{i + 1}/{len(frame_shards)}]".strip(),
+                frame_step=shard.step, group_id=group.group_id,
+                threads=len(shard.cpus) if shard.cpus else 0, cpu_affinity=shard.cpus,
+                cache_key=cache_key
+            )
+            group.add_job(job_id, shard.frame_count)
+
+        return group.group_id
+
+    def get_job(self, job_id):
+        """Returns the job with the given id, or None"""
+        return self.jobs.get(job_id)
+
+    def get_frame_stats(self, job_id):
+        """Returns the per-frame statistics of a job that has run, or None"""
+        return self.frame_stats.get(job_id)
+
+    def get_resources(self, job_id):
+        """Returns the sampled resource usage (ResourceSeries) of a job that has run, or None"""
+        return self.resources.get(job_id)
+
+    def get_jobs(self):
+        """Returns all known jobs in submission order"""
+        with self._lock:
+            return sorted(self.jobs.values(), key=lambda job: job.submitted_at)
+
+    def set_concurrency(self, max_concurrent=None, threads_per_job=None):
+        """Changes how many processes run at once and their thread budget"""
+        with self._lock:
+            if max_concurrent is not None:
+                self.max_concurrent = max(1, int(max_concurrent))
+            if threads_per_job is not None:
+                self.threads_per_job = max(0, int(threads_per_job))
+
+        if self.settings_manager is not None:
+            self.settings_manager.set_setting('render_queue', {
+                'max_concurrent': self.max_concurrent,
+                'threads_per_job': self.threads_per_job
+            })
+            self.settings_manager.save_settings()
+
+        self._schedule()
+
+    def set_priority(self, job_id, priority):
+        """Changes the priority of a job that has not started yet"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.state != JobState.PENDING:
+                return False
+            job.priority = priority
+            # The old heap entry becomes stale and is skipped by _pop_pending
+            self._push_pending(job)
+
+        self._save_queue()
+        return True
+
+    def pause(self, job_id):
+        """Holds a queued job, or suspends the process of a running one"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None:
+                return False
+            if job.state == JobState.RUNNING:
+                if not self.executors[job_id].suspend():
+                    return False
+            elif job.state != JobState.PENDING:
+                return False
+
+        self._set_state(job, JobState.PAUSED)
+        return True
+
+    def resume(self, job_id):
+        """Resumes a paused job"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.state != JobState.PAUSED:
+                return False
+
+            executor = self.executors.get(job_id)
+            if executor is not None:
+                if not executor.resume():
+                    return False
+                new_state = JobState.RUNNING
+            else:
+                new_state = JobState.PENDING
+                self._push_pending(job)
+
+        self._set_state(job, new_state)
+        self._schedule()
+        return True
+
+    def cancel(self, job_id):
+        """Cancels a job, terminating its process if it is running"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job is None or job.state in JobState.FINISHED:
+                return False
+            executor = self.executors.get(job_id)
+
+        if executor is not None:
+            was_paused = job.state == JobState.PAUSED
+            # Mark the job first: the completion reported by terminate() is then ignored
+            self._finish_job(job_id, False, "Rendering interrupted by user", JobState.CANCELLED)
+            if was_paused:
+                executor.resume()
+            executor.terminate()
+        else:
+            job.finished_at = time.time()
+            self._set_state(job, JobState.CANCELLED)
+            self._save_queue()
+        return True
+
+    def cancel_all(self):
+        """Cancels every job that has not finished yet"""
+        # Queued jobs first, so that no new process starts in a freed slot
+        jobs = sorted(self.get_jobs(), key=lambda job: job.job_id in self.executors)
+        for job in jobs:
+            if job.state not in JobState.FINISHED:
+                self.cancel(job.job_id)
+
+    def shutdown(self):
+        """Terminates the running processes keeping their jobs for restore()"""
+        with self._lock:
+            self._save_queue()
+            self._shutting_down = True
+            executors = list(self.executors.values())
+
+        for executor in executors:
+            executor.resume()
+            executor.terminate()
+
+    def clear_finished(self):
+        """Forgets completed, failed and cancelled jobs, their logs included"""
+        log_paths = []
+        with self._lock:
+            for job_id in [j.job_id for j in self.jobs.values() if j.state in JobState.FINISHED]:
+                job = self.jobs.pop(job_id)
+                if job.log_path:
+                    log_paths.append(job.log_path)
+                self.frame_stats.pop(job_id, None)
+                self.resources.pop(job_id, None)
+            for group_id, group in list(self.groups.items()):
+                if not any(job_id in self.jobs for job_id in group.frame_counts):
+                    del self.groups[group_id]
+        for log_path in log_paths:
+            remove_job_log(log_path)
+
+    def prune_logs(self):
+        """
+        Removes the logs of jobs no longer in the queue, past the age and total
+        size of the 'log' settings
+
+        Returns:
+            Number of logs removed
+        """
+        if not self.logs_dir:
+            return 0
+        log_settings = self.settings_manager.get_setting('log', {})
+        max_age = float(log_settings.get('job_logs_max_age_days', LOG_MAX_AGE / 86400)) * 86400
+        max_bytes = float(log_settings.get('job_logs_max_size_mb', LOG_MAX_BYTES / 1024 ** 2)) * 1024 ** 2
+        with self._lock:
+            keep = [job.log_path for job in self.jobs.values()]
+        return prune_job_logs(self.logs_dir, keep, max_age, max_bytes)
+
+    def restore(self):
+        """
+        Reloads unfinished jobs saved by a previous session (in paused state),
+        then prunes the logs of the jobs that were not saved
+        """
+        if not self.queue_file or not os.path.exists(self.queue_file):
+            self.prune_logs()
+            return []
+
+        try:
+            with open(self.queue_file, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except Exception as e:
+            logging.error(f"Error loading render queue: {e}")
+            return []
+
+        restored = []
+        with self._lock:
+            for data in saved.get('jobs', []):
+                job = RenderJob.from_dict(data)
+                if job.job_id in self.jobs:
+                    continue
+                # Jobs never restart on their own after a restart
+                job.state = JobState.PAUSED
+                job.progress = 0.0
+                job.eta = None
+                job.started_at = None
+                self.jobs[job.job_id] = job
+                restored.append(job.job_id)
+
+        for job_id in restored:
+            self.job_added.emit(job_id)
+        self.prune_logs()
+        return restored
+
+    def _push_pending(self, job):
+        heapq.heappush(self._pending, (-job.priority, next(self._sequence), job.job_id))
+
+    def _pop_pending(self):
+        """Returns the next startable job, skipping stale heap entries"""
+        while self._pending:
+            neg_priority, _, job_id = heapq.heappop(self._pending)
+            job = self.jobs.get(job_id)
+            if job is not None and job.state == JobState.PENDING and -neg_priority == job.priority:
+                return job
+        return None
+
+    def _running_groups(self):
+        return {self.jobs[job_id].group_id for job_id in self.executors
+                if job_id in self.jobs and self.jobs[job_id].group_id}
+
+    def _used_slots(self):
+        """Running jobs, the shards of a group counting as one"""
+        grouped = sum(1 for job_id in self.executors if job_id in self.jobs and self.jobs[job_id].group_id)
+        return len(self.executors) - grouped + len(self._running_groups())
+
+    def _pop_group_shard(self):
+        """Returns a pending shard of a group already running, its slot is taken"""
+        groups = self._running_groups()
+        if not groups:
+            return None
+        for _, _, job_id in sorted(self._pending):
+            job = self.jobs.get(job_id)
+            if job is not None and job.state == JobState.PENDING and job.group_id in groups:
+                # Its heap entry is skipped by _pop_pending once the job runs
+                return job
+        return None
+
+    def _schedule(self):
+        """Starts pending jobs while there are free slots"""
+        while True:
+            with self._lock:
+                if self._shutting_down:
+                    return
+                job = self._pop_group_shard()
+                if job is None:
+                    if self._used_slots() >= self.max_concurrent:
+                        return
+                    job = self._pop_pending()
+                if job is None:
+                    return
+                executor = create_executor(self.executor_backend, self.max_refresh_rate, self.max_batch_size,
+                                           timeout=self.executor_timeout,
+                                           kill_grace=self.executor_kill_grace)
+                # Lines are re-emitted one by one from _on_output_batch, on the receiving thread
+                executor.emit_lines = False
+                executor.resource_interval = self.resource_interval
+                executor.resource_capacity = self.resource_capacity
+                self.executors[job.job_id] = executor
+                job.state = JobState.RUNNING
+                job.started_at = time.time()
+
+            executor.output_batch.connect(partial(self._on_output_batch, job.job_id))
+            executor.render_started.connect(partial(self._on_started, job.job_id))
+            executor.render_progress.connect(partial(self._on_progress, job.job_id))
+            executor.render_eta.connect(partial(self._on_eta, job.job_id))
+            executor.resource_sampled.connect(partial(self._on_resource_sample, job.job_id))
+            executor.render_completed.connect(partial(self._on_completed, job.job_id))
+
+            self.job_state_changed.emit(job.job_id, job.state)
+            command = apply_thread_budget(job.command, job.threads or self.threads_per_job)
+            if not executor.execute(command, job.start_frame, job.end_frame,
+                                    frame_step=job.frame_step, total_frames=job.frame_count or None,
+                                    cpu_affinity=job.cpu_affinity,
+                                    log_path=job.log_path):
+                self._finish_job(job.job_id, False, "Unable to start rendering", JobState.FAILED)
+            else:
+                self.frame_stats[job.job_id] = executor.frame_stats
+                self.resources[job.job_id] = executor.resources
+
+    def _on_output_batch(self, job_id, events):
+        self.output_batch.emit(job_id, events)
+        for event in events:
+            self.output_received.emit(job_id, event.line)
+            self.output_parsed.emit(job_id, event)
+
+    def _on_started(self, job_id):
+        self.render_started.emit(job_id)
+
+    def _on_progress(self, job_id, progress):
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job.progress = progress
+        self.render_progress.emit(job_id, progress)
+
+    def _on_eta(self, job_id, estimate):
+        job = self.jobs.get(job_id)
+        if job is not None:
+            job.eta = estimate.eta
+        self.render_eta.emit(job_id, estimate)
+        self._update_group(job)
+
+    def _on_resource_sample(self, job_id, sample):
+        self.resource_sampled.emit(job_id, sample)
+
+    def _update_group(self, job):
+        """Emits the aggregate progress of the group the job belongs to"""
+        group = self.groups.get(job.group_id) if job is not None and job.group_id else None
+        if group is None:
+            return
+        fraction = group.update(job.job_id, job.progress, job.eta)
+        eta = group.eta()
+        self.group_progress.emit(group.group_id, fraction, -1.0 if eta is None else eta)
+
+    def _on_completed(self, job_id, success, message):
+        state = JobState.COMPLETED if success else JobState.FAILED
+        self._finish_job(job_id, success, message, state)
+
+    def _finish_job(self, job_id, success, message, state):
+        """Releases the slot of a job and starts the next one"""
+        with self._lock:
+            job = self.jobs.get(job_id)
+            # terminate() and the process thread can both report completion
+            if job is None or job.state in JobState.FINISHED or self._shutting_down:
+                return
+            self.executors.pop(job_id, None)
+            job.message = message
+            job.finished_at = time.time()
+            job.eta = 0.0 if success else None
+            if success:
+                job.progress = 1.0
+            idle = not self.executors and self._peek_pending() is None
+
+        if success and job.cache_key and self.render_cache is not None:
+            self._store_in_cache(job)
+
+        self._set_state(job, state)
+        self.render_completed.emit(job_id, success, message)
+        self._update_group(job)
+        self._save_queue()
+        self._schedule()
+
+        if idle and not self.executors:
+            self.queue_finished.emit()
+
+    def _store_in_cache(self, job):
+        """Copies the saved frames of a completed job into the render cache, on a background thread"""
+        stats = self.frame_stats.get(job.job_id)
+        if stats is None:
+            return
+        frames = [(frame, path) for frame, path in zip(stats.column('frame'), stats.column('saved_path'))
+                  if path and frame >= 0]
+        if not frames:
+            return
+        render_cache = self.render_cache
+
+        def store():
+            render_cache.store(job.cache_key, frames)
+            self.render_cache_updated.emit(render_cache.stats())
+
+        thread = threading.Thread(target=store, daemon=True)
+        with self._lock:
+            self._cache_threads = [t for t in self._cache_threads if t.is_alive()] + [thread]
+        thread.start()
+
+    def wait_for_cache(self, timeout=None):
+        """Waits until the frames of finished jobs are in the render cache"""
+        with self._lock:
+            threads = list(self._cache_threads)
+        for thread in threads:
+            thread.join(timeout)
+
+    def _peek_pending(self):
+        for neg_priority, _, job_id in self._pending:
+            job = self.jobs.get(job_id)
+            if job is not None and job.state == JobState.PENDING:
+                return job
+        return None
+
+    def _set_state(self, job, state):
+        job.state = state
+        self.job_state_changed.emit(job.job_id, state)
+
+    def _save_queue(self):
+        """Saves unfinished jobs so they can be restored on the next start"""
+        if not self.queue_file or self._shutting_down:
+            return
+
+        with self._lock:
+            jobs = [job.to_dict() for job in self.jobs.values() if job.state not in JobState.FINISHED]
+
+        write_json_atomic(self.queue_file, {'jobs': jobs}, "render queue")
@@ -0,0 +1,210 @@
+"""
+Resource usage of running Blender processes, sampled from /proc.
+
+Blender reports memory only in its 'Mem:' status lines, which stop when it
+is busy outside the render loop (loading, compositing, saving) or is killed
+by the OOM killer. ResourceSampler reads /proc/<pid> from a background
+thread at a fixed interval instead, summing the process and its children:
+
+    stat    CPU time (user + system) and thread count
+    statm   resident set size
+    io      bytes read and written (unreadable for other users' processes)
+
+Samples go into a ResourceSeries, bounded to the most recent ones; the
+highest RSS is kept separately so the peak survives the window. On systems
+without /proc (Windows, macOS) nothing is sampled.
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+PROC_ROOT = '/proc'
+DEFAULT_INTERVAL = 1.0  # Seconds between samples
+DEFAULT_CAPACITY = 3600  # Samples kept per process (one hour at the default interval)
+
+try:
+    CLOCK_TICKS = os.sysconf('SC_CLK_TCK')
+    PAGE_SIZE = os.sysconf('SC_PAGE_SIZE')
+except (AttributeError, ValueError, OSError):
+    CLOCK_TICKS = 100
+    PAGE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class ResourceSample:
+    """Usage of a process tree at one point in time"""
+    elapsed: float  # Seconds since sampling started
+    rss_mb: float
+    cpu_seconds: float  # User + system, cumulative
+    cpu_percent: Optional[float]  # Since the previous sample, 100 = one full core
+    threads: int
+    processes: int
+    read_bytes: Optional[int] = None  # Cumulative, None when /proc/<pid>/io is unreadable
+    write_bytes: Optional[int] = None
+
+
+def is_available():
+    return os.path.isdir(os.path.join(PROC_ROOT, 'self'))
+
+
+def _read(pid, name):
+    with open(os.path.join(PROC_ROOT, str(pid), name), 'r') as f:
+        return f.read()
+
+
+def child_pids(pid):
+    """Direct children of a process (needs /proc/<pid>/task/<tid>/children)"""
+    children = []
+    try:
+        for tid in os.listdir(os.path.join(PROC_ROOT, str(pid), 'task')):
+            children.extend(int(child) for child in _read(pid, f'task/{tid}/children').split())
+    except OSError:
+        pass
+    return children
+
+
+def read_process(pid):
+    """
+    Reads the usage of one process
+
+    Returns:
+        (rss_bytes, cpu_ticks, threads, read_bytes, write_bytes) with the I/O
+        counters None when unreadable, or None when the process is gone
+    """
+    try:
+        stat = _read(pid, 'stat')
+        rss_pages = int(_read(pid, 'statm').split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+
+    # The command name (field 2) may contain spaces and parentheses
+    fields = stat[stat.rfind(')') + 2:].split()
+    try:
+        cpu_ticks = int(fields[11]) + int(fields[12])  # utime + stime
+        threads = int(fields[17])
+        if fields[0] == 'Z':
+            return None  # Exited, waiting to be reaped
+    except (ValueError, IndexError):
+        return None
+
+    read_bytes = write_bytes = None
+    try:
+        for line in _read(pid, 'io').splitlines():
+            key, _, value = line.partition(':')
+            if key == 'read_bytes':
+                read_bytes = int(value)
+            elif key == 'write_bytes':
+                write_bytes = int(value)
+    except (OSError, ValueError):
+        pass
+    return rss_pages * PAGE_SIZE, cpu_ticks, threads, read_bytes, write_bytes
+
+
+def read_tree(pid):
+    """Usage of a process and all its descendants, summed; None when the process is gone"""
+    root = read_process(pid)
+    if root is None:
+        return None
+    rss, ticks, threads, read_bytes, write_bytes = root
+    processes = 1
+    pending = child_pids(pid)
+    while pending:
+        child = pending.pop()
+        usage = read_process(child)
+        if usage is None:
+            continue
+        rss += usage[0]
+        ticks += usage[1]
+        threads += usage[2]
+        if read_bytes is not None and write_bytes is not None and usage[3] is not None \
+                and usage[4] is not None:
+            read_bytes += usage[3]
+            write_bytes += usage[4]
+        processes += 1
+        pending.extend(child_pids(child))
+    return rss, ticks, threads, read_bytes, write_bytes, processes
+
+
+class ResourceSeries:
+    """The most recent samples of a process, plus its peak memory"""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self._samples = deque(maxlen=max(1, int(capacity)))
+        self._lock = threading.Lock()
+        self.peak = None  # Sample with the highest RSS since sampling started
+
+    def append(self, sample):
+        with self._lock:
+            self._samples.append(sample)
+            if self.peak is None or sample.rss_mb > self.peak.rss_mb:
+                self.peak = sample
+
+    def __len__(self):
+        return len(self._samples)
+
+    @property
+    def capacity(self):
+        return self._samples.maxlen
+
+    def latest(self):
+        with self._lock:
+            return self._samples[-1] if self._samples else None
+
+    def samples(self, last=None):
+        """Copy of the kept samples, oldest first (only the last ones if given)"""
+        with self._lock:
+            samples = list(self._samples)
+        return samples[-last:] if last else samples
+
+
+class ResourceSampler:
+    """
+    Samples a process tree from a daemon thread until it exits or stop() is called
+
+    Args:
+        pid: Process to follow, with its children
+        series: ResourceSeries receiving the samples
+        interval: Seconds between samples
+        callback: Optional function called with each ResourceSample (on the sampler thread)
+    """
+
+    def __init__(self, pid, series, interval=DEFAULT_INTERVAL, callback=None):
+        self.pid = pid
+        self.series = series
+        self.interval = max(0.05, float(interval))
+        self.callback = callback
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is None and is_available():
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def _run(self):
+        started = time.monotonic()
+        previous = None  # (time, cpu ticks) of the previous sample
+        while not self._stop.is_set():
+            now = time.monotonic()
+            usage = read_tree(self.pid)
+            if usage is None:
+                return
+            rss, ticks, threads, read_bytes, write_bytes, processes = usage
+            cpu_percent = None
+            if previous is not None and now > previous[0]:
+                cpu_percent = max(0.0, (ticks - previous[1]) / CLOCK_TICKS / (now - previous[0]) * 100.0)
+            previous = (now, ticks)
+
+            sample = ResourceSample(now - started, rss / (1024 * 1024), ticks / CLOCK_TICKS, cpu_percent,
+                                    threads, processes, read_bytes, write_bytes)
+            self.series.append(sample)
+            if self.callback is not None:
+                self.callback(sample)
+            self._stop.wait(self.interval)
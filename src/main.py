@@ -2,8 +2,6 @@ import sys
 import os
 import logging
 import traceback
-from PyQt5.QtWidgets import QApplication, QMessageBox
-from src.ui.main_window import MainWindow
 
 # Configure logging
 def setup_logging():
@@ -26,38 +24,60 @@ def excepthook(exc_type, exc_value, exc_tb):
     tb = "".join(traceback.format_exception(exc_type, exc_value, exc_tb))
     logger.error(f"Uncaught exception:\n{tb}")
     
+    from PyQt5.QtWidgets import QMessageBox
     error_msg = f"{exc_type.__name__}: {exc_value}"
     QMessageBox.critical(None, "Error", 
                         f"An unexpected error occurred:\n\n{error_msg}\n\n"
                         f"Check the log file for details:\n{os.path.abspath('logs/app.log')}")
 
-if __name__ == "__main__":
+def run_gui(profile=None):
+    """Starts the graphical interface; profile (a StartupProfile) records the startup phases"""
+    global logger
+    mark = profile.mark if profile else lambda phase: None
+    
     # Setup logging
     logger = setup_logging()
     logger.info("Application starting...")
     
     # Install exception hook
     sys.excepthook = excepthook
+    mark("logging")
+    
+    from PyQt5.QtWidgets import QApplication, QMessageBox
+    from src.ui.main_window import MainWindow
+    mark("imports")
     
     try:
         app = QApplication(sys.argv)
+        mark("QApplication")
         
-        # Get absolute path of style file
-        style_path = os.path.abspath(os.path.join(
-            os.path.dirname(__file__), 
-            "ui", 
-            "styles.py"
-        ))
-    
         # Load initial styles
         logger.debug("Loading initial styles")
         from src.ui.styles import STYLE
         app.setStyleSheet(STYLE)
+        mark("styles")
         
         # Start the application
         logger.debug("Creating main window")
         window = MainWindow()
+        mark("main window")
         window.show()
+        mark("show")
+        
+        # Reload presets and settings written by other programs
+        from src.utils.settings_manager import SettingsManager
+        from src.utils.settings_watcher import SettingsWatcher
+        watcher = SettingsWatcher(SettingsManager.instance())
+        watcher.start()
+        mark("settings watcher")
+        
+        if profile:
+            def report_startup():
+                mark("first event loop iteration")
+                profile.uninstall()
+                profile.report()
+            from PyQt5.QtCore import QTimer
+            QTimer.singleShot(0, report_startup)
         
         logger.info("Application started successfully")
         
@@ -65,6 +85,7 @@ if __name__ == "__main__":
             sys.exit(app.exec_())
         finally:
             # Stop the observer when app closes
+            watcher.stop()
             logger.info("Application closed normally")
             
     except Exception as e:
@@ -72,4 +93,22 @@ if __name__ == "__main__":
         QMessageBox.critical(None, "Error", 
                            f"Failed to start application:\n\n{str(e)}\n\n"
                            f"Check the log file for details:\n{os.path.abspath('logs/app.log')}")
-        sys.exit(1)
\ No newline at end of file
+        sys.exit(1)
+
+def main():
+    """Entry point: headless commands never load PyQt5"""
+    profile = None
+    if '--profile-startup' in sys.argv:
+        # Prints import times and startup phases once the window is up
+        sys.argv.remove('--profile-startup')
+        from src.utils.startup_profile import StartupProfile
+        profile = StartupProfile()
+        profile.install()
+    
+    from src.cli import COMMANDS, main as cli_main
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS + ('-h', '--help'):
+        sys.exit(cli_main(sys.argv[1:]))
+    run_gui(profile)
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,57 @@
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel, 
                          QLineEdit, QPushButton, QFileDialog, QCheckBox, 
                          QComboBox, QSpinBox, QTabWidget, QScrollArea, 
-                         QGroupBox, QFormLayout, QApplication, QFrame, QInputDialog, QDialog)
-from PyQt5.QtCore import Qt, QSize
+                         QGroupBox, QFormLayout, QFrame, QInputDialog, QDialog,
+                         QCompleter)
+from PyQt5.QtCore import Qt, QSize, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon
+import logging
 import os
 import sys
+import threading
 from ..core.param_definitions import ParamDefinitions
+from ..core.command_line import RenderCommand
+from ..core.blend_metadata import BlendMetadataCache, BlendProbeError, scene_metadata
 from ..utils.settings_manager import SettingsManager
 from .preset_manager import PresetManagerDialog
 
 class CommandBuilder(QWidget):
+    # Preset changes made on disk by other programs (added, changed, removed)
+    presets_changed = pyqtSignal(object)
+    # Scenes of a .blend file read by a background probe (file, metadata)
+    metadata_ready = pyqtSignal(str, object)
+    
+    PROBE_DELAY = 500  # ms after the last edit of the .blend path before probing
+    
+    # Scene settings used as defaults for the parameters left empty
+    METADATA_DEFAULTS = {
+        ParamDefinitions.FRAME_START: 'frame_start',
+        ParamDefinitions.FRAME_END: 'frame_end',
+        ParamDefinitions.RESOLUTION_X: 'resolution_x',
+        ParamDefinitions.RESOLUTION_Y: 'resolution_y',
+    }
+    
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.settings_manager = SettingsManager()
+        self.settings_manager = SettingsManager.instance()
+        self.metadata_cache = BlendMetadataCache.instance(self.settings_manager.settings_dir)
+        self.blend_metadata = None  # Metadata of the current .blend file
+        self.probe_timer = QTimer(self)
+        self.probe_timer.setSingleShot(True)
+        self.probe_timer.setInterval(self.PROBE_DELAY)
+        self.probe_timer.timeout.connect(self.probe_blend_file)
+        self.metadata_ready.connect(self.apply_blend_metadata)
+        self.param_definitions = {param["param"]: param for param in ParamDefinitions.get_all_parameters()}
+        self.pending_values = {}  # Values of parameters whose tab is not built yet
         self.parameter_widgets = {}
         self.parameter_values = {}  # Initialize the parameter_values dictionary
         self.main_window = parent  # Move this line before init_ui()
         self.init_ui()
         self.load_saved_settings()
+        
+        # The settings watcher notifies from its own thread: the signal queues to the GUI thread
+        self.presets_changed.connect(self.apply_preset_changes)
+        self.settings_manager.subscribe('presets', lambda key, changes: self.presets_changed.emit(changes))
 
     def load_saved_settings(self):
         """Carica le impostazioni salvate"""
@@ -30,18 +63,8 @@ class CommandBuilder(QWidget):
         # Carica i parametri
         parameters = self.settings_manager.get_parameters()
         for param_name, value in parameters.items():
-            if param_name in self.parameter_widgets:
-                widget = self.parameter_widgets[param_name]
-                if isinstance(widget, QLineEdit):
-                    widget.setText(str(value))
-                elif isinstance(widget, QCheckBox):
-                    widget.setChecked(bool(value))
-                elif isinstance(widget, QSpinBox):
-                    widget.setValue(int(value))
-                elif isinstance(widget, QComboBox):
-                    index = widget.findText(str(value))
-                    if index >= 0:
-                        widget.setCurrentIndex(index)
+            if param_name in self.param_definitions:
+                self.set_parameter_value(param_name, value)
 
     def init_ui(self):
         main_layout = QHBoxLayout()
@@ -156,72 +179,17 @@ class CommandBuilder(QWidget):
         
         tabs.addTab(general_tab, "General")
 
-        # ...existing code for creating parameter tabs...
+        # Le schede dei parametri vengono costruite alla prima apertura
+        self.tabs = tabs
+        self.unbuilt_tabs = {}  # Indice della scheda -> parametri
         for category_name, parameters in param_categories.items():
             tab = QWidget()
             tab_layout = QVBoxLayout()
             tab_layout.setContentsMargins(20, 20, 20, 20)
             tab_layout.setSpacing(15)
-            
-            scroll = QScrollArea()
-            scroll.setWidgetResizable(True)
-            scroll.setFrameShape(QFrame.NoFrame)
-            scroll.setStyleSheet("""
-                QScrollArea {
-                    border: none;
-                    background: transparent;
-                }
-                QScrollBar:vertical {
-                    border: none;
-                    background: #252525;
-                    width: 10px;
-                    margin: 0;
-                }
-                QScrollBar::handle:vertical {
-                    background: #404040;
-                    min-height: 20px;
-                    border-radius: 5px;
-                }
-                QScrollBar::handle:vertical:hover {
-                    background: #4a4a4a;
-                }
-                QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                    height: 0;
-                    background: none;
-                }
-            """)
-            
-            scroll_content = QWidget()
-            scroll_layout = QFormLayout(scroll_content)
-            scroll_layout.setSpacing(10)  # Ridotto lo spacing
-            scroll_layout.setContentsMargins(15, 10, 15, 10)  # Margini più compatti
-            scroll_layout.setLabelAlignment(Qt.AlignRight | Qt.AlignVCenter)  # Allinea le etichette a destra
-            scroll_layout.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
-            
-            for param in parameters:
-                # Aggiungi la label con i due punti ma in una riga separata
-                label = QLabel(param["name"])
-                label.setStyleSheet("color: #eb5e28; font-weight: bold;")
-                label.setWordWrap(True)  # Permette il wrapping del testo
-                scroll_layout.addRow(label)
-                
-                # Aggiungi il widget del parametro nella riga successiva
-                widget = self.create_parameter_widget(param)
-                if widget:
-                    widget.setToolTip(param["description"])
-                    self.parameter_widgets[param["param"]] = widget
-                    scroll_layout.addRow(widget)
-                
-                # Aggiungi un po' di spazio dopo ogni parametro
-                spacer = QWidget()
-                spacer.setFixedHeight(5)
-                scroll_layout.addRow(spacer)
-            
-            scroll_content.setLayout(scroll_layout)
-            scroll.setWidget(scroll_content)
-            tab_layout.addWidget(scroll)
             tab.setLayout(tab_layout)
-            tabs.addTab(tab, category_name)
+            self.unbuilt_tabs[tabs.addTab(tab, category_name)] = parameters
+        tabs.currentChanged.connect(self.build_tab)
         
         main_layout.addWidget(tabs)
         self.setLayout(main_layout)
@@ -232,6 +200,77 @@ class CommandBuilder(QWidget):
         # Load presets
         self.load_presets()
 
+    def build_tab(self, index):
+        """Creates the widgets of a parameter tab the first time it is shown"""
+        parameters = self.unbuilt_tabs.pop(index, None)
+        if parameters is None:
+            return
+        tab = self.tabs.widget(index)
+        
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setFrameShape(QFrame.NoFrame)
+        scroll.setStyleSheet("""
+            QScrollArea {
+                border: none;
+                background: transparent;
+            }
+            QScrollBar:vertical {
+                border: none;
+                background: #252525;
+                width: 10px;
+                margin: 0;
+            }
+            QScrollBar::handle:vertical {
+                background: #404040;
+                min-height: 20px;
+                border-radius: 5px;
+            }
+            QScrollBar::handle:vertical:hover {
+                background: #4a4a4a;
+            }
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+                height: 0;
+                background: none;
+            }
+        """)
+        
+        scroll_content = QWidget()
+        scroll_layout = QFormLayout(scroll_content)
+        scroll_layout.setSpacing(10)  # Ridotto lo spacing
+        scroll_layout.setContentsMargins(15, 10, 15, 10)  # Margini più compatti
+        scroll_layout.setLabelAlignment(Qt.AlignRight | Qt.AlignVCenter)  # Allinea le etichette a destra
+        scroll_layout.setFieldGrowthPolicy(QFormLayout.ExpandingFieldsGrow)
+        
+        for param in parameters:
+            # Aggiungi la label con i due punti ma in una riga separata
+            label = QLabel(param["name"])
+            label.setStyleSheet("color: #eb5e28; font-weight: bold;")
+            label.setWordWrap(True)  # Permette il wrapping del testo
+            scroll_layout.addRow(label)
+            
+            # Aggiungi il widget del parametro nella riga successiva
+            widget = self.create_parameter_widget(param)
+            if widget:
+                widget.setToolTip(param["description"])
+                self.parameter_widgets[param["param"]] = widget
+                scroll_layout.addRow(widget)
+                if param["param"] in self.pending_values:
+                    # Il valore è già in parameter_values: nessun segnale
+                    self._set_widget_value(widget, self.pending_values.pop(param["param"]), silent=True)
+            
+            # Aggiungi un po' di spazio dopo ogni parametro
+            spacer = QWidget()
+            spacer.setFixedHeight(5)
+            scroll_layout.addRow(spacer)
+        
+        scroll_content.setLayout(scroll_layout)
+        scroll.setWidget(scroll_content)
+        tab.layout().addWidget(scroll)
+        
+        if self.blend_metadata:
+            self._update_metadata_widgets()
+
     def add_parameter_widget(self, param, layout):
         """Aggiunge un widget appropriato al tipo di parametro"""
         param_name = param["name"]
@@ -341,6 +380,12 @@ class CommandBuilder(QWidget):
         elif value:
             self.parameter_values[param_name] = value
         
+        if param_name == ParamDefinitions.FILE:
+            # Legge le scene del nuovo file quando l'utente smette di scrivere
+            self.probe_timer.start()
+        elif param_name == ParamDefinitions.SCENE and self.blend_metadata:
+            self.apply_scene_defaults()
+        
         # Aggiorna il comando
         self.update_command()
         
@@ -359,115 +404,94 @@ class CommandBuilder(QWidget):
             # Salva nel preset corrente
             self.settings_manager.save_as_preset(current_preset, current_settings)
 
-    def update_command(self):
-        """Aggiorna la visualizzazione del comando completo"""
-        blender_path = self.blender_path_edit.text()
-        command_parts = []
+    def probe_blend_file(self):
+        """Reads the scenes of the .blend file, from the cache or with Blender in background"""
+        blend_file = self.parameter_values.get(ParamDefinitions.FILE)
+        if not blend_file or not blend_file.lower().endswith('.blend') or not os.path.isfile(blend_file):
+            return
+        
+        metadata = self.metadata_cache.get(blend_file)
+        if metadata is not None:
+            self.apply_blend_metadata(blend_file, metadata)
+            return
         
-        # Aggiungi il percorso di Blender
+        blender_path = self.blender_path_edit.text()
         if blender_path:
-            command_parts.append(f'"{blender_path}"')
-        else:
-            command_parts.append("blender")
-        
-        # Gestisci il file .blend separatamente
-        blend_file = None
-        background_mode = False
-        
-        ordered_params = []
-        
-        # Raccogli i parametri e gestisci -b e il file blend separatamente
-        for param, value in self.parameter_values.items():
-            if param == ParamDefinitions.FILE:
-                blend_file = value
-            elif param == ParamDefinitions.BACKGROUND and value:
-                background_mode = True
-            else:
-                order = ParamDefinitions.get_param_order(param)
-                ordered_params.append((order, param, value))
-        
-        # Ordina i parametri in base alla priorità
-        ordered_params.sort(key=lambda x: x[0])
-        
-        # Gestisci -b e file blend
-        if background_mode:
-            if blend_file:
-                command_parts.append(f'-b "{blend_file}"')
-            else:
-                command_parts.append("-b")
-        elif blend_file:
-            command_parts.append(f'"{blend_file}"')
-        
-        # Aggiungi gli altri parametri
-        for _, param, value in ordered_params:
-            if isinstance(value, bool):
-                if value:
-                    command_parts.append(param)
-            else:
-                command_parts.append(f'{param} "{value}"')
+            threading.Thread(target=self._probe, args=(blender_path, blend_file),
+                             name="BlendProbe", daemon=True).start()
+    
+    def _probe(self, blender_path, blend_file):
+        """Runs in a worker thread: Blender may take a while to open large files"""
+        try:
+            metadata = self.metadata_cache.probe(blender_path, blend_file)
+        except BlendProbeError as e:
+            logging.warning(f"Unable to read the scenes of {blend_file}: {e}")
+            return
+        self.metadata_ready.emit(blend_file, metadata)
+    
+    def apply_blend_metadata(self, blend_file, metadata):
+        """Offers the scenes of the file and fills the empty parameters with their settings"""
+        if blend_file != self.parameter_values.get(ParamDefinitions.FILE):
+            return  # The user picked another file meanwhile
+        self.blend_metadata = metadata
+        self._update_metadata_widgets()
+        self.apply_scene_defaults()
+    
+    def _update_metadata_widgets(self):
+        """Scene completions and output placeholder, for the widgets already built"""
+        metadata = self.blend_metadata
+        scene_edit = self.parameter_widgets.get(ParamDefinitions.SCENE)
+        if isinstance(scene_edit, QLineEdit):
+            completer = QCompleter([scene.get('name', '') for scene in metadata.get('scenes', [])], scene_edit)
+            completer.setCaseSensitivity(Qt.CaseInsensitive)
+            scene_edit.setCompleter(completer)
+            scene_edit.setPlaceholderText(metadata.get('active_scene') or "Scene name to render")
+        
+        scene = scene_metadata(metadata, self.parameter_values.get(ParamDefinitions.SCENE))
+        output_widget = self.parameter_widgets.get(ParamDefinitions.RENDER_OUTPUT)
+        output_edit = output_widget.findChild(QLineEdit) if output_widget is not None else None
+        if output_edit is not None and scene and scene.get('output_path'):
+            output_edit.setPlaceholderText(scene['output_path'])
+    
+    def apply_scene_defaults(self):
+        """Copies the settings of the selected scene into the parameters left empty"""
+        scene = scene_metadata(self.blend_metadata, self.parameter_values.get(ParamDefinitions.SCENE))
+        if not scene:
+            return
+        
+        for param, key in self.METADATA_DEFAULTS.items():
+            if param in self.parameter_values or scene.get(key) is None:
+                continue
+            if param in (ParamDefinitions.FRAME_START, ParamDefinitions.FRAME_END) and \
+                    ParamDefinitions.RENDER_FRAME in self.parameter_values:
+                continue  # -f names the frames explicitly
+            self.set_parameter_value(param, int(scene[key]))
         
-        # Unisci le parti con uno spazio
-        command = " ".join(command_parts)
+        if ParamDefinitions.SCENE in self.parameter_values:
+            self._update_metadata_widgets()  # Output path of the chosen scene
+    
+    def update_command(self):
+        """Aggiorna la visualizzazione del comando completo"""
+        # L'ordine dei parametri è condiviso con l'interfaccia a riga di comando
+        # Il range della scena risolve i frame relativi di -f (+N, -N)
+        scene = None
+        if self.blend_metadata:
+            scene = scene_metadata(self.blend_metadata, self.parameter_values.get(ParamDefinitions.SCENE))
+        scene_range = (scene.get('frame_start'), scene.get('frame_end')) if scene else None
+        self.render_command = RenderCommand.from_parameters(self.blender_path_edit.text(),
+                                                            self.parameter_values, scene_range)
         if hasattr(self, 'main_window') and self.main_window is not None:
-            self.main_window.update_command_preview(command)
+            self.main_window.update_command_preview(self.render_command.display)
 
     def build_command(self):
-        """Build and return the command as a list"""
-        # Forza l'aggiornamento del comando
+        """Returns the RenderCommand of the current parameters"""
         self.update_command()
-        
-        # Ottieni il comando dalla preview e splittalo in una lista
-        # preservando le parti tra virgolette
-        command_str = self.main_window.command_preview.text()
-        if not command_str:
-            return None
-            
-        # Split preservando le parti tra virgolette
-        import shlex
-        return shlex.split(command_str)
-
-    def construct_command(self):
-        """Internal method to construct the command"""
-        blender_path = self.blender_path_edit.text()
-        if not blender_path:
-            return None
-
-        command = [blender_path]
-        # Add other parameters based on widget values
-        for param_name, widget in self.parameter_widgets.items():
-            value = None
-            if isinstance(widget, QLineEdit):
-                value = widget.text()
-            elif isinstance(widget, QCheckBox):
-                value = widget.isChecked()
-            elif isinstance(widget, QSpinBox):
-                value = widget.value()
-            elif isinstance(widget, QComboBox):
-                value = widget.currentText()
-            elif isinstance(widget, QWidget):
-                # Try to find a QLineEdit inside composite widgets
-                line_edit = widget.findChild(QLineEdit)
-                if line_edit:
-                    value = line_edit.text()
-
-            if value:
-                # Add the parameter flag
-                command.append(param_name)
-                # Add the value only if it's not a boolean parameter
-                if not isinstance(value, bool):
-                    command.append(str(value))
-
-        return command
-
-    def copy_command(self):
-        """Copia il comando negli appunti"""
-        command = self.construct_command()
-        clipboard = QApplication.clipboard()
-        clipboard.setText(" ".join(command))
+        return self.render_command
 
     def reset_parameters(self):
         """Resetta tutti i parametri"""
         self.parameter_values.clear()
+        self.pending_values.clear()
         
         for param, widget in self.parameter_widgets.items():
             if isinstance(widget, QCheckBox):
@@ -494,19 +518,10 @@ class CommandBuilder(QWidget):
             self.blender_path_edit.setText(settings['blender_path'])
         
         for param, value in settings.items():
-            if param in self.parameter_widgets:
-                widget = self.parameter_widgets[param]
-                if isinstance(widget, QCheckBox):
-                    widget.setChecked(value)
-                elif isinstance(widget, QLineEdit):
-                    widget.setText(value)
-                elif isinstance(widget, QSpinBox):
-                    widget.setValue(value)
-                elif isinstance(widget, QComboBox):
-                    index = widget.findText(value)
-                    if index >= 0:
-                        widget.setCurrentIndex(index)
-                        
+            if param in self.param_definitions:
+                self.set_parameter_value(param, value)
+
+
     def save_settings(self):
         """Salva le impostazioni correnti"""
         # Salva il percorso di Blender
@@ -514,15 +529,10 @@ class CommandBuilder(QWidget):
         
         # Prepara il dizionario dei parametri
         parameters = {}
-        for param, widget in self.parameter_widgets.items():
-            if isinstance(widget, QCheckBox):
-                parameters[param] = widget.isChecked()
-            elif isinstance(widget, QLineEdit):
-                parameters[param] = widget.text()
-            elif isinstance(widget, QSpinBox):
-                parameters[param] = widget.value()
-            elif isinstance(widget, QComboBox):
-                parameters[param] = widget.currentText()
+        for param, definition in self.param_definitions.items():
+            # I percorsi (file e cartelle) non fanno parte delle impostazioni salvate
+            if definition["type"] not in ("file", "path"):
+                parameters[param] = self.parameter_value(param)
         
         # Salva i parametri
         self.settings_manager.set_parameters(parameters)
@@ -533,6 +543,28 @@ class CommandBuilder(QWidget):
         preset_names = self.settings_manager.get_preset_names()
         self.preset_combo.addItems(preset_names)
 
+    def apply_preset_changes(self, changes):
+        """Updates preset_combo for presets added, changed or removed on disk"""
+        added, changed, removed = changes
+        current = self.preset_combo.currentText()
+        
+        # No on_preset_selected while the list is being edited
+        self.preset_combo.blockSignals(True)
+        for name in removed:
+            index = self.preset_combo.findText(name)
+            if index >= 0:
+                self.preset_combo.removeItem(index)
+        for name in added:
+            if self.preset_combo.findText(name) < 0:
+                self.preset_combo.addItem(name)
+        self.preset_combo.blockSignals(False)
+        
+        if current in changed:
+            # The active preset was edited elsewhere: show the new values
+            self.on_preset_selected(current)
+        elif current in removed:
+            self.on_preset_selected(self.preset_combo.currentText())
+    
     def on_preset_selected(self, preset_name):
         """Gestisce la selezione di un preset"""
         if not preset_name:
@@ -554,25 +586,9 @@ class CommandBuilder(QWidget):
             if param_name == 'blend_file':
                 param_name = ParamDefinitions.FILE
             
-            if param_name in self.parameter_widgets:
-                widget = self.parameter_widgets[param_name]
-                
-                # Aggiorna il widget
-                if isinstance(widget, QCheckBox):
-                    widget.setChecked(bool(value))
-                elif isinstance(widget, QSpinBox):
-                    widget.setValue(int(value))
-                elif isinstance(widget, QComboBox):
-                    index = widget.findText(str(value))
-                    if index >= 0:
-                        widget.setCurrentIndex(index)
-                elif isinstance(widget, QLineEdit):
-                    widget.setText(str(value))
-                elif isinstance(widget, QWidget):
-                    # Cerca QLineEdit all'interno di container compositi
-                    line_edit = widget.findChild(QLineEdit)
-                    if line_edit:
-                        line_edit.setText(str(value))
+            if param_name in self.param_definitions:
+                # Aggiorna il widget (o il valore di una scheda non ancora costruita)
+                self.set_parameter_value(param_name, value)
                 
                 # Aggiorna parameter_values
                 if value:
@@ -620,32 +636,84 @@ class CommandBuilder(QWidget):
     def get_current_parameters(self):
         """Raccoglie tutti i parametri correnti dai widget"""
         parameters = {}
-        for param_name, widget in self.parameter_widgets.items():
+        for param_name in self.param_definitions:
+            value = self.parameter_value(param_name)
             # Gestione speciale per il file .blend
             if param_name == ParamDefinitions.FILE:
                 # Salva con una chiave speciale che non interferisce col comando
-                if isinstance(widget, QWidget):
-                    line_edit = widget.findChild(QLineEdit)
-                    if line_edit and line_edit.text():
-                        parameters['blend_file'] = line_edit.text()
+                if value:
+                    parameters['blend_file'] = value
                 continue
-            
-            # Gestione normale per tutti gli altri parametri
-            if isinstance(widget, QCheckBox):
-                parameters[param_name] = widget.isChecked()
-            elif isinstance(widget, QSpinBox):
-                parameters[param_name] = widget.value()
-            elif isinstance(widget, QComboBox):
-                parameters[param_name] = widget.currentText()
-            elif isinstance(widget, QLineEdit):
-                parameters[param_name] = widget.text()
-            elif isinstance(widget, QWidget):
-                # Cerca QLineEdit all'interno di container compositi
-                line_edit = widget.findChild(QLineEdit)
-                if line_edit:
-                    parameters[param_name] = line_edit.text()
+            parameters[param_name] = value
         return parameters
 
+    def set_parameter_value(self, param_name, value):
+        """Shows a value in its widget, or keeps it until the widget's tab is built"""
+        widget = self.parameter_widgets.get(param_name)
+        if widget is not None:
+            self._set_widget_value(widget, value)
+            return
+        
+        definition = self.param_definitions[param_name]
+        if definition["type"] == "bool":
+            value = bool(value)
+        elif definition["type"] == "int":
+            value = int(value)
+        elif definition["type"] == "enum":
+            if str(value) not in definition.get("options", ()):
+                return  # Like findText() failing on the combo box
+            value = str(value)
+        else:
+            value = str(value)
+        if value == self.parameter_value(param_name):
+            return  # A widget would not emit a change either
+        self.pending_values[param_name] = value
+        self.update_parameter(param_name, value)
+
+    def parameter_value(self, param_name):
+        """Current value of a parameter, including those of tabs not built yet"""
+        widget = self.parameter_widgets.get(param_name)
+        if widget is None:
+            if param_name in self.pending_values:
+                return self.pending_values[param_name]
+            definition = self.param_definitions[param_name]
+            return {"bool": False, "int": 0}.get(definition["type"],
+                                                 (definition.get("options") or [""])[0])
+        if isinstance(widget, QCheckBox):
+            return widget.isChecked()
+        elif isinstance(widget, QSpinBox):
+            return widget.value()
+        elif isinstance(widget, QComboBox):
+            return widget.currentText()
+        elif isinstance(widget, QLineEdit):
+            return widget.text()
+        # Cerca QLineEdit all'interno di container compositi
+        line_edit = widget.findChild(QLineEdit)
+        return line_edit.text() if line_edit else None
+
+    @staticmethod
+    def _set_widget_value(widget, value, silent=False):
+        """Sets the value of a parameter widget; silent skips update_parameter"""
+        if not isinstance(widget, (QCheckBox, QSpinBox, QComboBox, QLineEdit)):
+            # Cerca QLineEdit all'interno di container compositi
+            widget = widget.findChild(QLineEdit)
+            if widget is None:
+                return
+        if silent:
+            widget.blockSignals(True)
+        if isinstance(widget, QCheckBox):
+            widget.setChecked(bool(value))
+        elif isinstance(widget, QSpinBox):
+            widget.setValue(int(value))
+        elif isinstance(widget, QComboBox):
+            index = widget.findText(str(value))
+            if index >= 0:
+                widget.setCurrentIndex(index)
+        else:
+            widget.setText(str(value))
+        if silent:
+            widget.blockSignals(False)
+
     def create_parameter_widget(self, param):
         """Crea il widget appropriato per il tipo di parametro"""
         param_type = param["type"]
@@ -0,0 +1,166 @@
+import math
+import logging
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton,
+                         QTableView, QHeaderView, QAbstractItemView, QFileDialog, QMessageBox)
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from ..core.frame_stats import COLUMNS
+
+
+class FrameStatsModel(QAbstractTableModel):
+    """Table model over a FrameStats snapshot, sorted through a row permutation"""
+
+    HEADERS = {'frame': "Frame", 'wall_time': "Wall Time (s)", 'render_time': "Render Time (s)",
+               'saving_time': "Saving (s)", 'peak_memory_mb': "Peak Memory (MB)",
+               'samples': "Samples", 'saved_path': "Saved"}
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.stats = None
+        self.order = []  # Display row -> stats row
+        self.sort_column = 0
+        self.sort_order = Qt.AscendingOrder
+
+    def set_stats(self, stats):
+        self.beginResetModel()
+        self.stats = stats
+        self._sort()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[COLUMNS[section]]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or self.stats is None:
+            return None
+        value = self.stats.column(COLUMNS[index.column()])[self.order[index.row()]]
+        if role == Qt.DisplayRole:
+            if isinstance(value, float):
+                return "" if math.isnan(value) else f"{value:.2f}"
+            return str(value)
+        if role == Qt.TextAlignmentRole and not isinstance(value, str):
+            return Qt.AlignRight | Qt.AlignVCenter
+        return None
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        self.sort_column = column
+        self.sort_order = order
+        self._sort()
+        self.layoutChanged.emit()
+
+    def _sort(self):
+        if self.stats is None:
+            self.order = []
+        else:
+            self.order = self.stats.sorted_indices(COLUMNS[self.sort_column],
+                                                   descending=self.sort_order == Qt.DescendingOrder)
+
+
+class FrameStatsDialog(QDialog):
+    """Per-frame statistics of a job, refreshed while it renders"""
+
+    REFRESH_INTERVAL = 1000  # ms
+
+    def __init__(self, render_queue, job_id, title="Frame Statistics", parent=None):
+        super().__init__(parent)
+        self.render_queue = render_queue
+        self.job_id = job_id
+        self.source = None  # FrameStats of the run being shown
+        self.setWindowTitle(title)
+        self.setMinimumSize(800, 500)
+        self.init_ui()
+        self.refresh()
+
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self.refresh)
+        self.refresh_timer.start(self.REFRESH_INTERVAL)
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        self.model = FrameStatsModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.AscendingOrder)
+        self.table.horizontalHeader().setSectionResizeMode(len(COLUMNS) - 1, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        layout.addWidget(self.table)
+
+        buttons_layout = QHBoxLayout()
+        self.info_label = QLabel()
+        self.info_label.setStyleSheet("color: #808080;")
+
+        csv_button = QPushButton("Export CSV")
+        csv_button.clicked.connect(lambda: self.export("CSV files (*.csv)", ".csv"))
+        parquet_button = QPushButton("Export Parquet")
+        parquet_button.clicked.connect(lambda: self.export("Parquet files (*.parquet)", ".parquet"))
+
+        buttons_layout.addWidget(self.info_label)
+        buttons_layout.addStretch()
+        buttons_layout.addWidget(csv_button)
+        buttons_layout.addWidget(parquet_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+
+    def refresh(self):
+        """Takes a new snapshot when frames were added"""
+        stats = self.render_queue.get_frame_stats(self.job_id)
+        if stats is None:
+            self.info_label.setText("No frames rendered yet")
+            return
+        if stats is self.source and len(stats) == len(self.model.stats) \
+                and not self._last_row_changed(stats):
+            return
+        self.source = stats
+        self.model.set_stats(stats.copy())
+        self.info_label.setText(self.summary(self.model.stats))
+
+    def _last_row_changed(self, stats):
+        # The 'Time:' line completes the last row after it was added
+        if not len(stats):
+            return False
+        shown = self.model.stats.column('render_time')[-1]
+        return math.isnan(shown) and not math.isnan(stats.column('render_time')[-1])
+
+    @staticmethod
+    def summary(stats):
+        if not len(stats):
+            return "No frames rendered yet"
+        wall_times = stats.column('wall_time')
+        slowest = max(range(len(stats)), key=wall_times.__getitem__)
+        peak = max(stats.column('peak_memory_mb'))
+        return (f"{len(stats)} frames - average {sum(wall_times) / len(stats):.2f} s, "
+                f"slowest frame {stats.column('frame')[slowest]} ({wall_times[slowest]:.2f} s), "
+                f"peak memory {peak:.0f} MB")
+
+    def export(self, file_filter, extension):
+        stats = self.model.stats
+        if stats is None or not len(stats):
+            QMessageBox.information(self, "Export", "There are no frame statistics to export.")
+            return
+        path, _ = QFileDialog.getSaveFileName(self, "Export Frame Statistics",
+                                              f"frame_stats_{self.job_id}{extension}", file_filter)
+        if not path:
+            return
+        if not path.lower().endswith(extension):
+            path += extension
+        try:
+            if extension == ".parquet":
+                stats.to_parquet(path)
+            else:
+                stats.to_csv(path)
+        except Exception as e:
+            logging.error(f"Error exporting frame statistics: {e}")
+            QMessageBox.warning(self, "Export", f"Unable to export the frame statistics:\n{e}")
@@ -0,0 +1,76 @@
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QComboBox,
+                         QPushButton, QPlainTextEdit)
+from PyQt5.QtGui import QFont
+from ..core.job_log import JobLogReader, INDEXED_LEVELS
+
+
+class JobLogDialog(QDialog):
+    """Browses the log of a job by frame or by level using its index"""
+
+    MAX_LINES = 10000  # Lines shown per query
+
+    def __init__(self, log_path, title="Job Log", parent=None):
+        super().__init__(parent)
+        self.reader = JobLogReader(log_path)
+        self.setWindowTitle(title)
+        self.setMinimumSize(800, 500)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        query_layout = QHBoxLayout()
+
+        frame_label = QLabel("Frame:")
+        frame_label.setStyleSheet("color: #e0e0e0;")
+        self.frame_combo = QComboBox()
+        for frame in self.reader.frames():
+            self.frame_combo.addItem(str(frame), frame)
+        show_frame_button = QPushButton("Show Frame")
+        show_frame_button.clicked.connect(self.show_frame)
+        show_frame_button.setEnabled(self.frame_combo.count() > 0)
+
+        level_label = QLabel("Level:")
+        level_label.setStyleSheet("color: #e0e0e0;")
+        self.level_combo = QComboBox()
+        for level in INDEXED_LEVELS:
+            self.level_combo.addItem(f"{level} ({self.reader.level_count(level)})", level)
+        show_level_button = QPushButton("Show Lines")
+        show_level_button.clicked.connect(self.show_level)
+
+        query_layout.addWidget(frame_label)
+        query_layout.addWidget(self.frame_combo)
+        query_layout.addWidget(show_frame_button)
+        query_layout.addSpacing(20)
+        query_layout.addWidget(level_label)
+        query_layout.addWidget(self.level_combo)
+        query_layout.addWidget(show_level_button)
+        query_layout.addStretch()
+        layout.addLayout(query_layout)
+
+        self.result_text = QPlainTextEdit()
+        self.result_text.setReadOnly(True)
+        font = QFont("Consolas" if hasattr(QFont, "Consolas") else "Courier")
+        font.setPointSize(9)
+        self.result_text.setFont(font)
+        layout.addWidget(self.result_text)
+
+        self.info_label = QLabel(self.reader.log_path)
+        self.info_label.setStyleSheet("color: #808080;")
+        layout.addWidget(self.info_label)
+
+        self.setLayout(layout)
+
+    def show_frame(self):
+        frame = self.frame_combo.currentData()
+        if frame is not None:
+            self.show_lines(self.reader.read_frame(frame, self.MAX_LINES), f"frame {frame}")
+
+    def show_level(self):
+        level = self.level_combo.currentData()
+        self.show_lines(self.reader.read_level(level, self.MAX_LINES), f"{level} lines")
+
+    def show_lines(self, lines, description):
+        self.result_text.setPlainText("\n".join(lines))
+        suffix = f" (first {self.MAX_LINES})" if len(lines) >= self.MAX_LINES else ""
+        self.info_label.setText(f"{len(lines)} {description}{suffix} - {self.reader.log_path}")
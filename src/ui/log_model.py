@@ -0,0 +1,91 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+from PyQt5.QtGui import QBrush, QColor
+from ..core.log_buffer import LEVEL, FLAGS, FLAG_IMPORTANT, FLAG_TECHNICAL, format_record
+
+# Role returning the raw record tuple
+RecordRole = Qt.UserRole
+
+
+class LogListModel(QAbstractListModel):
+    """List model exposing the records of a LogRingBuffer"""
+
+    def __init__(self, buffer, colors, parent=None):
+        super().__init__(parent)
+        self.buffer = buffer
+        self.brushes = {level: QBrush(QColor(color)) for level, color in colors.items()}
+        self.default_brush = self.brushes.get("INFO")
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.buffer)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        record = self.buffer[index.row()]
+        if role == Qt.DisplayRole:
+            return format_record(record)
+        if role == Qt.ForegroundRole:
+            return self.brushes.get(record[LEVEL], self.default_brush)
+        if role == RecordRole:
+            return record
+        return None
+
+    def append_records(self, records):
+        """Appends records, removing the rows evicted from the ring buffer"""
+        if not records:
+            return
+
+        if len(records) >= self.buffer.capacity:
+            self.beginResetModel()
+            self.buffer.extend(records)
+            self.endResetModel()
+            return
+
+        evicted = self.buffer.overflow(len(records))
+        if evicted:
+            self.beginRemoveRows(QModelIndex(), 0, evicted - 1)
+            self.buffer.evict(evicted)
+            self.endRemoveRows()
+
+        first = len(self.buffer)
+        self.beginInsertRows(QModelIndex(), first, first + len(records) - 1)
+        self.buffer.extend(records)
+        self.endInsertRows()
+
+    def clear(self):
+        self.beginResetModel()
+        self.buffer.clear()
+        self.endResetModel()
+
+
+class LogFilterProxyModel(QSortFilterProxyModel):
+    """Filters log records by level and detail level using their precomputed flags"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.hidden_levels = set()
+        self.detail_level = 0  # 0=All, 1=Standard, 2=Minimal
+        self.setDynamicSortFilter(False)
+
+    def set_filters(self, show_info, show_warning, show_error, detail_level):
+        """Changes the filters; only the rows held by the ring buffer are re-evaluated"""
+        self.hidden_levels = {level for level, shown in
+                              (("INFO", show_info), ("WARNING", show_warning), ("ERROR", show_error))
+                              if not shown}
+        self.detail_level = detail_level
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        record = self.sourceModel().buffer[source_row]
+        level = record[LEVEL]
+        if level in self.hidden_levels:
+            return False
+
+        if self.detail_level == 2:  # Minimal
+            return bool(record[FLAGS] & FLAG_IMPORTANT)
+        elif self.detail_level == 1:  # Standard
+            return not (record[FLAGS] & FLAG_TECHNICAL) or level == "ERROR"
+        return True  # All
@@ -1,15 +1,38 @@
-from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QPlainTextEdit, QGroupBox,
-                         QHBoxLayout, QCheckBox, QComboBox, QLabel)
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QTextCharFormat, QBrush, QColor, QFont
+from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QListView, QGroupBox,
+                         QHBoxLayout, QCheckBox, QComboBox, QLabel, QAbstractItemView)
+from PyQt5.QtGui import QFont
 from ..utils.settings_manager import SettingsManager
+from ..core.output_parser import parse_line
+from ..core.log_buffer import LogRingBuffer, make_record
+from ..core import log_buffer
+from .log_model import LogListModel, LogFilterProxyModel
 import datetime
+import os
 
 class LogViewer(QGroupBox):
+    DEFAULT_CAPACITY = 50000  # Lines kept in memory, older ones are spilled to disk
+    SPILL_PREFIX = 'log-view-'
+    STALE_SPILL_AGE = 24 * 3600  # Seconds after which spill files of sessions that crashed are removed
+    
+    # Colors of the different log types
+    COLORS = {
+        "INFO": "#e0e0e0",  # standard color
+        "WARNING": "#ffd700",  # yellow
+        "ERROR": "#ff6b6b",  # red
+        "SUCCESS": "#69db7c",  # green
+        "FRAME": "#eb5e28"  # frame info
+    }
+    
     def __init__(self):
         super().__init__("Log Output")
-        self.settings_manager = SettingsManager()
-        self.log_entries = []
+        self.settings_manager = SettingsManager.instance()
+        
+        # Bounded in-memory history, evicted lines go to a per-session spill file removed by close_session()
+        capacity = self.settings_manager.get_setting('log', {}).get('capacity', self.DEFAULT_CAPACITY)
+        session = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        spill_dir = os.path.join(self.settings_manager.settings_dir, 'logs')
+        log_buffer.remove_stale_spill_files(spill_dir, self.SPILL_PREFIX, self.STALE_SPILL_AGE)
+        self.log_entries = LogRingBuffer(capacity, os.path.join(spill_dir, f"{self.SPILL_PREFIX}{session}.log"))
         
         # Load saved filter settings
         ui_state = self.settings_manager.get_ui_state()
@@ -79,40 +102,30 @@ class LogViewer(QGroupBox):
         
         layout.addWidget(filter_container)
         
-        # Configure the log area with modern style
-        self.log_text = QPlainTextEdit()
-        self.log_text.setReadOnly(True)
+        # Model/view log area: only the visible rows are ever painted
+        self.log_model = LogListModel(self.log_entries, self.COLORS, self)
+        self.filter_model = LogFilterProxyModel(self)
+        self.filter_model.setSourceModel(self.log_model)
+        
+        self.log_view = QListView()
+        self.log_view.setModel(self.filter_model)
+        self.log_view.setUniformItemSizes(True)
+        self.log_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.log_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.log_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
         
         # Set monospace font for better log readability
         font = QFont("Consolas" if hasattr(QFont, "Consolas") else "Courier")
         font.setPointSize(9)
-        self.log_text.setFont(font)
-        
-        # Define formats for different log types
-        self.formats = {
-            "INFO": QTextCharFormat(),
-            "WARNING": QTextCharFormat(),
-            "ERROR": QTextCharFormat(),
-            "SUCCESS": QTextCharFormat(),
-            "FRAME": QTextCharFormat()
-        }
-        
-        # INFO: standard color
-        self.formats["INFO"].setForeground(QBrush(QColor("#e0e0e0")))
-        
-        # WARNING: yellow
-        self.formats["WARNING"].setForeground(QBrush(QColor("#ffd700")))
+        self.log_view.setFont(font)
         
-        # ERROR: red
-        self.formats["ERROR"].setForeground(QBrush(QColor("#ff6b6b")))
+        # Shown once older lines start being written to disk
+        self.spill_label = QLabel()
+        self.spill_label.setStyleSheet("color: #808080;")
+        self.spill_label.hide()
         
-        # SUCCESS: green
-        self.formats["SUCCESS"].setForeground(QBrush(QColor("#69db7c")))
-        
-        # FRAME: light blue (for frame info)
-        self.formats["FRAME"].setForeground(QBrush(QColor("#eb5e28")))
-        
-        layout.addWidget(self.log_text)
+        layout.addWidget(self.log_view)
+        layout.addWidget(self.spill_label)
         self.setLayout(layout)
         
         # Set initial filter state
@@ -120,24 +133,30 @@ class LogViewer(QGroupBox):
     
     def append_log(self, message, level="INFO"):
         """Adds a message to the log with the appropriate format"""
+        self.append_logs([(message, level)])
+    
+    def append_logs(self, messages):
+        """
+        Adds a batch of (message, level) pairs with a single model update
+        and a single scroll, instead of one per line
+        """
         timestamp = datetime.datetime.now().strftime("%H:%M:%S")
-        log_entry = {"timestamp": timestamp, "message": message, "level": level}
-        self.log_entries.append(log_entry)
-        
-        if self.should_show_message(message, level):
-            cursor = self.log_text.textCursor()
-            cursor.movePosition(cursor.End)
-            
-            # Select the appropriate format
-            format = self.formats.get(level, self.formats["INFO"])
-            
-            # Add timestamp and level
-            cursor.insertText(f"[{timestamp}] [{level}] ", format)
-            cursor.insertText(f"{message}\n", format)
-            
-            # Automatically scroll down
-            self.log_text.setTextCursor(cursor)
-            self.log_text.ensureCursorVisible()
+        records = [make_record(timestamp, level, message) for message, level in messages]
+        if not records:
+            return
+        
+        # Follow the output only if the user has not scrolled up
+        scrollbar = self.log_view.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        
+        self.log_model.append_records(records)
+        
+        if at_bottom:
+            self.log_view.scrollToBottom()
+        if self.log_entries.spilled_count:
+            self.spill_label.setText(f"{self.log_entries.spilled_count} older lines saved to "
+                                     f"{self.log_entries.spill_path}")
+            self.spill_label.show()
     
     def should_show_message(self, message, level):
         """Determines if a message should be shown based on current filters"""
@@ -158,24 +177,11 @@ class LogViewer(QGroupBox):
     
     def is_important_message(self, message, level):
         """Determines if a message is important"""
-        if level in ["ERROR", "WARNING"]:
-            return True
-        
-        important_patterns = [
-            "Rendering started", "Rendering completed", "Saved:", 
-            "Blender quit", "Fra:", "Current Frame:"
-        ]
-        
-        return any(pattern in message for pattern in important_patterns)
+        return log_buffer.is_important_message(message, level)
     
     def is_technical_message(self, message):
         """Determines if a message is too technical or debug"""
-        technical_patterns = [
-            "malloc", "Memory:", "AL lib:", "pure-virtual:", 
-            "OpenGL", "libGL", "0x", "libpng", "libjpeg"
-        ]
-        
-        return any(pattern in message for pattern in technical_patterns)
+        return log_buffer.is_technical_message(message)
     
     def filter_changed(self):
         """Handles filter state changes"""
@@ -197,31 +203,26 @@ class LogViewer(QGroupBox):
         self.apply_filters()
     
     def apply_filters(self):
-        """Reapplies filters to all log messages"""
-        self.log_text.clear()
-        for entry in self.log_entries:
-            if self.should_show_message(entry["message"], entry["level"]):
-                cursor = self.log_text.textCursor()
-                cursor.movePosition(cursor.End)
-                
-                format = self.formats.get(entry["level"], self.formats["INFO"])
-                cursor.insertText(f"[{entry['timestamp']}] [{entry['level']}] ", format)
-                cursor.insertText(f"{entry['message']}\n", format)
+        """Reapplies filters to the log messages held in memory"""
+        self.filter_model.set_filters(self.show_info, self.show_warning, self.show_error,
+                                      self.detail_combo.currentIndex())
+    
+    def process_blender_output(self, output_line, event=None):
+        """
+        Processes a line of output from Blender and formats it appropriately
+        
+        Args:
+            output_line: Text to show
+            event: OutputEvent already parsed from the line, parsed here if None
+        """
+        if event is None:
+            event = parse_line(output_line)
+        self.append_log(output_line, event.level)
     
-    def process_blender_output(self, output_line):
-        """Processes a line of output from Blender and formats it appropriately"""
-        if "Saved:" in output_line:
-            self.append_log(output_line, "SUCCESS")
-        elif "Fra:" in output_line:
-            self.append_log(output_line, "FRAME")
-        elif "Error:" in output_line or "ERROR" in output_line:
-            self.append_log(output_line, "ERROR")
-        elif "Warning:" in output_line or "WARNING" in output_line:
-            self.append_log(output_line, "WARNING")
-        else:
-            self.append_log(output_line, "INFO")
+    def close_session(self):
+        """Deletes the spill file of the session (the application is closing)"""
+        self.log_entries.close(remove=True)
     
     def clear(self):
         """Clears the log"""
-        self.log_entries.clear()
-        self.log_text.clear()
\ No newline at end of file
+        self.log_model.clear()
\ No newline at end of file
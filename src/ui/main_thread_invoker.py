@@ -0,0 +1,32 @@
+import threading
+from concurrent.futures import Future
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class MainThreadInvoker(QObject):
+    """Runs functions on the thread owning this object (the GUI thread) and waits for the result"""
+
+    _requested = pyqtSignal(object, object)  # function, Future
+
+    TIMEOUT = 30  # Seconds a caller waits for the GUI thread
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._thread = threading.current_thread()
+        self._requested.connect(self._run)
+
+    def __call__(self, function):
+        if threading.current_thread() is self._thread:
+            return function()
+        future = Future()
+        # Queued connection: _run executes in the GUI event loop
+        self._requested.emit(function, future)
+        return future.result(self.TIMEOUT)
+
+    def _run(self, function, future):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(function())
+        except BaseException as e:
+            future.set_exception(e)
@@ -1,18 +1,23 @@
 from PyQt5.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                          QPushButton, QLabel, QSplitter, QMessageBox, QFrame, QLineEdit, QGroupBox, QTextEdit, QApplication)
-from PyQt5.QtCore import Qt, QSize
+from PyQt5.QtCore import Qt, QSize, QTimer, pyqtSignal
 from PyQt5.QtGui import QIcon
 import os
 import sys
 import subprocess
+import logging
+import threading
 from .styles import STYLE  # Aggiunto import di STYLE
 
 from src.ui.command_builder import CommandBuilder
 from src.ui.progress_monitor import ProgressMonitor
 from src.ui.log_viewer import LogViewer
-from src.core.blender_executor import BlenderExecutor
+from src.ui.queue_panel import QueuePanel
+from src.core.render_queue import RenderQueue, JobState
 from src.core.param_definitions import ParamDefinitions
+from src.core.output_manifest import CACHE_FILE_NAME, OutputManifest, OutputPatternError, resume_command
 from src.utils.update_checker import UpdateChecker
+from src.utils.settings_manager import SettingsManager
 
 def get_resource_path(relative_path):
     """Get the absolute path to a resource, works for dev and for PyInstaller"""
@@ -25,6 +30,11 @@ def get_resource_path(relative_path):
     return os.path.join(base_path, relative_path)
 
 class MainWindow(QMainWindow):
+    # Result of an update check run in a worker thread: silent, (available, version, url)
+    update_check_finished = pyqtSignal(bool, object)
+    # Result of a render cache lookup run in a worker thread: (command or None, cache key), submit options
+    cache_lookup_finished = pyqtSignal(object, object)
+    
     def __init__(self):
         super().__init__()
         # Set application icon
@@ -37,9 +47,15 @@ class MainWindow(QMainWindow):
                 myappid = 'nebulastudios.blenderrenderui.1.0.0'  # Arbitrary identifier
                 ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
         
+        self.active_job_id = None  # Job shown in the progress monitor
+        self.update_check_running = False
+        self.update_check_finished.connect(self.show_update_result)
+        self.cache_lookup_finished.connect(self.submit_render)
+        self.job_counter = 0
+        self.run_job_ids = set()  # Jobs of the current run, since the queue was last idle
         self.init_ui()
-        # Controllo automatico aggiornamenti all'avvio
-        self.check_for_updates(silent=True)
+        # Controllo automatico aggiornamenti all'avvio, dopo che la finestra è visibile
+        QTimer.singleShot(0, lambda: self.check_for_updates(silent=True))
 
     def init_ui(self):
         self.setWindowTitle("Blender Render UI")
@@ -279,13 +295,19 @@ class MainWindow(QMainWindow):
         self.progress_monitor = ProgressMonitor()
         self.log_viewer = LogViewer()
         
-        # Initialize BlenderExecutor and connect signals
-        self.blender_executor = BlenderExecutor()
-        self.progress_monitor.set_blender_executor(self.blender_executor)  # Pass the reference
+        # Initialize the render queue and connect signals
+        self.render_queue = RenderQueue(SettingsManager.instance())
+        self.output_manifest = OutputManifest(
+            os.path.join(SettingsManager.instance().settings_dir, CACHE_FILE_NAME))
+        self.progress_monitor.set_blender_executor(self.render_queue)  # Pass the reference
+        self.queue_panel = QueuePanel(self.render_queue)
         self.connect_signals()
+        self.render_queue.restore()
+        self.start_job_api()
         
         right_layout.addWidget(top_frame)
         right_layout.addWidget(self.progress_monitor)
+        right_layout.addWidget(self.queue_panel)
         right_layout.addWidget(self.log_viewer, stretch=1)
         
         # Now create the left container since command_preview exists
@@ -330,59 +352,145 @@ class MainWindow(QMainWindow):
     
     def connect_signals(self):
         """Connect signals between various components"""
-        # Signals from BlenderExecutor to LogViewer
-        self.blender_executor.output_received.connect(self.handle_output_received)
-        self.blender_executor.render_started.connect(self.handle_render_started)
-        self.blender_executor.render_completed.connect(self.handle_render_completed)
-        self.blender_executor.render_progress.connect(self.handle_render_progress)
+        # Signals from the RenderQueue to LogViewer and ProgressMonitor
+        self.render_queue.output_batch.connect(self.handle_output_batch)
+        self.render_queue.render_started.connect(self.handle_render_started)
+        self.render_queue.render_completed.connect(self.handle_render_completed)
+        self.render_queue.render_progress.connect(self.handle_render_progress)
+        self.render_queue.render_eta.connect(self.handle_render_eta)
+        self.render_queue.resource_sampled.connect(self.handle_resource_sample)
+        self.render_queue.group_progress.connect(self.handle_group_progress)
+        self.render_queue.queue_finished.connect(self.handle_queue_finished)
+        self.render_queue.job_added.connect(self.handle_job_added)
+        self.queue_panel.job_selected.connect(self.focus_job)
+    
+    def job_label(self, job_id):
+        """Returns the label used to tag log lines of a job"""
+        job = self.render_queue.get_job(job_id)
+        return job.name if job and job.name else job_id
     
-    def handle_output_received(self, output_line):
-        """Handles a new output line from the Blender process"""
-        self.log_viewer.process_blender_output(output_line)
-        self.progress_monitor.parse_blender_output(output_line)
+    def handle_output_batch(self, job_id, events):
+        """Handles a batch of parsed output lines from a Blender process"""
+        label = self.job_label(job_id)
+        self.log_viewer.append_logs([(f"[{label}] {event.line}", event.level) for event in events])
+        if job_id == self.active_job_id:
+            self.progress_monitor.handle_output_events(events)
     
-    def handle_render_started(self):
-        """Handles the render start event"""
-        self.render_button.setEnabled(False)
+    def handle_job_added(self, job_id):
+        """Adds jobs submitted while the queue is running to the current run"""
+        if self.run_job_ids:
+            self.run_job_ids.add(job_id)
+    
+    def handle_render_started(self, job_id):
+        """Handles the start event of a job"""
+        if not self.run_job_ids:
+            # First job since the queue was idle: the run covers every job waiting
+            self.run_job_ids = {job.job_id for job in self.render_queue.get_jobs()
+                                if job.state not in JobState.FINISHED}
+        self.run_job_ids.add(job_id)
         self.stop_button.setEnabled(True)
-        self.log_viewer.append_log("Rendering started", "INFO")
-        self.status_indicator.setText("⬤ In Progress")
-        self.status_indicator.setProperty("status", "rendering")
-        self.status_indicator.style().unpolish(self.status_indicator)
-        self.status_indicator.style().polish(self.status_indicator)
+        self.log_viewer.append_log(f"[{self.job_label(job_id)}] Rendering started", "INFO")
+        
+        # Follow the newest job unless the focused one is still running
+        active_job = self.render_queue.get_job(self.active_job_id) if self.active_job_id else None
+        if active_job is None or active_job.state in JobState.FINISHED:
+            self.focus_job(job_id)
+        
+        self.set_status_indicator("⬤ In Progress", "rendering")
     
-    def handle_render_completed(self, success, message):
-        """Handles the render completion event"""
-        self.render_button.setEnabled(True)
-        self.stop_button.setEnabled(False)
+    def handle_render_completed(self, job_id, success, message):
+        """Handles the completion event of a job"""
+        self.run_job_ids.add(job_id)
+        self.stop_button.setEnabled(self.render_queue.is_running)
         self.open_output_button.setEnabled(True)  # Enable the output button
         
         log_level = "INFO" if success else "ERROR"
-        self.log_viewer.append_log(message, log_level)
+        self.log_viewer.append_log(f"[{self.job_label(job_id)}] {message}", log_level)
+        self.statusBar().showMessage(f"{self.job_label(job_id)}: {message}", 5000)
         
-        # Update status indicator
-        if success:
-            self.status_indicator.setText("⬤ Completed")
-            self.status_indicator.setProperty("status", "completed")
-        else:
-            self.status_indicator.setText("⬤ Error")
-            self.status_indicator.setProperty("status", "error")
-        self.status_indicator.style().unpolish(self.status_indicator)
-        self.status_indicator.style().polish(self.status_indicator)
+        if job_id == self.active_job_id and success:
+            self.progress_monitor.handle_render_completed()
+        
+        if not success:
+            self.set_status_indicator("⬤ Error", "error")
+    
+    def handle_queue_finished(self):
+        """Handles the end of the last active job"""
+        self.stop_button.setEnabled(False)
+        
+        # Only the jobs of this run, not those finished before the queue was last idle
+        run_job_ids, self.run_job_ids = self.run_job_ids, set()
+        jobs = [job for job in map(self.render_queue.get_job, run_job_ids) if job is not None]
+        failed = [job for job in jobs if job.state in (JobState.FAILED, JobState.CANCELLED)]
+        completed = [job for job in jobs if job.state == JobState.COMPLETED]
         
         # Show message to user
-        if success:
-            QMessageBox.information(self, "Rendering Completed", message)
+        if failed:
+            self.set_status_indicator("⬤ Error", "error")
+            QMessageBox.warning(self, "Rendering Failed",
+                                f"{len(failed)} job(s) failed or were cancelled, "
+                                f"{len(completed)} completed.")
         else:
-            QMessageBox.warning(self, "Rendering Failed", message)
+            self.set_status_indicator("⬤ Completed", "completed")
+            QMessageBox.information(self, "Rendering Completed",
+                                    f"{len(completed)} job(s) completed successfully")
     
-    def handle_render_progress(self, progress):
+    def handle_render_progress(self, job_id, progress):
         """Handles a render progress update"""
-        progress_percent = int(progress * 100)
-        # No need to update the UI here as it is done via parse_blender_output
+        # No need to update the UI here as it is done via handle_output_event
+        # and the queue panel
+        pass
+    
+    def handle_render_eta(self, job_id, estimate):
+        """Shows the estimated progress and remaining time of the focused job"""
+        if job_id == self.active_job_id:
+            self.progress_monitor.set_estimate(estimate)
+    
+    def handle_resource_sample(self, job_id, sample):
+        """Shows the resource usage of the focused job's process"""
+        if job_id == self.active_job_id:
+            self.progress_monitor.add_resource_sample(sample)
+    
+    def handle_group_progress(self, group_id, progress, eta):
+        """Shows the merged progress of a sharded animation"""
+        job = self.render_queue.get_job(self.active_job_id) if self.active_job_id else None
+        if job is not None and job.group_id == group_id:
+            self.progress_monitor.set_aggregate_progress(progress, eta)
+    
+    def set_status_indicator(self, text, status):
+        """Updates the status indicator in the status bar"""
+        self.status_indicator.setText(text)
+        self.status_indicator.setProperty("status", status)
+        self.status_indicator.style().unpolish(self.status_indicator)
+        self.status_indicator.style().polish(self.status_indicator)
+    
+    def focus_job(self, job_id):
+        """Shows the progress of the given job in the progress monitor"""
+        job = self.render_queue.get_job(job_id)
+        if job is None or job_id == self.active_job_id:
+            return
+        
+        self.active_job_id = job_id
+        self.progress_monitor.reset()
+        group = self.render_queue.groups.get(job.group_id) if job.group_id else None
+        if group is not None:
+            # Sharded animation: the bar shows the whole range
+            first = min(self.render_queue.get_job(i).start_frame for i in group.frame_counts)
+            last = max(self.render_queue.get_job(i).end_frame for i in group.frame_counts)
+            self.progress_monitor.set_total_frames(first, last, group.total_frames)
+            eta = group.eta()
+            self.progress_monitor.set_aggregate_progress(group.fraction(), -1.0 if eta is None else eta)
+        else:
+            self.progress_monitor.set_total_frames(job.start_frame, job.end_frame, job.frame_count)
+            self.progress_monitor.progress_bar.setValue(int(job.progress * 100))
+        resources = self.render_queue.get_resources(job_id)
+        if resources is not None:
+            self.progress_monitor.show_resources(resources)
+        if job.state == JobState.RUNNING:
+            self.progress_monitor.start_render()
     
     def run_render(self):
-        """Starts the rendering process with configured parameters"""
+        """Adds a job with the configured parameters to the render queue"""
         # Get command from CommandBuilder
         command = self.command_builder.build_command()
         
@@ -390,81 +498,101 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Invalid command or Blender path not specified")
             return
         
-        # Extract frame start and end values from parameters
-        start_frame = 1
-        end_frame = 1
-        
-        # First check for animation render
-        is_animation = False
-        for i, arg in enumerate(command):
-            if arg == ParamDefinitions.RENDER:
-                is_animation = True
-                break
-        
-        # If animation, look for start/end frames
-        if is_animation:
-            for i, arg in enumerate(command):
-                if (arg == ParamDefinitions.FRAME_START and i + 1 < len(command)):
-                    try:
-                        start_frame = int(command[i + 1])
-                    except ValueError:
-                        pass
-                elif (arg == ParamDefinitions.FRAME_END and i + 1 < len(command)):
-                    try:
-                        end_frame = int(command[i + 1])
-                    except ValueError:
-                        pass
-        # If not animation, check for single frame
-        else:
-            for i, arg in enumerate(command):
-                if (arg == ParamDefinitions.RENDER_FRAME and i + 1 < len(command)):
-                    try:
-                        frame_value = command[i + 1]
-                        # Handle range notation (e.g., "1-10")
-                        if "-" in frame_value:
-                            parts = frame_value.split("-")
-                            if len(parts) == 2:
-                                start_frame = int(parts[0])
-                                end_frame = int(parts[1])
-                        else:
-                            # Single frame
-                            start_frame = int(frame_value)
-                            end_frame = start_frame
-                    except ValueError:
-                        pass
-        
-        # Reset log and monitor
+        if self.queue_panel.skip_existing():
+            command = self.skip_rendered_frames(command)
+            if command is None:
+                return
+
+        self.job_counter += 1
         self.log_viewer.append_log("Preparing rendering...", "INFO")
-        self.progress_monitor.reset()
-        
-        # Set total frames in progress monitor
-        self.progress_monitor.set_total_frames(start_frame, end_frame)
-        
-        # Execute Blender command
-        success = self.blender_executor.execute(command, start_frame, end_frame)
-        
-        if not success:
+        options = (self.queue_panel.shard_count(), self.queue_panel.shard_mode(), self.make_job_name(command))
+        if self.render_queue.render_cache is None:
+            self.submit_render((command, None), options)
+            return
+
+        # The lookup runs Blender and hashes the inputs: not on the GUI thread
+        def lookup():
+            try:
+                result = self.render_queue.restore_cached_frames(command)
+            except Exception as e:
+                logging.error(f"Render cache lookup failed: {e}")
+                result = (command, None)
+            self.cache_lookup_finished.emit(result, options)
+
+        threading.Thread(target=lookup, name="RenderCacheLookup", daemon=True).start()
+
+    def submit_render(self, lookup, options):
+        """Queues a command once the render cache was looked up (GUI thread)"""
+        command, cache_key = lookup
+        if command is None:
+            self.log_viewer.append_log("Every frame was restored from the render cache", "INFO")
+            return
+        shards, mode, name = options
+        submitted = self.render_queue.submit_command(command, shards, mode, name=name, use_cache=False,
+                                                     cache_key=cache_key)
+        job = self.render_queue.get_job(submitted)
+        if job is not None and job.state == JobState.FAILED:
             QMessageBox.warning(self, "Error", "Unable to start rendering. Check logs for more details.")
     
+    def skip_rendered_frames(self, command):
+        """Restricts a command to the frames without a complete output file, None if there are none"""
+        try:
+            resumed, done = resume_command(command, self.output_manifest)
+        except OutputPatternError as e:
+            QMessageBox.warning(self, "Skip Existing Frames", f"Unable to find the rendered frames:\n{e}")
+            return None
+        if resumed is None:
+            QMessageBox.information(self, "Skip Existing Frames",
+                                    f"All {len(done)} frames are already rendered.")
+            return None
+        if done:
+            self.log_viewer.append_log(f"Skipping {len(done)} frames already rendered, "
+                                       f"{resumed.frame_count} left", "INFO")
+        return resumed
+
+    def make_job_name(self, command):
+        """Builds a short label for a job from its .blend file"""
+        return f"#{self.job_counter} {command.name}".strip()
+    
     def stop_render(self):
-        """Stops the current rendering process"""
-        if self.blender_executor.is_rendering():
+        """Stops all running and queued jobs"""
+        if self.render_queue.is_rendering():
             confirm = QMessageBox.question(
                 self, 
                 "Confirm Stop", 
-                "Are you sure you want to stop the current rendering?",
+                "Are you sure you want to stop all renderings in the queue?",
                 QMessageBox.Yes | QMessageBox.No, 
                 QMessageBox.No
             )
             
             if confirm == QMessageBox.Yes:
-                success = self.blender_executor.terminate()
-                if not success:
-                    QMessageBox.warning(self, "Error", "Unable to stop rendering")
+                self.render_queue.cancel_all()
+    
+    def start_job_api(self):
+        """Starts the local HTTP job API if enabled in the settings"""
+        self.job_server = None
+        settings_manager = self.render_queue.settings_manager
+        api_settings = settings_manager.get_setting('api', {})
+        if not api_settings.get('enabled'):
+            return
+        
+        from src.core.job_server import JobServer, DEFAULT_HOST, DEFAULT_PORT
+        from src.ui.main_thread_invoker import MainThreadInvoker
+        try:
+            self.job_server = JobServer(self.render_queue, settings_manager,
+                                        api_settings.get('host', DEFAULT_HOST),
+                                        api_settings.get('port', DEFAULT_PORT),
+                                        invoke=MainThreadInvoker(self))
+            self.job_server.start()
+            self.log_viewer.append_log(f"Job API listening on {self.job_server.address} "
+                                       f"(token in {self.job_server.token_file})", "INFO")
+        except OSError as e:
+            self.job_server = None
+            self.log_viewer.append_log(f"Unable to start the job API: {e}", "ERROR")
     
     def closeEvent(self, event):
         """Handles window close event"""
-        if self.blender_executor.is_rendering():
+        if self.render_queue.is_rendering():
             confirm = QMessageBox.question(
                 self, 
                 "Confirm Exit", 
@@ -474,12 +602,18 @@ class MainWindow(QMainWindow):
             )
             
             if confirm == QMessageBox.Yes:
-                self.blender_executor.terminate()
+                # Interrupted jobs are restored on the next start
+                self.render_queue.shutdown()
                 event.accept()
             else:
                 event.ignore()
         else:
             event.accept()
+        
+        if event.isAccepted():
+            if self.job_server is not None:
+                self.job_server.stop()
+            self.log_viewer.close_session()
 
     def update_command_preview(self, command):
         """Updates the command preview text field with the given command"""
@@ -502,14 +636,7 @@ class MainWindow(QMainWindow):
     def open_output_directory(self):
         """Opens the output directory in file explorer"""
         # Get the output path from the command builder
-        output_path = None
-        for param_name, widget in self.command_builder.parameter_widgets.items():
-            if param_name == ParamDefinitions.RENDER_OUTPUT:
-                if isinstance(widget, QWidget):
-                    line_edit = widget.findChild(QLineEdit)
-                    if line_edit:
-                        output_path = os.path.dirname(line_edit.text())
-                        break
+        output_path = os.path.dirname(self.command_builder.parameter_value(ParamDefinitions.RENDER_OUTPUT) or '')
 
         if output_path and os.path.exists(output_path):
             # Use the default system file explorer to open the directory
@@ -523,8 +650,38 @@ class MainWindow(QMainWindow):
             QMessageBox.warning(self, "Error", "Output directory not found or not specified")
 
     def check_for_updates(self, silent=False):
-        """Controlla la disponibilità di aggiornamenti"""
-        update_available, latest_version, download_url = UpdateChecker.check_for_updates()
+        """Controlla la disponibilità di aggiornamenti in un thread separato"""
+        if self.update_check_running:
+            return
+        settings_manager = SettingsManager.instance()
+        updates = settings_manager.get_setting('updates', {})
+        offline = UpdateChecker.is_offline(updates.get('offline', False))
+        if offline and not silent:
+            QMessageBox.information(self, "No Updates",
+                                    "Update checks are disabled (offline mode).", QMessageBox.Ok)
+            return
+        
+        # Automatic checks reuse a recent answer; manual checks always ask GitHub
+        min_interval = updates.get('check_interval', 86400) if silent else 0
+        cache_file = os.path.join(settings_manager.settings_dir, UpdateChecker.CACHE_FILE_NAME)
+        
+        def check():
+            try:
+                result = UpdateChecker.check_for_updates(cache_file, min_interval, offline, updates.get('url'))
+            except Exception as e:
+                logging.error(f"Update check failed: {e}")
+                result = (False, None, None)
+            self.update_check_finished.emit(silent, result)
+        
+        self.update_check_running = True
+        self.update_button.setEnabled(False)
+        threading.Thread(target=check, name="UpdateCheck", daemon=True).start()
+
+    def show_update_result(self, silent, result):
+        """Shows the result of check_for_updates (GUI thread)"""
+        self.update_check_running = False
+        self.update_button.setEnabled(True)
+        update_available, latest_version, download_url = result
         
         if update_available and latest_version and download_url:
             reply = QMessageBox.question(
@@ -539,6 +696,8 @@ class MainWindow(QMainWindow):
             if reply == QMessageBox.Yes:
                 import webbrowser
                 webbrowser.open(download_url)
+        elif not silent and latest_version is None:
+            QMessageBox.warning(self, "No Updates", "Unable to check for updates, see the log for details.")
         elif not silent:
             QMessageBox.information(
                 self,
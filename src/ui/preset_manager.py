@@ -1,5 +1,5 @@
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, 
-                         QPushButton, QListWidget, QMessageBox)
+                         QPushButton, QListWidget, QMessageBox, QInputDialog)
 from PyQt5.QtCore import Qt
 
 class PresetManagerDialog(QDialog):
@@ -77,16 +77,14 @@ class PresetManagerDialog(QDialog):
         if ok and new_name and new_name != old_name:
             success = self.settings_manager.rename_preset(old_name, new_name)
             if success:
-                self.load_presets()
-                # Seleziona il preset rinominato
-                items = self.preset_list.findItems(new_name, Qt.MatchExactly)
-                if items:
-                    self.preset_list.setCurrentItem(items[0])
+                # Aggiorna solo la voce rinominata
+                current_item.setText(new_name)
             else:
                 QMessageBox.warning(
                     self,
                     "Error",
-                    "Could not rename the preset. The default preset cannot be renamed."
+                    "Could not rename the preset. The default preset cannot be renamed "
+                    "and the new name must not be in use."
                 )
     
     def delete_preset(self):
@@ -107,7 +105,7 @@ class PresetManagerDialog(QDialog):
         if confirm == QMessageBox.Yes:
             success = self.settings_manager.delete_preset(preset_name)
             if success:
-                self.load_presets()
+                self.preset_list.takeItem(self.preset_list.row(current_item))
             else:
                 QMessageBox.warning(
                     self,
@@ -1,16 +1,9 @@
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QProgressBar, QLabel, QGroupBox, QHBoxLayout, QGridLayout
-from PyQt5.QtCore import Qt, QThread, pyqtSignal, pyqtSlot, QTimer
+from PyQt5.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer
 from ..utils.settings_manager import SettingsManager
 import time
-import re
-
-class RenderThread(QThread):
-    progress = pyqtSignal(int)
-
-    def run(self):
-        for i in range(101):
-            time.sleep(0.1)  # Simulate rendering time
-            self.progress.emit(i)
+from ..core.output_parser import parse_line
+from .sparkline import Sparkline
 
 class ProgressMonitor(QGroupBox):
     # Signals to update the UI from the rendering thread
@@ -21,7 +14,7 @@ class ProgressMonitor(QGroupBox):
 
     def __init__(self):
         super().__init__("Rendering Progress")
-        self.settings_manager = SettingsManager()
+        self.settings_manager = SettingsManager.instance()
         self.current_frame = 0
         self.start_frame = 1
         self.end_frame = 1
@@ -34,7 +27,11 @@ class ProgressMonitor(QGroupBox):
         self.peak_memory = ""
         self.using_cycles = False  # Flag to indicate if we are using Cycles
         self.render_start_time = None
+        self.aggregate_mode = False  # Progress bar driven by set_aggregate_progress
+        self.estimate = None  # Latest Estimate of the job (see core/eta.py)
+        self.estimate_time = None  # When it was received
         self.blender_executor = None  # Will be set by MainWindow
+        self.resource_peak_mb = 0.0  # Highest RSS sampled from /proc for the shown job
         
         # Load saved settings
         saved_settings = self.settings_manager.get_setting('progress_monitor', {})
@@ -87,6 +84,10 @@ class ProgressMonitor(QGroupBox):
         self.time_label.setStyleSheet("color: #e0e0e0;")
         info_layout.addWidget(self.time_label)
         
+        self.eta_label = QLabel("Remaining: --:--:--")
+        self.eta_label.setStyleSheet("color: #e0e0e0;")
+        info_layout.addWidget(self.eta_label)
+        
         info_layout.addStretch()
         layout.addLayout(info_layout)
 
@@ -104,6 +105,15 @@ class ProgressMonitor(QGroupBox):
         status_layout.addStretch()
         layout.addLayout(status_layout)
 
+        # Process resources sampled from /proc (core/resource_sampler.py)
+        self.resource_label = QLabel("Process: --")
+        self.resource_label.setStyleSheet("color: #e0e0e0;")
+        layout.addWidget(self.resource_label)
+
+        self.memory_sparkline = Sparkline()
+        self.memory_sparkline.setToolTip("Process memory (RSS) over the last samples")
+        layout.addWidget(self.memory_sparkline)
+
         # Progress bars section
         progress_section = QVBoxLayout()
         progress_section.setSpacing(10)
@@ -177,8 +187,13 @@ class ProgressMonitor(QGroupBox):
         self.frame_label.setText("Frame: 0/0")
         self.memory_label.setText("Memory: 0MB (Peak: 0MB)")
         self.time_label.setText("Time: 00:00:00")
+        self.eta_label.setText("Remaining: --:--:--")
+        self.eta_label.setToolTip("")
         self.status_label.setText("Waiting...")
         self.scene_label.setText("")
+        self.resource_label.setText("Process: --")
+        self.memory_sparkline.clear()
+        self.resource_peak_mb = 0.0
         self.current_frame = 0
         self.total_frames = 0
         self.current_sample = 0
@@ -186,6 +201,9 @@ class ProgressMonitor(QGroupBox):
         self.in_compositing = False
         self.using_cycles = False
         self.render_start_time = None
+        self.aggregate_mode = False
+        self.estimate = None
+        self.estimate_time = None
         # Hide sample section
         self.sample_label.hide()
         self.sample_progress.hide()
@@ -205,13 +223,64 @@ class ProgressMonitor(QGroupBox):
     @pyqtSlot(str)
     def update_render_time(self, time_str):
         """Update the displayed rendering time"""
-        self.render_time_label.setText(f"Time: {time_str}")
+        self.time_label.setText(f"Time: {time_str}")
     
     @pyqtSlot(str)
     def update_remaining_time(self, time_str):
         """Update the estimated remaining time"""
         self.eta_label.setText(f"Remaining: {time_str}")
     
+    @staticmethod
+    def format_duration(seconds):
+        seconds = int(seconds)
+        return f"{seconds // 3600:02d}:{(seconds % 3600) // 60:02d}:{seconds % 60:02d}"
+    
+    def set_estimate(self, estimate):
+        """Shows the progress and remaining time estimated from the job output"""
+        self.estimate = estimate
+        self.estimate_time = time.monotonic()
+        if not self.aggregate_mode:
+            percent = max(0, min(100, int(estimate.fraction * 100)))
+            self.progress_bar.setValue(percent)
+            self.progress_bar.setFormat(f"{percent}%")
+        self.show_remaining_time()
+    
+    def show_remaining_time(self):
+        """Updates the remaining time, counting down since the last estimate"""
+        estimate = self.estimate
+        if estimate is None or estimate.eta is None or self.aggregate_mode:
+            return
+        elapsed = time.monotonic() - self.estimate_time
+        self.remaining_time_updated.emit(self.format_duration(max(0.0, estimate.eta - elapsed)))
+        if estimate.eta_low is not None:
+            low = self.format_duration(max(0.0, estimate.eta_low - elapsed))
+            high = self.format_duration(max(0.0, estimate.eta_high - elapsed))
+            self.eta_label.setToolTip(f"95% interval: {low} - {high}\n"
+                                      f"{estimate.seconds_per_frame:.1f} s per frame, "
+                                      f"{estimate.frames_done}/{estimate.total_frames} frames done")
+    
+    def add_resource_sample(self, sample):
+        """Shows a ResourceSample of the process and adds its memory to the sparkline"""
+        self.resource_peak_mb = max(self.resource_peak_mb, sample.rss_mb)
+        self.memory_sparkline.add_value(sample.rss_mb)
+        text = f"Process: {sample.rss_mb:.0f}MB (Peak: {self.resource_peak_mb:.0f}MB)"
+        if sample.cpu_percent is not None:
+            text += f" | CPU {sample.cpu_percent:.0f}%"
+        text += f" | {sample.threads} threads"
+        if sample.read_bytes is not None:
+            text += (f" | I/O {sample.read_bytes / 1048576:.0f}MB read, "
+                     f"{sample.write_bytes / 1048576:.0f}MB written")
+        self.resource_label.setText(text)
+
+    def show_resources(self, series):
+        """Shows the samples already taken for a job (a ResourceSeries)"""
+        samples = series.samples(self.memory_sparkline.values.maxlen)
+        if not samples:
+            return
+        self.memory_sparkline.set_values(sample.rss_mb for sample in samples[:-1])
+        self.resource_peak_mb = series.peak.rss_mb
+        self.add_resource_sample(samples[-1])
+
     @pyqtSlot()
     def handle_render_completed(self):
         """Handles render completion"""
@@ -219,6 +288,7 @@ class ProgressMonitor(QGroupBox):
         # Ensure progress bar is at 100%
         self.progress_bar.setValue(100)
         self.sample_progress.setValue(100)
+        self.eta_label.setText("Remaining: 00:00:00")
     
     def start_render(self):
         """Called when rendering starts"""
@@ -234,11 +304,8 @@ class ProgressMonitor(QGroupBox):
         if self.render_start_time is None:
             return
         
-        elapsed = int(time.time() - self.render_start_time)
-        hours = elapsed // 3600
-        minutes = (elapsed % 3600) // 60
-        seconds = elapsed % 60
-        self.time_label.setText(f"Time: {hours:02d}:{minutes:02d}:{seconds:02d}")
+        self.time_label.setText(f"Time: {self.format_duration(time.time() - self.render_start_time)}")
+        self.show_remaining_time()
         
         # Continue updating while rendering
         if self.blender_executor and self.blender_executor.is_running:
@@ -246,92 +313,96 @@ class ProgressMonitor(QGroupBox):
     
     def parse_blender_output(self, line):
         """Parses a line of Blender output to extract progress information"""
+        self.handle_output_event(parse_line(line))
+
+    def handle_output_events(self, events):
+        """Updates the progress information from a batch of parsed output lines"""
+        for event in events:
+            self.handle_output_event(event)
+
+    def handle_output_event(self, event):
+        """Updates the progress information from a parsed output line"""
         # Start timing on first frame
-        if self.render_start_time is None and "Fra:" in line:
+        if self.render_start_time is None and event.frame is not None:
             self.start_render()
 
         # Handle sample progress first (since it's the most specific)
-        sample_match = re.search(r'Sample (\d+)/(\d+)', line)
-        if sample_match:
-            try:
-                current_sample = int(sample_match.group(1))
-                total_samples = int(sample_match.group(2))
-                
-                # Se è il primo sample che troviamo, mostriamo la progress bar
-                if not self.using_cycles:
-                    self.using_cycles = True
-                    self.sample_label.show()
-                    self.sample_progress.show()
-                    self.sample_progress.setMaximum(total_samples)
-                
-                # Aggiorna il valore corrente
-                self.sample_progress.setValue(current_sample)
-                self.current_sample = current_sample
-                self.total_samples = total_samples
-                
-                # Forza l'aggiornamento del testo
-                self.sample_progress.setFormat(f"Sample {current_sample}/{total_samples}")
-                self.status_label.setText(f"Rendering sample {current_sample}/{total_samples}")
-            except (ValueError, IndexError) as e:
-                print(f"Error parsing sample numbers: {e}")
-                return
+        if event.sample is not None:
+            current_sample = event.sample
+            total_samples = event.total_samples
+            
+            # Se è il primo sample che troviamo, mostriamo la progress bar
+            if not self.using_cycles:
+                self.using_cycles = True
+                self.sample_label.show()
+                self.sample_progress.show()
+                self.sample_progress.setMaximum(total_samples)
+            
+            # Aggiorna il valore corrente
+            self.sample_progress.setValue(current_sample)
+            self.current_sample = current_sample
+            self.total_samples = total_samples
+            
+            # Forza l'aggiornamento del testo
+            self.sample_progress.setFormat(f"Sample {current_sample}/{total_samples}")
+            self.status_label.setText(f"Rendering sample {current_sample}/{total_samples}")
 
         # Handle frame progress
-        frame_match = re.search(r'Fra:(\d+)', line)
-        if frame_match:
-            self.current_frame = int(frame_match.group(1))
+        if event.frame is not None:
+            self.current_frame = event.frame
             self.frame_label.setText(f"Frame: {self.current_frame}/{self.end_frame}")
-            if self.total_frames > 0:
+            # Until the executor's estimate arrives the bar follows the frame number
+            if self.total_frames > 0 and not self.aggregate_mode and self.estimate is None:
                 progress = int(((self.current_frame - self.start_frame + 1) / self.total_frames) * 100)
                 progress = max(0, min(100, progress))
                 self.progress_bar.setValue(progress)
                 self.progress_bar.setFormat(f"{progress}%")
 
         # Handle compositing separately
-        if "Compositing" in line and "Sample" not in line:
+        if event.compositing is not None:
             self.in_compositing = True
-            if "|" in line:
-                comp_match = re.search(r'Compositing \| (.*?)(?=\||$)', line)
-                if comp_match:
-                    self.compositing_operation = comp_match.group(1).strip()
-                    self.status_label.setText(f"Compositing: {self.compositing_operation}")
-            else:
+            if event.compositing:
+                self.compositing_operation = event.compositing
+                self.status_label.setText(f"Compositing: {self.compositing_operation}")
+            elif "|" not in event.line:
                 self.status_label.setText("Compositing")
                 
         # Handle memory info
-        mem_match = re.search(r'Mem:([\d.]+)([MG]).*Peak\s+([\d.]+)([MG])', line)
-        if mem_match:
-            current = float(mem_match.group(1))
-            current_unit = mem_match.group(2)
-            peak = float(mem_match.group(3))
-            peak_unit = mem_match.group(4)
-            
-            if current_unit == 'G':
-                current *= 1024
-            if peak_unit == 'G':
-                peak *= 1024
-            
+        if event.memory_mb is not None:
+            current = event.memory_mb
+            peak = event.peak_memory_mb
+            self.current_memory = f"{current:.2f}MB"
+            self.peak_memory = f"{peak:.2f}MB"
             self.memory_label.setText(f"Memory: {current:.2f}MB (Peak: {peak:.2f}MB)")
 
         # Handle scene info
-        scene_match = re.search(r'\| ([^|]+), ([^|]+) \|', line)
-        if scene_match:
-            scene = scene_match.group(1).strip()
-            viewlayer = scene_match.group(2).strip()
-            self.scene_label.setText(f"{scene} - {viewlayer}")
+        if event.scene is not None:
+            self.scene_label.setText(f"{event.scene} - {event.view_layer}")
 
         # Handle render completion
-        if "Finished" in line:
+        if event.finished:
             if self.using_cycles:
                 self.sample_progress.setValue(self.total_samples)
             self.status_label.setText("Frame completed")
 
-    def set_total_frames(self, start_frame, end_frame):
-        """Sets the total number of frames to render"""
+    def set_aggregate_progress(self, progress, eta):
+        """Shows the merged progress of several workers rendering one animation"""
+        self.aggregate_mode = True
+        percent = max(0, min(100, int(progress * 100)))
+        self.progress_bar.setValue(percent)
+        if eta >= 0:
+            eta_str = self.format_duration(eta)
+            self.progress_bar.setFormat(f"{percent}% (all workers, ETA {eta_str})")
+            self.update_remaining_time(eta_str)
+        else:
+            self.progress_bar.setFormat(f"{percent}% (all workers)")
+
+    def set_total_frames(self, start_frame, end_frame, total_frames=None):
+        """Sets the range and the number of frames to render (if not the whole range)"""
         if end_frame >= start_frame:
             self.start_frame = start_frame
             self.end_frame = end_frame
-            self.total_frames = end_frame - start_frame + 1
+            self.total_frames = total_frames or end_frame - start_frame + 1
             self.progress_bar.setRange(0, 100)
             # Initialize with start frame
             self.frame_label.setText(f"Frame: {start_frame}/{end_frame}")
@@ -0,0 +1,270 @@
+from PyQt5.QtWidgets import (QGroupBox, QVBoxLayout, QHBoxLayout, QTableWidget,
+                         QTableWidgetItem, QPushButton, QSpinBox, QLabel, QHeaderView,
+                         QAbstractItemView, QComboBox, QCheckBox)
+from PyQt5.QtCore import Qt, pyqtSignal
+import os
+from ..core.render_queue import JobState
+from ..core.frame_sharding import CONTIGUOUS, INTERLEAVED
+from .job_log_dialog import JobLogDialog
+from .frame_stats_dialog import FrameStatsDialog
+
+
+class QueuePanel(QGroupBox):
+    """Shows the jobs of a RenderQueue with per-job controls"""
+
+    job_selected = pyqtSignal(str)  # job id
+
+    COLUMNS = ["Job", "Status", "Progress", "Priority"]
+
+    def __init__(self, render_queue):
+        super().__init__("Render Queue")
+        self.render_queue = render_queue
+        self.rows = {}  # job id -> table row
+        self.init_ui()
+
+        self.render_queue.job_added.connect(self.add_job)
+        self.render_queue.job_state_changed.connect(self.update_job)
+        self.render_queue.render_progress.connect(self.update_progress)
+        self.render_queue.render_cache_updated.connect(self.update_cache_stats)
+
+        for job in self.render_queue.get_jobs():
+            self.add_job(job.job_id)
+        if self.render_queue.render_cache is not None:
+            self.update_cache_stats(self.render_queue.render_cache.stats())
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        layout.setSpacing(10)
+        layout.setContentsMargins(10, 15, 10, 10)
+
+        # Concurrency controls
+        settings_layout = QHBoxLayout()
+
+        concurrency_label = QLabel("Parallel jobs:")
+        concurrency_label.setStyleSheet("color: #e0e0e0;")
+        self.concurrency_spin = QSpinBox()
+        self.concurrency_spin.setRange(1, 64)
+        self.concurrency_spin.setValue(self.render_queue.max_concurrent)
+        self.concurrency_spin.valueChanged.connect(
+            lambda value: self.render_queue.set_concurrency(max_concurrent=value))
+
+        threads_label = QLabel("Threads per job:")
+        threads_label.setStyleSheet("color: #e0e0e0;")
+        self.threads_spin = QSpinBox()
+        self.threads_spin.setRange(0, 1024)
+        self.threads_spin.setSpecialValueText("Auto")
+        self.threads_spin.setValue(self.render_queue.threads_per_job)
+        self.threads_spin.valueChanged.connect(
+            lambda value: self.render_queue.set_concurrency(threads_per_job=value))
+
+        settings_layout.addWidget(concurrency_label)
+        settings_layout.addWidget(self.concurrency_spin)
+        settings_layout.addSpacing(20)
+        settings_layout.addWidget(threads_label)
+        settings_layout.addWidget(self.threads_spin)
+        settings_layout.addStretch()
+        layout.addLayout(settings_layout)
+
+        # Animation sharding controls
+        sharding_layout = QHBoxLayout()
+
+        shards_label = QLabel("Split animations into:")
+        shards_label.setStyleSheet("color: #e0e0e0;")
+        self.shards_spin = QSpinBox()
+        self.shards_spin.setRange(1, 64)
+        self.shards_spin.setSpecialValueText("Off")
+        self.shards_spin.setSuffix(" workers")
+        self.shards_spin.setToolTip("Render -a animations as several processes running at once, "
+                                    "each pinned to its own CPU subset")
+
+        self.shard_mode_combo = QComboBox()
+        self.shard_mode_combo.addItem("Contiguous chunks", CONTIGUOUS)
+        self.shard_mode_combo.addItem("Interleaved frames", INTERLEAVED)
+
+        sharding_layout.addWidget(shards_label)
+        sharding_layout.addWidget(self.shards_spin)
+        sharding_layout.addWidget(self.shard_mode_combo)
+        sharding_layout.addSpacing(20)
+
+        self.skip_existing_check = QCheckBox("Skip existing frames")
+        self.skip_existing_check.setToolTip("Render only the frames whose output file is missing or incomplete")
+        sharding_layout.addWidget(self.skip_existing_check)
+        sharding_layout.addStretch()
+        layout.addLayout(sharding_layout)
+
+        # Job table
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.table.itemSelectionChanged.connect(self.on_selection_changed)
+        layout.addWidget(self.table)
+
+        # Job controls
+        buttons_layout = QHBoxLayout()
+
+        self.pause_button = QPushButton("Pause")
+        self.pause_button.clicked.connect(lambda: self._apply_to_selected(self.render_queue.pause))
+
+        self.resume_button = QPushButton("Resume")
+        self.resume_button.clicked.connect(lambda: self._apply_to_selected(self.render_queue.resume))
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.clicked.connect(lambda: self._apply_to_selected(self.render_queue.cancel))
+
+        self.priority_up_button = QPushButton("▲")
+        self.priority_up_button.setFixedWidth(40)
+        self.priority_up_button.clicked.connect(lambda: self._change_priority(1))
+
+        self.priority_down_button = QPushButton("▼")
+        self.priority_down_button.setFixedWidth(40)
+        self.priority_down_button.clicked.connect(lambda: self._change_priority(-1))
+
+        self.log_button = QPushButton("Log")
+        self.log_button.clicked.connect(self.show_job_log)
+
+        self.stats_button = QPushButton("Frame Stats")
+        self.stats_button.clicked.connect(self.show_frame_stats)
+
+        clear_button = QPushButton("Clear Finished")
+        clear_button.clicked.connect(self.clear_finished)
+
+        buttons_layout.addWidget(self.pause_button)
+        buttons_layout.addWidget(self.resume_button)
+        buttons_layout.addWidget(self.cancel_button)
+        buttons_layout.addWidget(self.priority_up_button)
+        buttons_layout.addWidget(self.priority_down_button)
+        buttons_layout.addStretch()
+
+        # Render cache hits and misses, hidden while the cache is disabled
+        self.cache_label = QLabel()
+        self.cache_label.setStyleSheet("color: #808080;")
+        self.cache_label.setVisible(False)
+        buttons_layout.addWidget(self.cache_label)
+        buttons_layout.addWidget(self.log_button)
+        buttons_layout.addWidget(self.stats_button)
+        buttons_layout.addWidget(clear_button)
+        layout.addLayout(buttons_layout)
+
+        self.setLayout(layout)
+        self.update_buttons()
+
+    def shard_count(self):
+        """Number of workers animations are split into (1 = no sharding)"""
+        return self.shards_spin.value()
+
+    def shard_mode(self):
+        """Selected frame assignment for sharded animations"""
+        return self.shard_mode_combo.currentData()
+
+    def skip_existing(self):
+        """True when frames already rendered to the output are not rendered again"""
+        return self.skip_existing_check.isChecked()
+
+    def update_cache_stats(self, stats):
+        """Shows the counters of the render cache"""
+        self.cache_label.setText(f"Cache: {stats.hits} hits, {stats.misses} misses, "
+                                 f"{stats.size_bytes / 1024 ** 3:.1f} / {stats.max_bytes / 1024 ** 3:.0f} GB")
+        self.cache_label.setToolTip(f"{stats.entries} frames stored, {stats.stored} added since the cache was created")
+        self.cache_label.setVisible(True)
+
+    def add_job(self, job_id):
+        """Adds a row for a new job"""
+        job = self.render_queue.get_job(job_id)
+        if job is None or job_id in self.rows:
+            return
+
+        row = self.table.rowCount()
+        self.table.insertRow(row)
+        self.rows[job_id] = row
+
+        name_item = QTableWidgetItem(job.name or job_id)
+        name_item.setData(Qt.UserRole, job_id)
+        self.table.setItem(row, 0, name_item)
+        self.table.setItem(row, 1, QTableWidgetItem(job.state))
+        self.table.setItem(row, 2, QTableWidgetItem(f"{int(job.progress * 100)}%"))
+        self.table.setItem(row, 3, QTableWidgetItem(str(job.priority)))
+
+    def update_job(self, job_id, state):
+        """Refreshes the row of a job after a state change"""
+        row = self.rows.get(job_id)
+        job = self.render_queue.get_job(job_id)
+        if row is None or job is None:
+            return
+
+        self.table.item(row, 1).setText(state)
+        self.table.item(row, 2).setText(f"{int(job.progress * 100)}%")
+        self.table.item(row, 3).setText(str(job.priority))
+        self.update_buttons()
+
+    def update_progress(self, job_id, progress):
+        """Refreshes the progress column of a job"""
+        row = self.rows.get(job_id)
+        if row is not None:
+            self.table.item(row, 2).setText(f"{int(progress * 100)}%")
+
+    def selected_job_id(self):
+        """Returns the id of the selected job, or None"""
+        items = self.table.selectedItems()
+        if not items:
+            return None
+        return self.table.item(items[0].row(), 0).data(Qt.UserRole)
+
+    def on_selection_changed(self):
+        self.update_buttons()
+        job_id = self.selected_job_id()
+        if job_id:
+            self.job_selected.emit(job_id)
+
+    def update_buttons(self):
+        """Enables the controls that apply to the selected job"""
+        job_id = self.selected_job_id()
+        job = self.render_queue.get_job(job_id) if job_id else None
+        state = job.state if job else None
+
+        self.pause_button.setEnabled(state in (JobState.PENDING, JobState.RUNNING))
+        self.resume_button.setEnabled(state == JobState.PAUSED)
+        self.cancel_button.setEnabled(state is not None and state not in JobState.FINISHED)
+        self.priority_up_button.setEnabled(state == JobState.PENDING)
+        self.priority_down_button.setEnabled(state == JobState.PENDING)
+        self.log_button.setEnabled(bool(job and job.log_path and os.path.exists(job.log_path)))
+        self.stats_button.setEnabled(bool(job and self.render_queue.get_frame_stats(job_id) is not None))
+
+    def show_job_log(self):
+        """Opens the indexed log of the selected job"""
+        job_id = self.selected_job_id()
+        job = self.render_queue.get_job(job_id) if job_id else None
+        if job and job.log_path and os.path.exists(job.log_path):
+            JobLogDialog(job.log_path, f"Log - {job.name or job.job_id}", self).exec_()
+
+    def show_frame_stats(self):
+        """Opens the per-frame statistics of the selected job"""
+        job_id = self.selected_job_id()
+        job = self.render_queue.get_job(job_id) if job_id else None
+        if job and self.render_queue.get_frame_stats(job_id) is not None:
+            FrameStatsDialog(self.render_queue, job_id, f"Frame Statistics - {job.name or job.job_id}",
+                             self).exec_()
+
+    def clear_finished(self):
+        """Removes finished jobs from the queue and the table"""
+        self.render_queue.clear_finished()
+        self.table.setRowCount(0)
+        self.rows.clear()
+        for job in self.render_queue.get_jobs():
+            self.add_job(job.job_id)
+        self.update_buttons()
+
+    def _apply_to_selected(self, action):
+        job_id = self.selected_job_id()
+        if job_id:
+            action(job_id)
+        self.update_buttons()
+
+    def _change_priority(self, delta):
+        job_id = self.selected_job_id()
+        job = self.render_queue.get_job(job_id) if job_id else None
+        if job and self.render_queue.set_priority(job_id, job.priority + delta):
+            self.update_job(job_id, job.state)
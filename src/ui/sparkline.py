@@ -0,0 +1,43 @@
+from collections import deque
+from PyQt5.QtWidgets import QWidget, QSizePolicy
+from PyQt5.QtGui import QPainter, QPen, QColor, QPolygonF
+from PyQt5.QtCore import Qt, QPointF
+
+
+class Sparkline(QWidget):
+    """Small line chart of the latest values of a series, scaled to its maximum"""
+
+    def __init__(self, capacity=120, color="#eb5e28", parent=None):
+        super().__init__(parent)
+        self.values = deque(maxlen=capacity)
+        self.color = QColor(color)
+        self.setMinimumHeight(30)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+    def add_value(self, value):
+        self.values.append(value)
+        self.update()
+
+    def set_values(self, values):
+        self.values.clear()
+        self.values.extend(values)
+        self.update()
+
+    def clear(self):
+        self.set_values([])
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.fillRect(self.rect(), QColor("#2d2d2d"))
+        if len(self.values) < 2:
+            return
+
+        painter.setRenderHint(QPainter.Antialiasing)
+        width, height = self.width() - 1, self.height() - 3
+        top = max(self.values) or 1.0
+        step = width / (self.values.maxlen - 1)
+        offset = width - step * (len(self.values) - 1)  # Newest value on the right edge
+        points = QPolygonF([QPointF(offset + i * step, 1 + height - value / top * height)
+                            for i, value in enumerate(self.values)])
+        painter.setPen(QPen(self.color, 1.5, Qt.SolidLine))
+        painter.drawPolyline(points)
@@ -0,0 +1,69 @@
+"""
+Reading and writing the JSON files of the application (settings, presets,
+caches and indexes).
+
+Files are written through a temporary file in the same directory, flushed
+to disk and renamed over the original: other instances, readers and a
+crash in the middle see the old file or the new one, never half of it.
+Errors are logged and reported by the return value, so a store that
+cannot save keeps working from memory.
+"""
+
+import json
+import logging
+import os
+import tempfile
+
+
+def write_text_atomic(path, content, what=None):
+    """Writes a file through a temporary file and a rename; returns True on success"""
+    temp_path = None
+    try:
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp',
+                                         dir=directory)
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+        return True
+    except Exception as e:
+        logging.error(f"Error saving {what or path}: {e}")
+        if temp_path and os.path.exists(temp_path):
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+        return False
+
+
+def write_json_atomic(path, data, what=None, indent=4):
+    """Writes data as JSON with write_text_atomic(); returns True on success"""
+    try:
+        content = json.dumps(data, indent=indent, ensure_ascii=False)
+    except Exception as e:
+        logging.error(f"Error saving {what or path}: {e}")
+        return False
+    return write_text_atomic(path, content, what)
+
+
+def read_json(path, what=None):
+    """Parsed content of a JSON file, None when it is missing or unreadable"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logging.error(f"Error loading {what or path}: {e}")
+        return None
+
+
+def drop_oldest(entries, max_entries, age):
+    """Removes the entries with the smallest age(value) beyond max_entries"""
+    if len(entries) > max_entries:
+        oldest = sorted(entries, key=lambda k: age(entries[k]))
+        for k in oldest[:len(entries) - max_entries]:
+            del entries[k]
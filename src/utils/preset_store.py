@@ -0,0 +1,277 @@
+"""
+Preset repository with one JSON file per preset.
+
+    presets/
+        .index.json           name -> file, tags, mtime and size of each preset
+        shot 010.json         {"name": ..., "tags": [...], "blender_path": ..., "parameters": {...}}
+
+File names are the URL-quoted preset names, so names are recovered from a
+directory listing. Listing presets reads only the index; bodies are
+loaded on first use and cached. put() only updates the cache and marks
+the preset dirty; flush() writes the dirty presets, one file each. Save,
+rename and delete never rewrite the other presets (only the small index).
+
+refresh() rescans the directory with os.scandir and merges changes made
+by other instances (for example on a shared network drive): files whose
+mtime or size differs from the index are reloaded, new files are added
+and missing ones dropped, without reading unchanged presets.
+"""
+
+import json
+import logging
+import os
+import threading
+from urllib.parse import quote, unquote
+
+from .json_store import write_json_atomic
+
+INDEX_FILE = '.index.json'
+PRESET_SUFFIX = '.json'
+
+
+def preset_file_name(name):
+    file_name = quote(name, safe=' -_.')
+    # Dot files are reserved for the index and temporary files
+    if file_name.startswith('.'):
+        file_name = '%2E' + file_name[1:]
+    return file_name + PRESET_SUFFIX
+
+
+def preset_name_from_file(file_name):
+    return unquote(file_name[:-len(PRESET_SUFFIX)])
+
+
+class PresetStore:
+    """Index of presets stored one per file, with lazily loaded bodies"""
+
+    def __init__(self, directory, default_presets=None):
+        self.directory = directory
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self._lock = threading.RLock()
+        self._index = {}  # name -> {'file', 'tags', 'mtime', 'size'}
+        self._bodies = {}  # name -> preset dictionary, loaded on demand
+        self._dirty = set()  # Presets changed in memory and not written yet
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_index()
+        # Only files changed since the index was written are read
+        self.refresh()
+        if not self._index and default_presets:
+            self.import_presets(default_presets)
+
+    # Queries
+
+    def names(self):
+        with self._lock:
+            return list(self._index)
+
+    def __contains__(self, name):
+        with self._lock:
+            return name in self._index
+
+    def __len__(self):
+        with self._lock:
+            return len(self._index)
+
+    def tags(self, name):
+        with self._lock:
+            entry = self._index.get(name)
+            return list(entry['tags']) if entry else []
+
+    def find_by_tag(self, tag):
+        with self._lock:
+            return [name for name, entry in self._index.items() if tag in entry['tags']]
+
+    def get(self, name):
+        """Returns the preset body, reading its file the first time"""
+        with self._lock:
+            if name not in self._index:
+                return None
+            body = self._bodies.get(name)
+            if body is None:
+                body = self._read(name)
+                if body is not None:
+                    self._bodies[name] = body
+            return body
+
+    def as_dict(self):
+        """Every preset, loading all the bodies"""
+        return {name: self.get(name) for name in self.names()}
+
+    # Changes
+
+    def put(self, name, preset):
+        """Stores a preset in memory; it is written by the next flush()"""
+        preset = dict(preset)
+        preset.setdefault('name', name)
+        with self._lock:
+            entry = self._index.get(name)
+            if entry is None:
+                entry = {'file': preset_file_name(name), 'mtime': 0, 'size': 0}
+                self._index[name] = entry
+            entry['tags'] = list(preset.get('tags') or [])
+            self._bodies[name] = preset
+            self._dirty.add(name)
+
+    def flush(self):
+        """Writes the presets changed since the last flush, one file each"""
+        with self._lock:
+            if not self._dirty:
+                return True
+            ok = True
+            for name in list(self._dirty):
+                entry = self._index.get(name)
+                body = self._bodies.get(name)
+                if entry is None or body is None:
+                    continue
+                path = os.path.join(self.directory, entry['file'])
+                if write_json_atomic(path, body):
+                    self._index[name] = self._entry(entry['file'], entry['tags'], path)
+                else:
+                    ok = False
+            self._dirty.clear()
+            self._save_index()
+            return ok
+
+    def save(self, name, preset):
+        """Writes one preset file now and updates the index"""
+        self.put(name, preset)
+        return self.flush()
+
+    def delete(self, name):
+        with self._lock:
+            entry = self._index.pop(name, None)
+            if entry is None:
+                return False
+            self._bodies.pop(name, None)
+            self._dirty.discard(name)
+            try:
+                os.remove(os.path.join(self.directory, entry['file']))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logging.error(f"Error deleting preset {name}: {e}")
+            self._save_index()
+        return True
+
+    def rename(self, old_name, new_name):
+        with self._lock:
+            if old_name not in self._index or new_name in self._index:
+                return False
+            body = self.get(old_name)
+            if body is None:
+                return False
+            body = dict(body, name=new_name)
+            old_file = self._index[old_name]['file']
+            new_file = preset_file_name(new_name)
+            new_path = os.path.join(self.directory, new_file)
+            if not write_json_atomic(new_path, body):
+                return False
+            try:
+                os.remove(os.path.join(self.directory, old_file))
+            except OSError:
+                pass
+            del self._index[old_name]
+            self._bodies.pop(old_name, None)
+            self._dirty.discard(old_name)
+            self._bodies[new_name] = body
+            self._index[new_name] = self._entry(new_file, body.get('tags') or [], new_path)
+            self._save_index()
+        return True
+
+    def refresh(self):
+        """
+        Merges the changes made to the directory by other processes
+
+        Returns:
+            (added, changed, removed) lists of preset names
+        """
+        added, changed, removed = [], [], []
+        with self._lock:
+            seen = set()
+            try:
+                entries = [entry for entry in os.scandir(self.directory)
+                           if entry.is_file() and entry.name.endswith(PRESET_SUFFIX)
+                           and not entry.name.startswith('.')]
+            except OSError as e:
+                logging.error(f"Error scanning presets: {e}")
+                return added, changed, removed
+
+            for entry in entries:
+                name = preset_name_from_file(entry.name)
+                seen.add(name)
+                stat = entry.stat()
+                current = self._index.get(name)
+                if current and current['mtime'] == stat.st_mtime and current['size'] == stat.st_size:
+                    continue
+                if name in self._dirty:
+                    # Unsaved local changes win, they are written by the next flush
+                    continue
+
+                self._bodies.pop(name, None)
+                body = self._read_file(entry.path)
+                if body is None:
+                    continue
+                self._bodies[name] = body
+                self._index[name] = {'file': entry.name, 'tags': body.get('tags') or [],
+                                     'mtime': stat.st_mtime, 'size': stat.st_size}
+                (changed if current else added).append(name)
+
+            for name in list(self._index):
+                if name not in seen and name not in self._dirty:
+                    del self._index[name]
+                    self._bodies.pop(name, None)
+                    removed.append(name)
+
+            if added or changed or removed:
+                self._save_index()
+        return added, changed, removed
+
+    def import_presets(self, presets):
+        """Adds presets from a dictionary {name: preset} (e.g. an old presets.json)"""
+        for name, preset in presets.items():
+            if isinstance(preset, dict):
+                self.put(name, preset)
+        self.flush()
+
+    # Internals
+
+    def _entry(self, file_name, tags, path):
+        try:
+            stat = os.stat(path)
+            mtime, size = stat.st_mtime, stat.st_size
+        except OSError:
+            mtime, size = 0, 0
+        return {'file': file_name, 'tags': list(tags), 'mtime': mtime, 'size': size}
+
+    def _read(self, name):
+        entry = self._index[name]
+        return self._read_file(os.path.join(self.directory, entry['file']))
+
+    @staticmethod
+    def _read_file(path):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                body = json.load(f)
+            return body if isinstance(body, dict) else None
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.error(f"Error loading preset {path}: {e}")
+            return None
+
+    def _load_index(self):
+        if not os.path.exists(self.index_path):
+            return False
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self._index = {name: entry for name, entry in index.items()
+                           if isinstance(entry, dict) and 'file' in entry}
+            return True
+        except Exception as e:
+            logging.error(f"Error loading preset index: {e}")
+            return False
+
+    def _save_index(self):
+        write_json_atomic(self.index_path, self._index)
@@ -1,10 +1,37 @@
+import atexit
+import copy
 import json
 import os
 import logging
+import threading
+import time
 from pathlib import Path
+from .json_store import write_text_atomic
+from .preset_store import PresetStore
 
 class SettingsManager:
-    """Manages application settings saving and loading"""
+    """
+    Manages application settings saving and loading
+    
+    Saving is write-behind: save_settings() and save_presets() only mark the
+    file dirty. Dirty files are written SAVE_DELAY seconds after the last
+    change (at most MAX_SAVE_DELAY after the first one), by flush(), and at
+    exit. Each write goes to a temporary file renamed over the original, and
+    files whose content did not change are not rewritten. Concurrent flushes
+    write one at a time, and content older than the last written is dropped.
+    
+    Use SettingsManager.instance() to share one store across the
+    application; subscribe() notifies changes of a top-level key. Values
+    are copied in and out (set_*, get_*), so callers never share the
+    dictionaries being saved. Presets live in a PresetStore (one file per
+    preset) opened on first use.
+    """
+    
+    _instance = None
+    _instance_lock = threading.Lock()
+    
+    SAVE_DELAY = 0.5  # Seconds of inactivity before dirty files are written
+    MAX_SAVE_DELAY = 5.0  # Upper bound while changes keep coming
     
     def __init__(self):
         # Determine settings directory path
@@ -16,18 +43,102 @@ class SettingsManager:
         # Create directory if it doesn't exist
         os.makedirs(self.settings_dir, exist_ok=True)
         
+        self._lock = threading.RLock()
+        self._dirty = set()  # Files waiting to be written
+        self._write_lock = threading.Lock()  # Held while files are written, never with self._lock
+        self._written = {}  # Last content written (or read) per file
+        self._written_version = {}  # Flush that wrote it, per file
+        self._version = 0  # Flushes so far
+        self._first_change = None
+        self._timer = None
+        self._subscribers = {}  # key -> list of callbacks(key, value)
+        
         self.settings_file = os.path.join(self.settings_dir, 'settings.json')
         self.settings = self.load_settings()
 
-        # Add presets file
-        self.presets_file = os.path.join(self.settings_dir, 'presets.json')
-        self.presets = self.load_presets()
+        # Presets are loaded by the first access to self.preset_store
+        self.presets_dir = os.path.join(self.settings_dir, 'presets')
+        self.presets_file = os.path.join(self.settings_dir, 'presets.json')  # Before 0.3, migrated
+        self._preset_store = None
+        
+        atexit.register(self.flush)
     
-    def load_settings(self):
-        """Load settings from JSON file"""
-        default_settings = {
+    @classmethod
+    def instance(cls):
+        """Returns the settings store shared by the whole application"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+    
+    @property
+    def preset_store(self):
+        with self._lock:
+            if self._preset_store is None:
+                self._preset_store = self.load_presets()
+            return self._preset_store
+    
+    @property
+    def presets(self):
+        """Every preset as a dictionary {name: preset} (reads all the preset files)"""
+        return self.preset_store.as_dict()
+    
+    def subscribe(self, key, callback):
+        """Calls callback(key, value) whenever the top-level setting key is changed"""
+        with self._lock:
+            self._subscribers.setdefault(key, []).append(callback)
+    
+    def unsubscribe(self, key, callback):
+        with self._lock:
+            callbacks = self._subscribers.get(key, [])
+            if callback in callbacks:
+                callbacks.remove(callback)
+    
+    def _notify(self, key, value):
+        with self._lock:
+            callbacks = list(self._subscribers.get(key, ()))
+        for callback in callbacks:
+            try:
+                callback(key, value)
+            except Exception as e:
+                logging.error(f"Error in settings subscriber for '{key}': {e}")
+    
+    @staticmethod
+    def default_settings():
+        """Settings used for the keys missing from settings.json"""
+        return {
             'blender_path': '',
             'parameters': {},
+            'output': {
+                'max_refresh_rate': 20,  # Output batches delivered to the UI per second
+                'max_batch_size': 500  # Lines that force an early batch
+            },
+            'executor': {
+                'backend': 'thread',  # 'thread' or 'asyncio'
+                'timeout': 0,  # Seconds before a render is stopped, 0 = no limit (asyncio only)
+                'kill_grace': 10,  # Seconds between terminate and kill (asyncio only)
+                'resource_interval': 1.0,  # Seconds between /proc samples of a render, 0 = off
+                'resource_history': 3600  # Samples kept per job
+            },
+            'render_cache': {
+                'enabled': False,  # Restore unchanged frames instead of rendering them (see core/render_cache.py)
+                'max_size_gb': 20,  # Least recently used frames are evicted beyond this
+                'link': False  # Hard link a cached frame to one output at most (see core/render_cache.py), copy otherwise
+            },
+            'api': {
+                'enabled': False,  # Local HTTP job API (see core/job_server.py)
+                'host': '127.0.0.1',
+                'port': 8765
+            },
+            'updates': {
+                'offline': False,  # Never contact GitHub (render nodes without internet)
+                'check_interval': 86400  # Seconds between automatic update checks
+            },
+            'log': {
+                'capacity': 50000,  # Lines kept in the log view, older ones are spilled to disk
+                'job_logs_max_age_days': 14,  # Logs of jobs no longer in the queue are removed at startup...
+                'job_logs_max_size_mb': 1024  # ...past this age, or oldest first beyond this total size
+            },
             'ui_state': {
                 'log_filters': {
                     'show_info': True,
@@ -37,7 +148,10 @@ class SettingsManager:
                 }
             }
         }
-        
+    
+    def load_settings(self):
+        """Load settings from JSON file"""
+        default_settings = self.default_settings()
         try:
             if os.path.exists(self.settings_file):
                 with open(self.settings_file, 'r', encoding='utf-8') as f:
@@ -49,21 +163,124 @@ class SettingsManager:
         
         return default_settings
     
-    def save_settings(self):
-        """Save settings to JSON file"""
+    def reload_settings(self):
+        """
+        Applies the keys of settings.json changed by another program
+        
+        Keys removed from the file go back to their default, or are dropped
+        (subscribers get None) when they have none.
+        
+        Returns:
+            List of the changed keys (their subscribers are notified)
+        """
         try:
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            logging.error(f"Error saving settings: {e}")
+            with open(self.settings_file, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except OSError as e:
+            logging.error(f"Error loading settings: {e}")
+            return []
+        
+        # Our own write-behind saves come back as change events
+        with self._write_lock:
+            if content == self._written.get(self.settings_file):
+                return []
+        try:
+            saved = json.loads(content)
+        except ValueError as e:
+            logging.error(f"Error loading settings: {e}")
+            return []
+        if not isinstance(saved, dict):
+            logging.error("Error loading settings: not a JSON object")
+            return []
+        
+        defaults = self.default_settings()
+        with self._lock:
+            values = dict(saved)
+            for key in self.settings:
+                if key not in saved:
+                    values[key] = defaults.get(key)
+            changed = [key for key, value in values.items()
+                       if key not in self.settings or self.settings[key] != value]
+            for key in changed:
+                if key in saved or key in defaults:
+                    self.settings[key] = copy.deepcopy(values[key])
+                else:
+                    del self.settings[key]
+        with self._write_lock:
+            self._written[self.settings_file] = content
+        
+        for key in changed:
+            self._notify(key, values[key])
+        return changed
+    
+    def save_settings(self):
+        """Schedules saving settings to JSON file"""
+        self._mark_dirty(self.settings_file)
+    
+    def _mark_dirty(self, path):
+        """Marks a file for the next write and (re)starts the debounce timer"""
+        with self._lock:
+            self._dirty.add(path)
+            now = time.monotonic()
+            if self._first_change is None:
+                self._first_change = now
+            delay = min(self.SAVE_DELAY, max(0.0, self._first_change + self.MAX_SAVE_DELAY - now))
+            
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(delay, self.flush)
+            self._timer.daemon = True
+            self._timer.start()
+    
+    def flush(self):
+        """Writes the dirty files now"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._first_change = None
+            dirty, self._dirty = self._dirty, set()
+            
+            if self.presets_file in dirty:
+                dirty.discard(self.presets_file)
+                self.preset_store.flush()
+            
+            # Serialized under the lock, so a half-updated dictionary is never written
+            self._version += 1
+            version = self._version
+            contents = {}
+            for path in dirty:
+                try:
+                    contents[path] = json.dumps(self.settings, indent=4, ensure_ascii=False)
+                except Exception as e:
+                    logging.error(f"Error serializing {os.path.basename(path)}: {e}")
+                    self._dirty.add(path)  # Retried by the next flush
+        
+        failed = set()
+        with self._write_lock:
+            for path, content in contents.items():
+                # A later flush got here first: its content is newer
+                if self._written_version.get(path, 0) > version or self._written.get(path) == content:
+                    continue
+                if write_text_atomic(path, content, os.path.basename(path)):
+                    self._written[path] = content
+                    self._written_version[path] = version
+                else:
+                    failed.add(path)
+        if failed:
+            with self._lock:
+                self._dirty |= failed  # Retried by the next flush
     
     def get_setting(self, key, default=None):
-        """Get a value from settings"""
-        return self.settings.get(key, default)
+        """Get a copy of a value from settings"""
+        with self._lock:
+            return copy.deepcopy(self.settings.get(key, default))
     
     def set_setting(self, key, value):
-        """Set a value in settings"""
-        self.settings[key] = value
+        """Set a value in settings (a copy is stored)"""
+        with self._lock:
+            self.settings[key] = copy.deepcopy(value)
+        self._notify(key, value)
     
     def get_blender_path(self):
         """Get saved Blender path"""
@@ -71,29 +288,35 @@ class SettingsManager:
     
     def set_blender_path(self, path):
         """Set Blender path"""
-        self.settings['blender_path'] = path
+        with self._lock:
+            self.settings['blender_path'] = path
         self.save_settings()
+        self._notify('blender_path', path)
     
     def get_parameters(self):
-        """Get saved parameters"""
-        return self.settings.get('parameters', {})
+        """Get a copy of the saved parameters"""
+        return self.get_setting('parameters', {})
     
     def set_parameters(self, parameters):
-        """Set parameters"""
-        self.settings['parameters'] = parameters
+        """Set parameters (a copy is stored)"""
+        with self._lock:
+            self.settings['parameters'] = copy.deepcopy(parameters)
         self.save_settings()
+        self._notify('parameters', parameters)
     
     def get_ui_state(self):
-        """Get UI state"""
-        return self.settings.get('ui_state', {})
+        """Get a copy of the UI state"""
+        return self.get_setting('ui_state', {})
     
     def set_ui_state(self, ui_state):
-        """Set UI state"""
-        self.settings['ui_state'] = ui_state
+        """Set UI state (a copy is stored)"""
+        with self._lock:
+            self.settings['ui_state'] = copy.deepcopy(ui_state)
         self.save_settings()
+        self._notify('ui_state', ui_state)
 
     def load_presets(self):
-        """Load presets from JSON file"""
+        """Opens the preset store, importing the presets.json of older versions once"""
         default_presets = {
             'default': {
                 'name': 'Default',
@@ -102,51 +325,58 @@ class SettingsManager:
             }
         }
         
-        try:
-            if os.path.exists(self.presets_file):
+        migrate = not os.path.isdir(self.presets_dir) and os.path.exists(self.presets_file)
+        store = PresetStore(self.presets_dir, None if migrate else default_presets)
+        if migrate:
+            try:
                 with open(self.presets_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-        except Exception as e:
-            logging.error(f"Error loading presets: {e}")
-        
-        return default_presets
+                    store.import_presets(json.load(f))
+                os.replace(self.presets_file, self.presets_file + '.bak')
+            except Exception as e:
+                logging.error(f"Error migrating presets: {e}")
+            if not len(store):
+                store.import_presets(default_presets)
+        return store
     
     def save_presets(self):
-        """Save presets to JSON file"""
-        try:
-            with open(self.presets_file, 'w', encoding='utf-8') as f:
-                json.dump(self.presets, f, indent=4, ensure_ascii=False)
-        except Exception as e:
-            logging.error(f"Error saving presets: {e}")
+        """Schedules writing the presets changed since the last save"""
+        self._mark_dirty(self.presets_file)
+    
+    def reload_presets(self):
+        """
+        Merges preset files changed by other instances
+        
+        Subscribers of 'presets' receive the (added, changed, removed) names.
+        """
+        changes = self.preset_store.refresh()
+        if any(changes):
+            self._notify('presets', changes)
+        return changes
     
     def get_preset_names(self):
         """Return list of available preset names"""
-        return list(self.presets.keys())
+        return self.preset_store.names()
     
     def get_preset(self, name):
         """Get a specific preset"""
-        return self.presets.get(name, None)
+        return self.preset_store.get(name)
     
     def save_as_preset(self, name, settings):
         """Save current settings as a new preset"""
-        self.presets[name] = settings
+        self.preset_store.put(name, settings)
         self.save_presets()
     
     def delete_preset(self, name):
         """Delete a preset"""
-        if name in self.presets and name != 'default':
-            del self.presets[name]
-            self.save_presets()
-            return True
-        return False
+        if name == 'default':
+            return False
+        return self.preset_store.delete(name)
     
     def rename_preset(self, old_name, new_name):
         """Rename a preset"""
-        if old_name in self.presets and old_name != 'default':
-            self.presets[new_name] = self.presets.pop(old_name)
-            self.save_presets()
-            return True
-        return False
+        if old_name == 'default':
+            return False
+        return self.preset_store.rename(old_name, new_name)
 
     def get_all_settings(self):
         """Get all current settings in a savable format"""
@@ -0,0 +1,160 @@
+"""
+Live reload of settings and presets changed on disk by other programs.
+
+Watches the settings directory and its presets folder with watchdog when
+it is installed, or by polling modification times otherwise. Events are
+debounced, then only what changed is reloaded: preset files through
+PresetStore.refresh() and settings.json key by key. Subscribers of the
+SettingsManager are notified ('presets' for preset changes), so the UI
+updates incrementally. Files written by this process are recognized and
+ignored.
+"""
+
+import logging
+import os
+import threading
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+
+class SettingsWatcher:
+    """Reloads settings.json and the preset files when they change on disk"""
+
+    DEBOUNCE_DELAY = 0.3  # Seconds without events before reloading
+    POLL_INTERVAL = 2.0  # Seconds between scans without watchdog
+
+    def __init__(self, settings_manager):
+        self.settings_manager = settings_manager
+        self._lock = threading.Lock()
+        self._pending = set()  # 'settings' and/or 'presets'
+        self._timer = None
+        self._observer = None
+        self._poll_thread = None
+        self._stop = threading.Event()
+
+    def start(self):
+        self._stop.clear()
+        # Opens the preset store, creating the presets folder if needed
+        self.settings_manager.preset_store
+        if HAS_WATCHDOG:
+            try:
+                self._observer = Observer()
+                handler = _EventHandler(self)
+                self._observer.schedule(handler, self.settings_manager.settings_dir, recursive=False)
+                self._observer.schedule(handler, self.settings_manager.presets_dir, recursive=False)
+                self._observer.daemon = True
+                self._observer.start()
+                return
+            except Exception as e:
+                logging.error(f"Unable to watch the settings directory, polling instead: {e}")
+                self._observer = None
+
+        # Taken now, so changes made right after start() are not missed
+        snapshot = self._snapshot()
+        self._poll_thread = threading.Thread(target=self._poll, args=(snapshot,), name="SettingsWatcher",
+                                             daemon=True)
+        self._poll_thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join(timeout=2)
+            self._observer = None
+
+    def file_changed(self, path):
+        """Queues a reload for a changed path (called from the watcher threads)"""
+        kind = self._classify(path)
+        if kind is not None:
+            self._queue(kind)
+
+    def _queue(self, kind):
+        """Debounces reloads of 'settings' or 'presets'"""
+        with self._lock:
+            self._pending.add(kind)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.DEBOUNCE_DELAY, self._reload)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _classify(self, path):
+        manager = self.settings_manager
+        name = os.path.basename(path)
+        if name.startswith('.') or name.endswith('.tmp'):
+            return None  # Index and temporary files of atomic writes
+        if os.path.normpath(path) == os.path.normpath(manager.settings_file):
+            return 'settings'
+        if os.path.normpath(os.path.dirname(path)) == os.path.normpath(manager.presets_dir):
+            return 'presets'
+        return None
+
+    def _reload(self):
+        with self._lock:
+            pending, self._pending = self._pending, set()
+            self._timer = None
+        if self._stop.is_set():
+            return
+        try:
+            if 'settings' in pending:
+                self.settings_manager.reload_settings()
+            if 'presets' in pending:
+                self.settings_manager.reload_presets()
+        except Exception as e:
+            logging.error(f"Error reloading settings: {e}")
+
+    def _poll(self, last):
+        """Fallback without watchdog: compares modification times with the last snapshot"""
+        manager = self.settings_manager
+        while not self._stop.wait(self.POLL_INTERVAL):
+            current = self._snapshot()
+            if current.get(manager.settings_file) != last.get(manager.settings_file):
+                self._queue('settings')
+            if any(current.get(path) != last.get(path) for path in set(current) | set(last)
+                   if path != manager.settings_file):
+                self._queue('presets')
+            last = current
+
+    def _snapshot(self):
+        manager = self.settings_manager
+        snapshot = {}
+        try:
+            stat = os.stat(manager.settings_file)
+            snapshot[manager.settings_file] = (stat.st_mtime, stat.st_size)
+        except OSError:
+            pass
+        try:
+            for entry in os.scandir(manager.presets_dir):
+                if entry.is_file() and not entry.name.startswith('.'):
+                    stat = entry.stat()
+                    snapshot[entry.path] = (stat.st_mtime, stat.st_size)
+        except OSError:
+            pass
+        return snapshot
+
+
+if HAS_WATCHDOG:
+    class _EventHandler(FileSystemEventHandler):
+        """Forwards watchdog events to the SettingsWatcher"""
+
+        def __init__(self, watcher):
+            super().__init__()
+            self.watcher = watcher
+
+        def on_any_event(self, event):
+            if event.is_directory:
+                return
+            self.watcher.file_changed(event.src_path)
+            dest_path = getattr(event, 'dest_path', None)
+            if dest_path:
+                # Atomic writes show up as a move of a temporary file
+                self.watcher.file_changed(dest_path)
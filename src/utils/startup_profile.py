@@ -0,0 +1,75 @@
+"""
+Startup profiling for --profile-startup.
+
+StartupProfile wraps builtins.__import__ to time every module imported
+for the first time (inclusive and self time, so a slow package is not
+blamed on the module that imported it), and records named phases of the
+startup. report() prints both, slowest first.
+"""
+
+import builtins
+import sys
+import time
+
+
+class StartupProfile:
+    """Import times and phase durations of the application startup"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases = []  # (name, seconds since the previous mark)
+        self.imports = {}  # module -> [inclusive seconds, self seconds]
+        self._last_mark = self.started
+        self._stack = []  # Time spent in nested imports, per active import
+        self._original_import = None
+
+    def install(self):
+        if self._original_import is None:
+            self._original_import = builtins.__import__
+            builtins.__import__ = self._import
+
+    def uninstall(self):
+        if self._original_import is not None:
+            builtins.__import__ = self._original_import
+            self._original_import = None
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module = name
+        if level:
+            package = (globals or {}).get('__package__') or ''
+            parts = package.split('.')[:len(package.split('.')) - level + 1]
+            module = '.'.join(part for part in parts + [name] if part)
+        if module in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        self._stack.append(0.0)
+        started = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - started
+            nested = self._stack.pop()
+            if self._stack:
+                self._stack[-1] += elapsed
+            times = self.imports.setdefault(module, [0.0, 0.0])
+            times[0] += elapsed
+            times[1] += elapsed - nested
+
+    def mark(self, phase):
+        """Ends a phase of the startup"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last_mark))
+        self._last_mark = now
+
+    def report(self, top=25, file=None):
+        file = file or sys.stderr
+        total = time.perf_counter() - self.started
+        print(f"Startup: {total * 1000:.1f} ms", file=file)
+        for phase, seconds in self.phases:
+            print(f"  {phase:<32} {seconds * 1000:8.1f} ms", file=file)
+
+        imports = sorted(self.imports.items(), key=lambda item: item[1][1], reverse=True)
+        import_total = sum(times[1] for _, times in imports)
+        print(f"Imports: {len(imports)} modules, {import_total * 1000:.1f} ms (self, inclusive)", file=file)
+        for name, (inclusive, own) in imports[:top]:
+            print(f"  {name:<32} {own * 1000:8.1f} ms {inclusive * 1000:8.1f} ms", file=file)
@@ -1,12 +1,27 @@
-import requests
+import os
 import re
 import logging
+import time
 from typing import Optional, Tuple
 from ..core.version import get_version
+from .json_store import read_json, write_json_atomic
 
 class UpdateChecker:
+    """
+    Checks GitHub for a newer release.
+
+    The last answer is cached in a JSON file with its ETag and the time of
+    the check: within min_interval the cache is used without any request,
+    later requests are conditional (304 Not Modified costs no rate limit).
+    In offline mode (or with BLENDER_RENDER_UI_OFFLINE=1, for render nodes)
+    only the cache is read. The check is blocking: call it from a worker thread.
+    """
     GITHUB_API_URL = "https://api.github.com/repos/Nebula-Studios-Software/Blender-Render-UI/releases/latest"
-    
+    CACHE_FILE_NAME = 'update_check.json'  # In the settings directory
+    OFFLINE_ENV = 'BLENDER_RENDER_UI_OFFLINE'
+    TIMEOUT = 5  # Seconds per request
+    RETRY_INTERVAL = 3600  # Seconds before retrying after a failed request
+
     @staticmethod
     def parse_version(version_str: str) -> tuple:
         """Converte una stringa di versione in una tupla di numeri."""
@@ -14,36 +29,94 @@ class UpdateChecker:
         if match:
             return tuple(map(int, match.groups()))
         return (0, 0, 0)
-    
+
+    @classmethod
+    def is_offline(cls, offline=False) -> bool:
+        return offline or os.environ.get(cls.OFFLINE_ENV, '') not in ('', '0')
+
     @classmethod
-    def check_for_updates(cls) -> Tuple[bool, Optional[str], Optional[str]]:
+    def check_for_updates(cls, cache_file: Optional[str] = None, min_interval: float = 0,
+                          offline: bool = False, url: Optional[str] = None
+                          ) -> Tuple[bool, Optional[str], Optional[str]]:
         """
         Controlla se sono disponibili aggiornamenti.
-        
+
+        Args:
+            cache_file: JSON file with the last answer (None = no cache)
+            min_interval: seconds during which the cached answer is used without a request
+            offline: only read the cache
+            url: release API endpoint (default GITHUB_API_URL)
+
         Returns:
-            Tuple[bool, Optional[str], Optional[str]]: 
+            Tuple[bool, Optional[str], Optional[str]]:
             - bool: True se è disponibile un aggiornamento
             - str: Versione più recente (o None se errore)
             - str: URL di download (o None se errore)
         """
+        release = cls.latest_release(cache_file, min_interval, offline, url)
+        if release is None:
+            return False, None, None
+
+        latest_version, download_url = release
+        update_available = cls.parse_version(latest_version) > cls.parse_version(get_version())
+        return update_available, latest_version, download_url
+
+    @classmethod
+    def latest_release(cls, cache_file=None, min_interval=0, offline=False, url=None):
+        """Returns (version, download_url) of the latest release, or None when unknown"""
+        url = url or cls.GITHUB_API_URL
+        cache = cls._load_cache(cache_file)
+        if cache.get('url') != url:
+            cache = {'url': url}
+        cached = (cache['latest_version'], cache['download_url']) if 'latest_version' in cache else None
+
+        now = time.time()
+        if cls.is_offline(offline):
+            return cached
+        if now - cache.get('checked', 0) < min_interval:
+            return cached
+        if now - cache.get('failed', 0) < min(min_interval, cls.RETRY_INTERVAL):
+            return cached
+
+        # Importato solo qui: requests rallenta l'avvio dell'applicazione
+        import requests
+        headers = {'Accept': 'application/vnd.github+json'}
+        if cached and cache.get('etag'):
+            headers['If-None-Match'] = cache['etag']
         try:
-            response = requests.get(cls.GITHUB_API_URL, timeout=5)
+            response = requests.get(url, headers=headers, timeout=cls.TIMEOUT)
+            if response.status_code == 304 and cached:
+                cache['checked'] = now
+                cls._save_cache(cache_file, cache)
+                return cached
             response.raise_for_status()
-            
+
             release_data = response.json()
             latest_version = release_data['tag_name'].lstrip('v')
             download_url = release_data['html_url']
-            
-            current_version_tuple = cls.parse_version(get_version())
-            latest_version_tuple = cls.parse_version(latest_version)
-            
-            update_available = latest_version_tuple > current_version_tuple
-            
-            return update_available, latest_version, download_url
-            
         except requests.RequestException as e:
             logging.error(f"Errore nel controllo degli aggiornamenti: {e}")
-            return False, None, None
-        except (KeyError, ValueError) as e:
+            cache['failed'] = now
+            cls._save_cache(cache_file, cache)
+            return cached
+        except (KeyError, ValueError, TypeError) as e:
             logging.error(f"Errore nel parsing della risposta GitHub: {e}")
-            return False, None, None
\ No newline at end of file
+            cache['failed'] = now
+            cls._save_cache(cache_file, cache)
+            return cached
+
+        cls._save_cache(cache_file, {'url': url, 'checked': now, 'etag': response.headers.get('ETag'),
+                                     'latest_version': latest_version, 'download_url': download_url})
+        return latest_version, download_url
+
+    @staticmethod
+    def _load_cache(cache_file):
+        if not cache_file:
+            return {}
+        cache = read_json(cache_file, "the update check cache")
+        return cache if isinstance(cache, dict) else {}
+
+    @staticmethod
+    def _save_cache(cache_file, cache):
+        if cache_file:
+            write_json_atomic(cache_file, cache)
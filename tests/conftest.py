@@ -0,0 +1,36 @@
+"""Shared fixtures: a settings directory per test and the fake Blender of the benchmarks."""
+
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('BLENDER_RENDER_UI_HEADLESS', '1')  # Pure-Python signals, PyQt5 is not needed
+
+FAKE_BLENDER = os.path.join(ROOT, 'benchmarks', 'fake_blender.py')
+
+
+@pytest.fixture
+def settings_manager(tmp_path, monkeypatch):
+    """SettingsManager writing to a temporary home directory"""
+    from src.utils.settings_manager import SettingsManager
+
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    monkeypatch.setenv('APPDATA', str(tmp_path / 'home'))
+    manager = SettingsManager()
+    manager.set_blender_path(FAKE_BLENDER)
+    return manager
+
+
+@pytest.fixture
+def fake_blender():
+    return FAKE_BLENDER
+
+
+@pytest.fixture
+def blend_file(tmp_path):
+    path = tmp_path / 'scene.blend'
+    path.write_bytes(b'BLENDER-v300')
+    return str(path)
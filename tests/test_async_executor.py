@@ -0,0 +1,46 @@
+"""Output of the fake Blender read by the asyncio executor."""
+
+import sys
+import threading
+
+from src.core.async_executor import AsyncBlenderExecutor
+
+
+def run(executor, command):
+    """Runs a command to completion, returns (success, output lines)"""
+    lines = []
+    result = []
+    done = threading.Event()
+    executor.output_batch.connect(lambda events: lines.extend(event.line for event in events))
+    executor.render_completed.connect(lambda success, message: (result.append(success), done.set()))
+    assert executor.execute(command, background_process=True)
+    assert done.wait(60)
+    return result[0], lines
+
+
+def test_long_lines_are_truncated(tmp_path, fake_blender):
+    executor = AsyncBlenderExecutor()
+    executor.STREAM_LIMIT = 4096
+    log = tmp_path / 'long.log'
+    log.write_text('before\n' + 'x' * 20000 + '\n' + 'y' * 4096 + '\nafter\n' + 'z' * 10000)
+
+    success, lines = run(executor, [sys.executable, fake_blender, '--fake-replay', str(log)])
+    assert success
+    assert not executor.is_running and executor.process.returncode == 0
+    output = [line for line in lines if not line.startswith(('Starting command', 'Rendering completed'))]
+    notice = f"Output line longer than {executor.STREAM_LIMIT} bytes truncated"
+    assert output == ['before', 'x' * 4096, notice, 'y' * 4096, 'after', 'z' * 4096, notice]
+
+
+def test_process_is_stopped_when_reading_fails(fake_blender, blend_file):
+    executor = AsyncBlenderExecutor(kill_grace=5)
+
+    async def read_output():
+        raise ValueError("unreadable output")
+    executor._read_output = read_output
+
+    success, lines = run(executor, [sys.executable, fake_blender, '--fake-rate', '10',
+                                    '-b', blend_file, '-s', '1', '-e', '100', '-a'])
+    assert not success
+    assert executor.process.returncode is not None
+    assert "Error during process execution: unreadable output" in lines
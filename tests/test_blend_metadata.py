@@ -0,0 +1,63 @@
+"""Metadata probe of .blend files through the fake Blender, and its cache."""
+
+import os
+import sys
+
+import pytest
+
+from src.core.blend_metadata import BlendMetadataCache
+
+
+@pytest.fixture
+def blender(tmp_path, fake_blender):
+    """Fake Blender counting its runs in runs.txt"""
+    runs = tmp_path / 'runs.txt'
+    script = tmp_path / 'blender'
+    script.write_text(f'#!/bin/sh\necho run >> "{runs}"\nexec "{sys.executable}" "{fake_blender}" "$@"\n')
+    script.chmod(0o755)
+
+    def count():
+        return len(runs.read_text().splitlines()) if runs.exists() else 0
+    return str(script), count
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="shell script stand-in for Blender")
+def test_cache_hit_does_not_run_blender(tmp_path, blender, blend_file):
+    blender_path, runs = blender
+    cache_file = str(tmp_path / 'blend_metadata.json')
+
+    metadata = BlendMetadataCache(cache_file).probe(blender_path, blend_file)
+    assert metadata['scenes']
+    assert runs() == 1
+
+    # Same process and a new one reading the cache file
+    assert BlendMetadataCache(cache_file).probe(blender_path, blend_file) == metadata
+    cache = BlendMetadataCache(cache_file)
+    assert cache.probe(blender_path, blend_file) == metadata
+    assert cache.probe(blender_path, blend_file) == metadata
+    assert runs() == 1
+
+
+@pytest.mark.skipif(os.name == 'nt', reason="shell script stand-in for Blender")
+def test_modified_blend_is_probed_again(tmp_path, blender, blend_file):
+    blender_path, runs = blender
+    cache = BlendMetadataCache(str(tmp_path / 'blend_metadata.json'))
+    cache.probe(blender_path, blend_file)
+
+    stat = os.stat(blend_file)
+    os.utime(blend_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert cache.get(blend_file) is None
+    cache.probe(blender_path, blend_file)
+    assert runs() == 2
+
+    cache.probe(blender_path, blend_file)
+    assert runs() == 2
+
+
+def test_one_instance_per_settings_directory(settings_manager, tmp_path):
+    from src.core.render_queue import RenderQueue
+
+    cache = BlendMetadataCache.instance(settings_manager.settings_dir)
+    assert BlendMetadataCache.instance(settings_manager.settings_dir + os.sep) is cache
+    assert RenderQueue(settings_manager).metadata_cache is cache
+    assert BlendMetadataCache.instance(str(tmp_path / 'other')) is not cache
@@ -0,0 +1,23 @@
+"""Frames of RenderCommand.from_argv()."""
+
+from src.core.command_line import RenderCommand
+from src.core.frame_set import FrameSet
+
+
+def test_animation_with_range():
+    command = RenderCommand.from_argv(['blender', '-b', 'a.blend', '-s', '3', '-e', '9', '-j', '2', '-a'])
+    assert command.frames == FrameSet.from_range(3, 9, 2)
+    assert command.frame_count == 4
+
+
+def test_animation_without_range_has_unknown_frames():
+    for argv in (['blender', '-b', 'a.blend', '-a'],
+                 ['blender', '-b', 'a.blend', '-s', '10', '-a'],
+                 ['blender', '-b', 'a.blend', '-e', '10', '-a']):
+        assert RenderCommand.from_argv(argv).frames is None, argv
+
+
+def test_frame_list():
+    command = RenderCommand.from_argv(['blender', '-b', 'a.blend', '-f', '1,3..5'])
+    assert list(command.frames) == [1, 3, 4, 5]
+    assert (command.start_frame, command.end_frame) == (1, 5)
@@ -0,0 +1,91 @@
+"""Progress and remaining time estimated from frame completions."""
+
+import pytest
+
+from src.core.eta import SAMPLING_WEIGHT, EtaEstimator
+from src.core.output_parser import parse_line
+
+
+def render_frame(estimator, frame, start, duration, samples=4):
+    """Feeds the output of one frame rendered from start to start + duration"""
+    for sample in range(1, samples + 1):
+        estimator.update(parse_line(f"Fra:{frame} Mem:10M (Peak 12M) | Scene, ViewLayer | Sample {sample}/{samples}"),
+                         start + duration * sample / (samples + 1))
+    estimator.update(parse_line(f"Saved: '/tmp/frame_{frame:04d}.png'"), start + duration)
+    return start + duration
+
+
+def test_constant_frames():
+    estimator = EtaEstimator(10, clock=lambda: 0.0)
+    assert estimator.estimate(0.0).eta is None  # Nothing measured yet
+    now = 0.0
+    for frame in range(1, 5):
+        now = render_frame(estimator, frame, now, 10.0)
+    estimate = estimator.estimate(now)
+    assert estimate.frames_done == 4
+    assert estimate.fraction == pytest.approx(0.4)
+    assert estimate.seconds_per_frame == pytest.approx(10.0)
+    assert estimate.eta == pytest.approx(60.0)
+    assert estimate.eta_low == pytest.approx(60.0) and estimate.eta_high == pytest.approx(60.0)
+    # Counts down between updates
+    assert estimator.estimate(now + 4.0).eta == pytest.approx(56.0)
+
+
+def test_progress_inside_a_frame():
+    estimator = EtaEstimator(4, clock=lambda: 0.0)
+    estimator.update(parse_line("Fra:1 Mem:10M (Peak 12M) | Scene, ViewLayer | Sample 32/64"), 5.0)
+    assert estimator.fraction() == pytest.approx(SAMPLING_WEIGHT * 0.5 / 4)
+    # The first frame is projected from its own progress
+    assert estimator.estimate(5.0).eta == pytest.approx(5.0 / (SAMPLING_WEIGHT * 0.5) * 4 - 5.0)
+
+
+def test_ewma_follows_heavier_frames():
+    estimator = EtaEstimator(100, alpha=0.3, clock=lambda: 0.0)
+    now = 0.0
+    for frame in range(1, 11):
+        now = render_frame(estimator, frame, now, 10.0)
+    assert estimator.mean == pytest.approx(10.0)
+    errors = []
+    for frame in range(11, 21):
+        now = render_frame(estimator, frame, now, 20.0)
+        errors.append(20.0 - estimator.mean)
+    # The error shrinks by (1 - alpha) per frame
+    assert errors == pytest.approx([10.0 * 0.7 ** n for n in range(1, 11)])
+    assert errors[-1] < 0.3
+
+
+def test_interval_bounds():
+    estimator = EtaEstimator(50, clock=lambda: 0.0)
+    now = 0.0
+    widths = []
+    for frame, duration in enumerate([8.0, 12.0, 9.0, 11.0, 10.0, 14.0, 6.0, 10.0], 1):
+        now = render_frame(estimator, frame, now, duration)
+        estimate = estimator.estimate(now)
+        if frame == 1:
+            assert estimate.eta_low is None and estimate.eta_high is None
+            continue
+        assert 0.0 <= estimate.eta_low <= estimate.eta <= estimate.eta_high
+        widths.append(estimate.eta_high - estimate.eta_low)
+    assert all(width > 0 for width in widths)
+    # Current frame overdue: only the frames after it remain
+    late = estimator.estimate(now + 1e6)
+    assert late.eta == pytest.approx(41 * estimator.mean)
+    assert 0.0 <= late.eta_low <= late.eta <= late.eta_high
+
+
+def test_finished_render():
+    estimator = EtaEstimator(2, clock=lambda: 0.0)
+    now = render_frame(estimator, 1, 0.0, 3.0)
+    now = render_frame(estimator, 2, now, 3.0)
+    estimate = estimator.estimate(now + 10.0)
+    assert (estimate.fraction, estimate.frames_done, estimate.eta) == (1.0, 2, 0.0)
+    assert (estimate.eta_low, estimate.eta_high) == (0.0, 0.0)
+
+
+def test_frames_without_saved_lines():
+    # Without file output the next frame completes the previous one
+    estimator = EtaEstimator(3, clock=lambda: 0.0)
+    for frame, now in ((1, 0.0), (2, 5.0), (3, 10.0)):
+        estimator.update(parse_line(f"Fra:{frame} Mem:10M (Peak 12M) | Scene, ViewLayer | Sample 1/1"), now)
+    assert estimator.frames_done == 2
+    assert estimator.mean == pytest.approx(5.0)
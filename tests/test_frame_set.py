@@ -0,0 +1,86 @@
+"""Parsing and set operations of -f frame sets."""
+
+import pytest
+
+from src.core.frame_set import FrameSet, FrameSpecError
+
+
+@pytest.mark.parametrize('spec, frames', [
+    ('7', [7]),
+    ('1,3,5', [1, 3, 5]),
+    ('1..4', [1, 2, 3, 4]),
+    ('1-4', [1, 2, 3, 4]),
+    ('3..3,1', [1, 3]),
+    ('1..3,2..5,9', [1, 2, 3, 4, 5, 9]),
+    (' 1 , 2 ', [1, 2]),
+])
+def test_parse(spec, frames):
+    assert list(FrameSet.parse(spec)) == frames
+
+
+def test_parse_relative_frames():
+    # Scene range 10..50
+    assert list(FrameSet.parse('+2', 10, 50)) == [12]
+    assert list(FrameSet.parse('-2', 10, 50)) == [48]
+    assert list(FrameSet.parse('+0..+2,-1..-0', 10, 50)) == [10, 11, 12, 49, 50]
+    assert FrameSet.is_relative('1,+2') and FrameSet.is_relative('-3..5')
+    assert not FrameSet.is_relative('1..5,1-3')
+    with pytest.raises(FrameSpecError):
+        FrameSet.parse('+2')
+
+
+@pytest.mark.parametrize('spec', ['', 'a', '1..b', '5..1', '5-1', '1,,2', '1...3'])
+def test_parse_errors(spec):
+    with pytest.raises(FrameSpecError):
+        FrameSet.parse(spec)
+
+
+@pytest.mark.parametrize('spec, blender', [
+    ('1', '1'),
+    ('1..100000', '1..100000'),
+    ('1,3,5..10,12', '1,3,5..10,12'),
+    ('1-3,4,6-6', '1..4,6'),
+])
+def test_to_blender_round_trip(spec, blender):
+    frame_set = FrameSet.parse(spec)
+    assert frame_set.to_blender() == blender
+    assert FrameSet.parse(blender) == frame_set
+
+
+def test_compact_storage():
+    assert FrameSet.parse('1..100000').interval_count == 1
+    assert len(FrameSet.parse('1..100000')) == 100000
+    assert FrameSet.parse('1..3,4,5..6').interval_count == 1
+    stepped = FrameSet.from_range(1, 10, 3)
+    assert list(stepped) == [1, 4, 7, 10]
+    assert stepped.to_blender() == '1,4,7,10'
+    assert FrameSet.from_range(1, 10) == FrameSet.parse('1..10')
+
+
+def test_set_operations():
+    a = FrameSet.parse('1..10,20..30')
+    b = FrameSet.parse('5..25')
+    assert (a | b) == FrameSet.parse('1..30')
+    assert (a - b) == FrameSet.parse('1..4,26..30')
+    assert (a & b) == FrameSet.parse('5..10,20..25')
+    assert (b - a) == FrameSet.parse('11..19')
+    assert not (a - a) and len(a - a) == 0
+    assert (a | FrameSet()) == a and not (a & FrameSet())
+    stepped = FrameSet.from_range(1, 9, 2)
+    assert (stepped | FrameSet.from_range(2, 8, 2)) == FrameSet.parse('1..9')
+    assert list(stepped - FrameSet.parse('3..7')) == [1, 9]
+    assert 5 in a and 15 not in a and 0 not in a and 31 not in a
+    assert (a.first, a.last) == (1, 30)
+
+
+def test_split():
+    frames = FrameSet.parse('1..10,20..22')
+    parts = frames.split(3)
+    assert [list(part) for part in parts] == [[1, 2, 3, 4, 5], [6, 7, 8, 9], [10, 20, 21, 22]]
+    assert FrameSet().split(4) == []
+    assert len(FrameSet.parse('1,2').split(5)) == 2
+    union = FrameSet()
+    for part in FrameSet.from_range(1, 99, 7).split(4):
+        assert not (union & part)
+        union = union | part
+    assert union == FrameSet.from_range(1, 99, 7)
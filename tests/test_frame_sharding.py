@@ -0,0 +1,64 @@
+"""Splitting animations across workers and pinning them to disjoint CPUs."""
+
+import pytest
+
+from src.core.frame_sharding import (CONTIGUOUS, INTERLEAVED, FrameShard, assign_cpu_subsets, shard_command,
+                                     split_frame_range)
+
+
+def frames(shard):
+    return list(range(shard.start, shard.end + 1, shard.step))
+
+
+@pytest.mark.parametrize('start, end, step, shards', [
+    (1, 250, 1, 4), (1, 10, 1, 3), (5, 5, 1, 4), (1, 100, 3, 7), (-10, 10, 2, 5), (1, 3, 1, 8),
+])
+@pytest.mark.parametrize('mode', [CONTIGUOUS, INTERLEAVED])
+def test_every_frame_rendered_once(start, end, step, shards, mode):
+    result = split_frame_range(start, end, shards, mode, step)
+    rendered = sorted(frame for shard in result for frame in frames(shard))
+    assert rendered == list(range(start, end + 1, step))
+    assert 1 <= len(result) <= shards
+    assert all(shard.frame_count > 0 for shard in result)
+    counts = [shard.frame_count for shard in result]
+    assert max(counts) - min(counts) <= 1
+
+
+def test_contiguous_chunks():
+    result = split_frame_range(1, 10, 3, CONTIGUOUS)
+    assert [(shard.start, shard.end, shard.step) for shard in result] == [(1, 4, 1), (5, 7, 1), (8, 10, 1)]
+    assert [frames(shard) for shard in split_frame_range(1, 11, 2, CONTIGUOUS, step=2)] == \
+        [[1, 3, 5], [7, 9, 11]]
+
+
+def test_interleaved_workers():
+    result = split_frame_range(1, 10, 3, INTERLEAVED)
+    assert [(shard.start, shard.step) for shard in result] == [(1, 3), (2, 3), (3, 3)]
+    assert [frames(shard) for shard in result] == [[1, 4, 7, 10], [2, 5, 8], [3, 6, 9]]
+
+
+def test_empty_range():
+    assert split_frame_range(10, 1, 4) == []
+
+
+def test_disjoint_cpus():
+    shards = assign_cpu_subsets(split_frame_range(1, 100, 3), cpus=range(8))
+    assert [shard.cpus for shard in shards] == [[0, 1, 2], [3, 4, 5], [6, 7]]
+    shards = assign_cpu_subsets(split_frame_range(1, 100, 4), cpus=[2, 3, 6, 7])
+    assert [shard.cpus for shard in shards] == [[2], [3], [6], [7]]
+    # Fewer CPUs than workers: nothing is pinned
+    assert all(shard.cpus is None for shard in assign_cpu_subsets(split_frame_range(1, 100, 4), cpus=[0, 1]))
+
+
+def test_available_cpus_are_split():
+    shards = assign_cpu_subsets(split_frame_range(1, 100, 1))
+    assigned = shards[0].cpus
+    assert assigned and len(set(assigned)) == len(assigned)
+
+
+def test_shard_command():
+    command = ['blender', '-b', 'scene.blend', '-s', '1', '-e', '250', '-j', '2', '-a', '-F', 'PNG']
+    assert shard_command(command, FrameShard(5, 99, 6)) == \
+        ['blender', '-b', 'scene.blend', '-s', '5', '-e', '99', '-j', '6', '-a', '-F', 'PNG']
+    assert shard_command(['blender', '-b', 'scene.blend', '-a'], FrameShard(1, 10)) == \
+        ['blender', '-b', 'scene.blend', '-s', '1', '-e', '10', '-a']
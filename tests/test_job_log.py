@@ -0,0 +1,60 @@
+"""Removal and pruning of per-job logs."""
+
+import os
+import time
+
+from src.core.job_log import index_path_for, prune_job_logs
+from src.core.render_queue import JobState, RenderQueue
+
+
+def make_log(logs_dir, name, size=10, age=0):
+    log_path = os.path.join(logs_dir, f"{name}.log")
+    for path in (log_path, index_path_for(log_path)):
+        with open(path, 'wb') as f:
+            f.write(b'x' * size)
+        mtime = time.time() - age
+        os.utime(path, (mtime, mtime))
+    return log_path
+
+
+def test_prune_by_age(tmp_path):
+    old = make_log(str(tmp_path), 'old', age=3600)
+    kept = make_log(str(tmp_path), 'kept', age=3600)
+    recent = make_log(str(tmp_path), 'recent')
+    assert prune_job_logs(str(tmp_path), [kept], max_age=60) == 1
+    assert not os.path.exists(old) and not os.path.exists(index_path_for(old))
+    assert os.path.exists(kept) and os.path.exists(recent)
+
+
+def test_prune_by_size(tmp_path):
+    logs = [make_log(str(tmp_path), f"job{i}", size=100, age=10 - i) for i in range(5)]
+    # 200 bytes per log with its index: the two oldest go
+    assert prune_job_logs(str(tmp_path), max_age=3600, max_bytes=600) == 2
+    assert [os.path.exists(log) for log in logs] == [False, False, True, True, True]
+
+
+def test_prune_missing_directory(tmp_path):
+    assert prune_job_logs(str(tmp_path / 'missing')) == 0
+
+
+def test_clear_finished_removes_logs(settings_manager):
+    queue = RenderQueue(settings_manager)
+    finished = queue.submit(['blender', '-b'], start=False)
+    paused = queue.submit(['blender', '-b'], start=False)
+    os.makedirs(queue.logs_dir)
+    for job_id in (finished, paused):
+        make_log(queue.logs_dir, job_id)
+    queue.get_job(finished).state = JobState.COMPLETED
+
+    queue.clear_finished()
+    assert sorted(os.listdir(queue.logs_dir)) == [f"{paused}.log", f"{paused}.log.idx"]
+
+
+def test_restore_prunes_logs_of_forgotten_jobs(settings_manager):
+    settings_manager.set_setting('log', {'job_logs_max_age_days': 1})
+    queue = RenderQueue(settings_manager)
+    os.makedirs(queue.logs_dir)
+    make_log(queue.logs_dir, 'forgotten', age=2 * 86400)
+    make_log(queue.logs_dir, 'yesterday', age=3600)
+    queue.restore()
+    assert sorted(os.listdir(queue.logs_dir)) == ['yesterday.log', 'yesterday.log.idx']
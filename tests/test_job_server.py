@@ -0,0 +1,114 @@
+"""Access checks of the local job API, against a server on a free localhost port."""
+
+import http.client
+import json
+import os
+import stat
+
+import pytest
+
+from src.core.job_server import JobServer, is_loopback
+from src.core.render_queue import RenderQueue
+
+
+@pytest.fixture
+def server(settings_manager):
+    queue = RenderQueue(settings_manager)
+    job_server = JobServer(queue, settings_manager, '127.0.0.1', 0)
+    job_server.start()
+    yield job_server
+    queue.cancel_all()
+    job_server.stop()
+
+
+def request(server, method, path, body=None, headers=None, token=True):
+    host, port = server.httpd.server_address[:2]
+    connection = http.client.HTTPConnection(host, port, timeout=10)
+    headers = dict(headers or {})
+    if token:
+        headers.setdefault('Authorization', f"Bearer {server.token}")
+    if body is not None and not isinstance(body, bytes):
+        body = json.dumps(body).encode('utf-8')
+        headers.setdefault('Content-Type', 'application/json')
+    try:
+        connection.request(method, path, body, headers)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b'null')
+    finally:
+        connection.close()
+
+
+def render_spec(blend_file):
+    return {'parameters': {'blend_file': blend_file, '-b': True, '-f': '1'}, 'cache': False}
+
+
+def test_loopback_hosts():
+    for host in ('127.0.0.1', '127.0.0.1:8765', 'localhost:80', '[::1]:8765', '::1', 'LOCALHOST'):
+        assert is_loopback(host), host
+    for host in (None, '', 'evil.example', 'evil.example:8765', '192.168.1.2', '127.0.0.1.evil.example'):
+        assert not is_loopback(host), host
+
+
+def test_token_file(server):
+    mode = stat.S_IMODE(os.stat(server.token_file).st_mode)
+    assert mode & 0o077 == 0
+    with open(server.token_file, encoding='utf-8') as f:
+        assert f.read().strip() == server.token
+
+
+def test_token_file_removed_on_stop(settings_manager):
+    job_server = JobServer(RenderQueue(settings_manager), settings_manager, '127.0.0.1', 0)
+    assert os.path.exists(job_server.token_file)
+    job_server.start()
+    job_server.stop()
+    assert not os.path.exists(job_server.token_file)
+
+
+def test_token_required(server):
+    assert request(server, 'GET', '/api/jobs', token=False)[0] == 401
+    assert request(server, 'GET', '/api/jobs', headers={'Authorization': 'Bearer wrong'})[0] == 401
+    assert request(server, 'GET', '/api/jobs') == (200, [])
+    assert request(server, 'GET', f"/api/jobs?token={server.token}", token=False) == (200, [])
+
+
+def test_foreign_host_refused(server):
+    # What a browser sends after DNS rebinding evil.example to 127.0.0.1
+    assert request(server, 'GET', '/api/jobs', headers={'Host': 'evil.example:8765'})[0] == 403
+
+
+def test_foreign_origin_refused(server, blend_file):
+    for origin in ('http://evil.example', 'null', 'file://'):
+        status, _ = request(server, 'POST', '/api/jobs', render_spec(blend_file), headers={'Origin': origin})
+        assert status == 403, origin
+    assert server.render_queue.get_jobs() == []
+
+
+def test_json_content_type_required(server, blend_file):
+    body = json.dumps(render_spec(blend_file)).encode('utf-8')
+    for content_type in (None, 'text/plain', 'application/x-www-form-urlencoded'):
+        headers = {'Content-Type': content_type} if content_type else {}
+        assert request(server, 'POST', '/api/jobs', body, headers)[0] == 415, content_type
+    assert server.render_queue.get_jobs() == []
+
+
+@pytest.mark.parametrize('spec', [
+    {'blender_path': '/bin/sh'},
+    {'parameters': {'-P': '/tmp/script.py'}},
+    {'parameters': {'--python-expr': 'import os'}},
+])
+def test_remote_specs_cannot_run_code(server, blend_file, spec):
+    full_spec = render_spec(blend_file)
+    full_spec.update({key: value for key, value in spec.items() if key != 'parameters'})
+    full_spec['parameters'].update(spec.get('parameters', {}))
+    status, body = request(server, 'POST', '/api/jobs', full_spec)
+    assert status == 400
+    assert 'remotely' in body['error']
+    assert server.render_queue.get_jobs() == []
+
+
+def test_submit(server, blend_file):
+    status, body = request(server, 'POST', '/api/jobs', render_spec(blend_file),
+                           headers={'Origin': 'http://localhost:8765'})
+    assert status == 201
+    assert [job['id'] for job in body['jobs']] == [body['id']]
+    assert body['jobs'][0]['command'][0] == server.settings_manager.get_blender_path()
@@ -0,0 +1,36 @@
+"""Atomic writes and tolerant reads of the JSON stores."""
+
+import os
+
+from src.utils.json_store import drop_oldest, read_json, write_json_atomic
+
+
+def test_write_replaces_the_file(tmp_path):
+    path = str(tmp_path / 'store' / 'data.json')
+    assert write_json_atomic(path, {'a': 1})
+    assert write_json_atomic(path, {'a': 2}, indent=None)
+    assert read_json(path) == {'a': 2}
+    assert os.listdir(tmp_path / 'store') == ['data.json']
+
+
+def test_failed_write_keeps_the_old_file(tmp_path):
+    path = str(tmp_path / 'data.json')
+    write_json_atomic(path, {'a': 1})
+    assert not write_json_atomic(path, {'a': object()})
+    assert not write_json_atomic(str(tmp_path / 'data.json' / 'nested.json'), {})
+    assert read_json(path) == {'a': 1}
+    assert os.listdir(tmp_path) == ['data.json']
+
+
+def test_unreadable_files(tmp_path):
+    assert read_json(str(tmp_path / 'missing.json')) is None
+    (tmp_path / 'broken.json').write_text('{"a": ')
+    assert read_json(str(tmp_path / 'broken.json')) is None
+
+
+def test_drop_oldest():
+    entries = {name: {'used': used} for name, used in (('a', 3), ('b', 1), ('c', 2))}
+    drop_oldest(entries, 2, lambda entry: entry['used'])
+    assert sorted(entries) == ['a', 'c']
+    drop_oldest(entries, 5, lambda entry: entry['used'])
+    assert sorted(entries) == ['a', 'c']
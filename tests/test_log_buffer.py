@@ -0,0 +1,31 @@
+"""Spill files of the log ring buffer."""
+
+import os
+import time
+
+from src.core.log_buffer import LogRingBuffer, make_record, remove_stale_spill_files
+
+
+def test_spill_file_removed_on_close(tmp_path):
+    spill_path = str(tmp_path / 'logs' / 'log-view-1.log')
+    buffer = LogRingBuffer(2, spill_path)
+    buffer.extend([make_record('12:00:00', 'INFO', f"line {i}") for i in range(5)])
+    assert buffer.spilled_count == 3
+    with open(spill_path, encoding='utf-8') as f:
+        assert len(f.read().splitlines()) == 3
+
+    buffer.close(remove=True)
+    assert not os.path.exists(spill_path)
+    buffer.close(remove=True)  # Closing twice is harmless
+
+
+def test_stale_spill_files_removed(tmp_path):
+    stale, current, other = (tmp_path / name for name in ('log-view-1.log', 'log-view-2.log', 'app.log'))
+    for path in (stale, current, other):
+        path.write_text('line\n')
+    old = time.time() - 2 * 86400
+    for path in (stale, other):
+        os.utime(path, (old, old))
+
+    remove_stale_spill_files(str(tmp_path), 'log-view-', 86400)
+    assert sorted(os.listdir(tmp_path)) == ['app.log', 'log-view-2.log']
@@ -0,0 +1,32 @@
+"""Resuming renders from the files already in the output directory."""
+
+import pytest
+
+from src.core.command_line import RenderCommand
+from src.core.output_manifest import OutputManifest, OutputPatternError, resume_command
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00\x00\x00\x00IEND\xaeB`\x82'
+
+
+def animation(tmp_path, *range_args):
+    return RenderCommand.from_argv(['blender', '-b', 'a.blend', '-o', str(tmp_path / 'out' / 'frame_####'),
+                                    '-F', 'PNG', *range_args, '-a'])
+
+
+def test_resume_skips_complete_frames(tmp_path):
+    (tmp_path / 'out').mkdir()
+    for frame in (1, 2, 4):
+        (tmp_path / 'out' / f'frame_{frame:04d}.png').write_bytes(PNG)
+    (tmp_path / 'out' / 'frame_0005.png').write_bytes(b'')
+
+    manifest = OutputManifest(str(tmp_path / 'manifest.json'))
+    command, done = resume_command(animation(tmp_path, '-s', '1', '-e', '5'), manifest)
+    assert list(done) == [1, 2, 4]
+    assert list(command.frames) == [3, 5]
+
+
+def test_resume_without_frame_range(tmp_path):
+    manifest = OutputManifest(str(tmp_path / 'manifest.json'))
+    for range_args in ((), ('-s', '1'), ('-e', '5')):
+        with pytest.raises(OutputPatternError, match='pass -s/-e'):
+            resume_command(animation(tmp_path, *range_args), manifest)
@@ -0,0 +1,66 @@
+"""Events parsed from sample Blender output lines."""
+
+import pytest
+
+from src.core.output_parser import (LEVEL_ERROR, LEVEL_FRAME, LEVEL_INFO, LEVEL_SUCCESS, LEVEL_WARNING,
+                                    parse_line)
+
+
+def test_cycles_progress_line():
+    event = parse_line("Fra:10 Mem:8.40M (Peak 1.50G) | Time:00:00.12 | Mem:0.00M, Peak:0.00M | "
+                       "Scene, ViewLayer | Sample 10/128")
+    assert event.level == LEVEL_FRAME
+    assert event.frame == 10
+    assert (event.sample, event.total_samples) == (10, 128)
+    assert event.memory_mb == pytest.approx(8.4)
+    assert event.peak_memory_mb == pytest.approx(1.5 * 1024)
+    assert (event.scene, event.view_layer) == ('Scene', 'ViewLayer')
+    assert event.tile is None and event.saved_path is None and not event.finished
+
+
+def test_eevee_samples():
+    event = parse_line("Fra:1 Mem:120.00M (Peak 150.00M) | Time:00:01.00 | Scene, View Layer | "
+                       "Rendering 12 / 64 samples")
+    assert (event.frame, event.sample, event.total_samples) == (1, 12, 64)
+    assert event.view_layer == 'View Layer'
+
+
+@pytest.mark.parametrize('line, tile, total', [
+    ("Fra:3 Mem:10M (Peak 12M) | Time:00:04.00 | Scene, ViewLayer | Path Tracing Tile 2/4, Sample 8/64", 2, 4),
+    ("Fra:3 Mem:10M (Peak 12M) | Time:00:05.00 | Scene, ViewLayer | Rendered 1/4 Tiles", 2, 4),
+    ("Fra:3 Mem:10M (Peak 12M) | Time:00:09.00 | Scene, ViewLayer | Rendered 4/4 Tiles", 4, 4),
+])
+def test_tiles(line, tile, total):
+    event = parse_line(line)
+    assert (event.tile, event.total_tiles) == (tile, total)
+
+
+def test_saved_frame_and_times():
+    saved = parse_line("Saved: '/tmp/render/frame_0010.png'")
+    assert saved.level == LEVEL_SUCCESS
+    assert saved.saved_path == '/tmp/render/frame_0010.png'
+
+    times = parse_line(" Time: 01:02:03.50 (Saving: 00:00.25)")
+    assert times.render_time == pytest.approx(3723.5)
+    assert times.saving_time == pytest.approx(0.25)
+
+
+def test_compositing_and_finished():
+    event = parse_line("Fra:5 Mem:10M (Peak 12M) | Time:00:02.00 | Compositing | Tile 1-4")
+    assert event.compositing == 'Tile 1-4'
+    assert parse_line("Fra:5 Mem:10M (Peak 12M) | Time:00:02.00 | Compositing").compositing == ''
+    assert parse_line("Fra:5 Mem:10M (Peak 12M) | Time:00:02.10 | Finished").finished
+
+
+@pytest.mark.parametrize('line, level', [
+    ("Error: Cannot read file '/tmp/missing.blend'", LEVEL_ERROR),
+    ("ERROR (bke.modifier): unknown modifier", LEVEL_ERROR),
+    ("Warning: 1 unknown node", LEVEL_WARNING),
+    ("Blender 4.2.0 (hash a51f293548ad built 2024-07-16)", LEVEL_INFO),
+    ("Read blend: '/tmp/scene.blend'", LEVEL_INFO),
+])
+def test_levels(line, level):
+    event = parse_line(line)
+    assert event.level == level
+    assert event.is_error == (level == LEVEL_ERROR)
+    assert event.frame is None and event.sample is None
@@ -0,0 +1,104 @@
+"""Presets stored one file each, and the index recovered from the directory."""
+
+import json
+import os
+
+from src.utils.preset_store import INDEX_FILE, PresetStore, preset_file_name, preset_name_from_file
+
+
+def files(directory):
+    return sorted(os.listdir(directory))
+
+
+def write_preset(directory, name, preset):
+    with open(os.path.join(directory, preset_file_name(name)), 'w', encoding='utf-8') as f:
+        json.dump(preset, f)
+
+
+def test_file_names():
+    for name in ('shot 010', 'a/b', '.hidden', 'über:1'):
+        file_name = preset_file_name(name)
+        assert '/' not in file_name and not file_name.startswith('.')
+        assert preset_name_from_file(file_name) == name
+
+
+def test_put_flush_get(tmp_path):
+    store = PresetStore(str(tmp_path))
+    store.put('shot 010', {'tags': ['final'], 'parameters': {'-f': '1'}})
+    assert files(tmp_path) == []  # Written by flush()
+    assert store.get('shot 010')['parameters'] == {'-f': '1'}
+    assert store.flush()
+    assert files(tmp_path) == [INDEX_FILE, 'shot 010.json']
+
+    store.save('preview', {'tags': ['draft', 'final']})
+    assert sorted(store.find_by_tag('final')) == ['preview', 'shot 010']
+    assert store.tags('preview') == ['draft', 'final']
+
+    reopened = PresetStore(str(tmp_path))
+    assert sorted(reopened.names()) == ['preview', 'shot 010']
+    assert reopened.get('shot 010') == {'name': 'shot 010', 'tags': ['final'], 'parameters': {'-f': '1'}}
+    assert reopened.get('missing') is None
+
+
+def test_rename_and_delete(tmp_path):
+    store = PresetStore(str(tmp_path))
+    store.save('old', {'parameters': {'-f': '2'}})
+    assert store.rename('old', 'new')
+    assert files(tmp_path) == [INDEX_FILE, 'new.json']
+    assert 'old' not in store and store.get('new')['parameters'] == {'-f': '2'}
+
+    assert store.delete('new')
+    assert not store.delete('new')
+    assert files(tmp_path) == [INDEX_FILE]
+    assert len(PresetStore(str(tmp_path))) == 0
+
+
+def test_refresh_merges_other_processes(tmp_path):
+    store = PresetStore(str(tmp_path))
+    store.save('kept', {'parameters': {}})
+    store.save('changed', {'parameters': {}})
+    store.save('removed', {'parameters': {}})
+
+    write_preset(tmp_path, 'added', {'tags': ['new'], 'parameters': {}})
+    write_preset(tmp_path, 'changed', {'parameters': {'-f': '1..250'}})
+    os.remove(tmp_path / 'removed.json')
+    assert store.refresh() == (['added'], ['changed'], ['removed'])
+    assert store.get('changed')['parameters'] == {'-f': '1..250'}
+    assert store.find_by_tag('new') == ['added']
+    assert store.refresh() == ([], [], [])
+
+
+def test_unsaved_changes_win(tmp_path):
+    store = PresetStore(str(tmp_path))
+    store.save('shot', {'parameters': {'-f': '1'}})
+    store.put('shot', {'parameters': {'-f': 'local'}})
+    write_preset(tmp_path, 'shot', {'parameters': {'-f': 'other process'}})
+    assert store.refresh() == ([], [], [])
+    store.flush()
+    assert PresetStore(str(tmp_path)).get('shot')['parameters'] == {'-f': 'local'}
+
+
+def test_index_recovery(tmp_path):
+    store = PresetStore(str(tmp_path))
+    store.save('a', {'tags': ['x']})
+    store.save('b', {})
+
+    # Missing index: rebuilt from the preset files
+    os.remove(tmp_path / INDEX_FILE)
+    recovered = PresetStore(str(tmp_path))
+    assert sorted(recovered.names()) == ['a', 'b'] and recovered.tags('a') == ['x']
+    assert os.path.exists(tmp_path / INDEX_FILE)
+
+    # Corrupt or stale index: the directory wins
+    (tmp_path / INDEX_FILE).write_text('{"a": ')
+    assert sorted(PresetStore(str(tmp_path)).names()) == ['a', 'b']
+    (tmp_path / INDEX_FILE).write_text(json.dumps({'gone': {'file': 'gone.json', 'tags': [], 'mtime': 0, 'size': 0}}))
+    assert sorted(PresetStore(str(tmp_path)).names()) == ['a', 'b']
+
+
+def test_defaults_only_for_an_empty_store(tmp_path):
+    defaults = {'default': {'parameters': {}}, 'broken': 'not a preset'}
+    assert PresetStore(str(tmp_path), defaults).names() == ['default']
+    PresetStore(str(tmp_path)).delete('default')
+    write_preset(tmp_path, 'mine', {})
+    assert PresetStore(str(tmp_path), defaults).names() == ['mine']
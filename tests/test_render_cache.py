@@ -0,0 +1,78 @@
+"""Storing and restoring frames in the render cache."""
+
+import os
+
+import pytest
+
+from src.core.command_line import RenderCommand
+from src.core.frame_set import FrameSet
+from src.core.output_manifest import output_pattern
+from src.core.render_cache import RenderCache
+
+KEY = 'a' * 64
+
+
+@pytest.fixture
+def pattern(tmp_path):
+    command = RenderCommand.from_argv(['blender', '-b', 'a.blend', '-o', str(tmp_path / 'out' / 'f_####'),
+                                       '-F', 'PNG', '-f', '1..4'])
+    return output_pattern(command)
+
+
+def render(directory, contents):
+    """Writes {frame: bytes} as rendered files, returns [(frame, path)]"""
+    os.makedirs(directory, exist_ok=True)
+    frames = []
+    for frame, data in contents.items():
+        path = os.path.join(directory, f"render_{frame}.png")
+        with open(path, 'wb') as f:
+            f.write(data)
+        frames.append((frame, path))
+    return frames
+
+
+def read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+@pytest.mark.parametrize('link', [False, True])
+def test_restore(tmp_path, pattern, link):
+    cache = RenderCache(str(tmp_path / 'cache'), link=link)
+    # Frames 2 to 4 are identical, as a held frame would be
+    stored = cache.store(KEY, render(str(tmp_path / 'render'), {1: b'one', 2: b'held', 3: b'held', 4: b'held'}))
+    assert stored == 4
+    assert cache.stats().entries == 4
+
+    restored = cache.restore(KEY, FrameSet.from_range(1, 5), pattern)
+    assert list(restored) == [1, 2, 3, 4]
+    assert [read(pattern.path(frame)) for frame in (1, 2, 3, 4)] == [b'one', b'held', b'held', b'held']
+    stats = cache.stats()
+    assert (stats.hits, stats.misses) == (4, 1)
+
+    # Blender rewrites an output in place: no other output may change with it
+    with open(pattern.path(3), 'wb') as f:
+        f.write(b'rendered again')
+    assert read(pattern.path(2)) == read(pattern.path(4)) == b'held'
+    inodes = [os.stat(pattern.path(frame)).st_ino for frame in (2, 3, 4)]
+    assert len(set(inodes)) == 3
+
+
+def test_changed_object_is_not_restored(tmp_path, pattern):
+    cache = RenderCache(str(tmp_path / 'cache'), link=True)
+    cache.store(KEY, render(str(tmp_path / 'render'), {1: b'one'}))
+    assert list(cache.restore(KEY, FrameSet.from_range(1, 1), pattern)) == [1]
+
+    # The linked output is overwritten in place, and the object with it
+    with open(pattern.path(1), 'wb') as f:
+        f.write(b'changed!')
+    os.remove(pattern.path(1))
+    assert list(cache.restore(KEY, FrameSet.from_range(1, 1), pattern)) == []
+    assert not os.path.exists(pattern.path(1))
+    assert cache.stats().entries == 0
+
+
+def test_other_key_misses(tmp_path, pattern):
+    cache = RenderCache(str(tmp_path / 'cache'))
+    cache.store(KEY, render(str(tmp_path / 'render'), {1: b'one'}))
+    assert list(cache.restore('b' * 64, FrameSet.from_range(1, 1), pattern)) == []
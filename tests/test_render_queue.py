@@ -0,0 +1,69 @@
+"""Render cache lookups of RenderQueue.submit_command() and job specs."""
+
+import threading
+
+import pytest
+
+from src.core.job_spec import submit_spec
+from src.core.render_queue import JobState, RenderQueue
+
+
+@pytest.fixture
+def queue(settings_manager):
+    settings_manager.set_setting('render_cache', {'enabled': True})
+    render_queue = RenderQueue(settings_manager)
+    yield render_queue
+    render_queue.cancel_all()
+
+
+def test_animation_without_range_skips_the_cache(queue, blend_file, tmp_path, monkeypatch):
+    def probe(*args):
+        raise AssertionError("the cache must not be looked up")
+    monkeypatch.setattr(queue.metadata_cache, 'probe', probe)
+
+    spec = {'parameters': {'blend_file': blend_file, '-b': True, '-a': True, '-o': str(tmp_path / 'f_####')}}
+    submitted = submit_spec(queue, spec, queue.settings_manager)
+    assert submitted is not None
+    assert queue.get_job(submitted).cache_key is None
+
+
+def test_cache_lookup_runs_outside_invoke(queue, blend_file, monkeypatch):
+    calls = []
+    inside = []
+
+    def restore_cached_frames(command):
+        calls.append(('lookup', bool(inside)))
+        return command, 'key'
+
+    def invoke(function):
+        inside.append(True)
+        try:
+            calls.append(('invoke', True))
+            return function()
+        finally:
+            inside.pop()
+
+    monkeypatch.setattr(queue, 'restore_cached_frames', restore_cached_frames)
+    spec = {'parameters': {'blend_file': blend_file, '-b': True, '-s': 1, '-e': 3, '-a': True}}
+    submitted = submit_spec(queue, spec, queue.settings_manager, invoke=invoke)
+    assert calls == [('lookup', False), ('invoke', True)]
+    assert queue.get_job(submitted).cache_key == 'key'
+
+
+def test_shards_of_a_group_run_concurrently(settings_manager, fake_blender, blend_file):
+    queue = RenderQueue(settings_manager, max_concurrent=1)
+    done = threading.Event()
+    queue.queue_finished.connect(done.set)
+    command = [fake_blender, '--fake-rate', '400', '-b', blend_file, '-s', '1', '-e', '6', '-a']
+    group_id = queue.submit_sharded(command, 1, 6, 3)
+    other = queue.submit([fake_blender, '-b', blend_file, '-f', '1'])
+    try:
+        assert done.wait(60)
+        shards = [job for job in queue.get_jobs() if job.group_id == group_id]
+        assert len(shards) == 3
+        assert all(job.state == JobState.COMPLETED for job in queue.get_jobs())
+        # Every shard started before the first one finished, the other job after the group
+        assert max(job.started_at for job in shards) < min(job.finished_at for job in shards)
+        assert queue.get_job(other).started_at >= max(job.finished_at for job in shards)
+    finally:
+        queue.cancel_all()
@@ -0,0 +1,92 @@
+"""Copies and write-behind saving of SettingsManager."""
+
+import json
+import threading
+import time
+
+
+def saved(settings_manager):
+    with open(settings_manager.settings_file, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_values_are_copied(settings_manager):
+    ui_state = {'log_filters': {'show_info': True}}
+    settings_manager.set_ui_state(ui_state)
+    ui_state['log_filters']['show_info'] = False
+    assert settings_manager.get_ui_state() == {'log_filters': {'show_info': True}}
+
+    settings_manager.get_ui_state()['log_filters']['show_info'] = False
+    settings_manager.get_setting('ui_state')['extra'] = 1
+    assert settings_manager.get_ui_state() == {'log_filters': {'show_info': True}}
+
+
+def test_failed_serialization_is_retried(settings_manager):
+    settings_manager.set_setting('broken', object())
+    settings_manager.save_settings()
+    settings_manager.flush()
+    assert settings_manager.settings_file in settings_manager._dirty
+
+    settings_manager.set_setting('broken', 'fixed')
+    settings_manager.flush()
+    assert saved(settings_manager)['broken'] == 'fixed'
+    assert not settings_manager._dirty
+
+
+class NewerFirst:
+    """Write lock letting the flush thread named 'older' in only after 'newer' wrote"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.newer_written = threading.Event()
+
+    def __enter__(self):
+        if threading.current_thread().name == 'older':
+            self.newer_written.wait(10)
+        self.lock.acquire()
+
+    def __exit__(self, *exc_info):
+        self.lock.release()
+        if threading.current_thread().name == 'newer':
+            self.newer_written.set()
+
+
+def test_concurrent_flushes_keep_the_newest_content(settings_manager):
+    settings_manager._write_lock = NewerFirst()
+    threads = []
+    for value in ('older', 'newer'):
+        settings_manager.set_setting('value', value)
+        settings_manager.save_settings()
+        thread = threading.Thread(target=settings_manager.flush, name=value)
+        thread.start()
+        threads.append(thread)
+        # Serialized before the next change
+        deadline = time.monotonic() + 10
+        while settings_manager._version < len(threads) and time.monotonic() < deadline:
+            time.sleep(0.01)
+    for thread in threads:
+        thread.join(10)
+    assert saved(settings_manager)['value'] == 'newer'
+
+
+def test_reload_applies_removed_keys(settings_manager):
+    settings_manager.set_setting('extra', 1)
+    settings_manager.set_setting('render_cache', {'enabled': True})
+    settings_manager.save_settings()
+    settings_manager.flush()
+    notified = []
+    for key in ('extra', 'render_cache', 'blender_path'):
+        settings_manager.subscribe(key, lambda key, value: notified.append((key, value)))
+
+    # Another program removes both keys
+    content = saved(settings_manager)
+    del content['extra'], content['render_cache']
+    with open(settings_manager.settings_file, 'w', encoding='utf-8') as f:
+        json.dump(content, f)
+
+    default = settings_manager.default_settings()['render_cache']
+    assert sorted(settings_manager.reload_settings()) == ['extra', 'render_cache']
+    assert sorted(notified) == [('extra', None), ('render_cache', default)]
+    assert settings_manager.get_setting('extra') is None
+    assert settings_manager.get_setting('render_cache') == default
+    assert settings_manager.reload_settings() == []
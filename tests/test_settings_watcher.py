@@ -0,0 +1,73 @@
+"""Reload of settings and presets edited by another program, through the polling watcher."""
+
+import json
+import os
+import queue
+
+import pytest
+
+from src.utils import settings_watcher
+from src.utils.settings_watcher import SettingsWatcher
+
+
+@pytest.fixture
+def watcher(settings_manager, monkeypatch):
+    monkeypatch.setattr(settings_watcher, 'HAS_WATCHDOG', False)
+    settings_manager.flush()
+    watcher = SettingsWatcher(settings_manager)
+    watcher.POLL_INTERVAL = 0.05
+    watcher.DEBOUNCE_DELAY = 0.05
+    watcher.start()
+    yield watcher
+    watcher.stop()
+
+
+def notifications(settings_manager, *keys):
+    received = queue.Queue()
+    for key in keys:
+        settings_manager.subscribe(key, lambda key, value: received.put((key, value)))
+    return received
+
+
+def edit_settings(settings_manager, **values):
+    with open(settings_manager.settings_file, encoding='utf-8') as f:
+        settings = json.load(f)
+    settings.update(values)
+    with open(settings_manager.settings_file, 'w', encoding='utf-8') as f:
+        json.dump(settings, f, indent=2)
+
+
+def test_external_settings_edit_is_reloaded(settings_manager, watcher):
+    received = notifications(settings_manager, 'blender_path', 'executor')
+    executor = dict(settings_manager.get_setting('executor'), timeout=600)
+    edit_settings(settings_manager, executor=executor)
+    assert received.get(timeout=10) == ('executor', executor)
+    assert settings_manager.get_setting('executor')['timeout'] == 600
+    assert received.empty()
+
+
+def test_own_saves_are_ignored(settings_manager, watcher):
+    settings_manager.set_blender_path('/opt/blender/blender')
+    settings_manager.flush()
+    received = notifications(settings_manager, 'blender_path')
+    watcher.file_changed(settings_manager.settings_file)
+    with pytest.raises(queue.Empty):
+        received.get(timeout=0.5)
+
+
+def test_external_preset_is_reloaded(settings_manager, watcher):
+    received = notifications(settings_manager, 'presets')
+    with open(os.path.join(settings_manager.presets_dir, 'night.json'), 'w', encoding='utf-8') as f:
+        json.dump({'name': 'night', 'parameters': {'-f': '1'}}, f)
+    assert received.get(timeout=10) == ('presets', (['night'], [], []))
+    assert settings_manager.get_preset('night')['parameters'] == {'-f': '1'}
+
+
+def test_temporary_and_index_files_are_not_changes(settings_manager):
+    watcher = SettingsWatcher(settings_manager)
+    presets_dir = settings_manager.presets_dir
+    assert watcher._classify(settings_manager.settings_file) == 'settings'
+    assert watcher._classify(os.path.join(presets_dir, 'night.json')) == 'presets'
+    for name in ('.index.json', '.night.json.1234.tmp', 'settings.json.1234.tmp'):
+        assert watcher._classify(os.path.join(presets_dir, name)) is None
+    assert watcher._classify(os.path.join(settings_manager.settings_dir, 'queue.json')) is None
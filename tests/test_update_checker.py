@@ -0,0 +1,121 @@
+"""Update checks against a stub release API on localhost."""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.utils.update_checker import UpdateChecker
+
+RELEASE = {'tag_name': 'v99.0.0', 'html_url': 'https://example.invalid/releases/v99.0.0'}
+ETAG = '"release-99"'
+
+
+@pytest.fixture(autouse=True)
+def online(monkeypatch):
+    monkeypatch.delenv(UpdateChecker.OFFLINE_ENV, raising=False)
+
+
+@pytest.fixture
+def api():
+    """Stub release endpoint: answers with RELEASE (or api.status), counts the requests"""
+    requests_seen = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def do_GET(self):
+            requests_seen.append(dict(self.headers))
+            if server.status != 200:
+                self.send_response(server.status)
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+            elif self.headers.get('If-None-Match') == ETAG:
+                self.send_response(304)
+                self.end_headers()
+            else:
+                body = json.dumps(RELEASE).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('ETag', ETAG)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.status = 200
+    server.url = f"http://127.0.0.1:{server.server_address[1]}/releases/latest"
+    server.requests = requests_seen
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def write_cache(cache_file, url, **values):
+    cache = {'url': url, 'latest_version': '1.2.3', 'download_url': 'https://example.invalid/1.2.3'}
+    cache.update(values)
+    with open(cache_file, 'w', encoding='utf-8') as f:
+        json.dump(cache, f)
+
+
+def test_offline_never_connects(tmp_path, api, monkeypatch):
+    cache_file = str(tmp_path / 'update_check.json')
+    assert UpdateChecker.latest_release(cache_file, 0, offline=True, url=api.url) is None
+
+    write_cache(cache_file, api.url, checked=0)
+    assert UpdateChecker.latest_release(cache_file, 0, offline=True, url=api.url) == \
+        ('1.2.3', 'https://example.invalid/1.2.3')
+    monkeypatch.setenv(UpdateChecker.OFFLINE_ENV, '1')
+    assert UpdateChecker.latest_release(cache_file, 0, url=api.url) == ('1.2.3', 'https://example.invalid/1.2.3')
+    assert api.requests == []
+
+
+def test_recent_answer_is_reused(tmp_path, api):
+    cache_file = str(tmp_path / 'update_check.json')
+    write_cache(cache_file, api.url, checked=time.time())
+    assert UpdateChecker.check_for_updates(cache_file, 3600, url=api.url) == \
+        (True, '1.2.3', 'https://example.invalid/1.2.3')
+    assert api.requests == []
+
+
+def test_answer_is_cached_with_etag(tmp_path, api):
+    pytest.importorskip('requests')
+    cache_file = str(tmp_path / 'update_check.json')
+    assert UpdateChecker.check_for_updates(cache_file, 3600, url=api.url) == \
+        (True, '99.0.0', RELEASE['html_url'])
+    assert UpdateChecker.latest_release(cache_file, 3600, url=api.url) == ('99.0.0', RELEASE['html_url'])
+    assert len(api.requests) == 1
+
+    # Past the interval the request is conditional, a 304 keeps the answer
+    assert UpdateChecker.latest_release(cache_file, 0, url=api.url) == ('99.0.0', RELEASE['html_url'])
+    assert len(api.requests) == 2
+    assert api.requests[1].get('If-None-Match') == ETAG
+
+
+def test_network_failure_keeps_the_cached_answer(tmp_path, api):
+    pytest.importorskip('requests')
+    cache_file = str(tmp_path / 'update_check.json')
+    write_cache(cache_file, api.url, checked=0)
+    api.status = 500
+    assert UpdateChecker.latest_release(cache_file, 3600, url=api.url) == \
+        ('1.2.3', 'https://example.invalid/1.2.3')
+    assert len(api.requests) == 1
+
+    # Not retried before RETRY_INTERVAL
+    assert UpdateChecker.latest_release(cache_file, 3600, url=api.url) == \
+        ('1.2.3', 'https://example.invalid/1.2.3')
+    assert len(api.requests) == 1
+
+
+def test_unreachable_server(tmp_path, api):
+    pytest.importorskip('requests')
+    url = api.url
+    api.shutdown()
+    api.server_close()
+    assert UpdateChecker.check_for_updates(str(tmp_path / 'update_check.json'), 0, url=url) == \
+        (False, None, None)